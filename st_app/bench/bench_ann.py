@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List
+
+import faiss
+import numpy as np
+
+# 상위 디렉토리를 path에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from st_app.rag.index_factory import INDEX_TYPES, STORAGE_CODES, IndexSpec, apply_search_params, normalize_l2
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "-s", "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="합성 말뭉치 크기"
+    )
+    parser.add_argument(
+        "-d", "--dim", type=int, default=256, help="벡터 차원 (solar-embedding-1-large는 4096, 메모리에 맞게 조정)"
+    )
+    parser.add_argument("-q", "--queries", type=int, default=1000, help="질의 수")
+    parser.add_argument("-k", "--top_k", type=int, default=10, help="recall@k의 k")
+    parser.add_argument(
+        "-t", "--types", nargs="+", default=list(INDEX_TYPES), choices=INDEX_TYPES, help="비교할 인덱스 타입"
+    )
+    parser.add_argument(
+        "-p", "--storages", nargs="+", default=list(STORAGE_CODES), choices=list(STORAGE_CODES),
+        help="비교할 벡터 저장 정밀도",
+    )
+    parser.add_argument("-c", "--pca_dims", type=int, nargs="+", default=[0], help="PCA 차원 (0은 축소 없음)")
+    return parser
+
+
+def synthetic_corpus(n: int, dim: int, n_clusters: int = 256, seed: int = 0) -> np.ndarray:
+    """실제 임베딩처럼 군집 구조가 있는 정규화 벡터를 생성."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype("float32")
+    labels = rng.integers(0, n_clusters, size=n)
+    x = centers[labels] + 0.5 * rng.standard_normal((n, dim)).astype("float32")
+    return normalize_l2(x)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    hits = sum(len(set(f[f != -1]) & set(t)) for f, t in zip(found, truth))
+    return hits / (len(truth) * k)
+
+
+def latency_ms(index: faiss.Index, queries: np.ndarray, k: int) -> List[float]:
+    """채팅 트래픽처럼 질의를 하나씩 검색해 질의별 지연시간을 측정."""
+    threads = faiss.omp_get_max_threads()
+    faiss.omp_set_num_threads(1)
+    timings = []
+    for q in queries:
+        start = time.perf_counter()
+        index.search(q[None, :], k)
+        timings.append((time.perf_counter() - start) * 1000)
+    faiss.omp_set_num_threads(threads)
+    return timings
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    print(
+        f"{'n':>9} {'type':<9} {'storage':<8} {'pca':>5} {'factory':<28} {'build_s':>8} {'recall':>7} "
+        f"{'p50_ms':>8} {'p99_ms':>8} {'mem_MB':>8} {'saved':>6}"
+    )
+    for n in args.sizes:
+        xb = synthetic_corpus(n, args.dim)
+        xq = synthetic_corpus(args.queries, args.dim, seed=1)
+        # 기준: float32 Flat (정확한 검색)의 결과와 메모리
+        exact = IndexSpec(kind="flat", storage="float32", pca_dim=0).build(args.dim, n_train=n)
+        exact.add(xb)
+        _, truth = exact.search(xq, args.top_k)
+        base_mb = faiss.serialize_index(exact).nbytes / 2**20
+        for kind in args.types:
+            for storage in args.storages:
+                for pca_dim in args.pca_dims:
+                    spec = IndexSpec(kind=kind, storage=storage, pca_dim=pca_dim)
+                    # 운영 빌드(ReviewIndex.add)와 같은 nlist·학습 벡터 수
+                    step = max(1, n // spec.train_size(n))
+                    start = time.perf_counter()
+                    index = spec.build(args.dim, n_train=n)
+                    if not index.is_trained:
+                        index.train(xb[::step])
+                    index.add(xb)
+                    apply_search_params(index, spec)
+                    build_s = time.perf_counter() - start
+
+                    _, found = index.search(xq, args.top_k)
+                    timings = np.array(latency_ms(index, xq, args.top_k))
+                    mem_mb = faiss.serialize_index(index).nbytes / 2**20
+                    print(
+                        f"{n:>9} {kind:<9} {storage:<8} {pca_dim or '-':>5} {spec.factory_string(args.dim, n):<28} "
+                        f"{build_s:>8.2f} {recall_at_k(found, truth):>7.3f} {np.percentile(timings, 50):>8.3f} "
+                        f"{np.percentile(timings, 99):>8.3f} {mem_mb:>8.1f} {1 - mem_mb / base_mb:>6.0%}"
+                    )
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List
+
+# 상위 디렉토리를 path에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from st_app.config import DEFAULT_EMBEDDING_MODELS
+from st_app.rag.embedder import get_embedder
+from st_app.rag.embedding_backends import EMBEDDING_BACKENDS
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument(
+        "-B", "--backends", nargs="+", default=list(EMBEDDING_BACKENDS), choices=list(EMBEDDING_BACKENDS),
+        help="비교할 임베딩 백엔드",
+    )
+    parser.add_argument("-n", "--queries", type=int, default=50, help="단건 질의 반복 수")
+    parser.add_argument("-b", "--batch_size", type=int, default=32, help="처리량 측정용 배치 크기")
+    return parser
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    queries = [f"이 영화 배우 연기 어때? {i}" for i in range(args.queries)]
+    batch = [f"리뷰 {i}: 스토리는 평범했지만 음악과 연출이 좋았다" for i in range(args.batch_size)]
+    print(f"{'backend':<22} {'load_s':>7} {'p50_ms':>8} {'p99_ms':>8} {'batch_docs/s':>13}")
+    for backend in args.backends:
+        start = time.perf_counter()
+        try:
+            embedder = get_embedder(DEFAULT_EMBEDDING_MODELS[backend], backend=backend)
+            embedder.embed_documents(["warm-up"])
+        except Exception as e:
+            print(f"{backend:<22} 건너뜀: {e}")
+            continue
+        load_s = time.perf_counter() - start
+
+        # 캐시를 거치지 않고 백엔드 자체의 질의당 지연을 측정
+        timings = []
+        for q in queries:
+            start = time.perf_counter()
+            embedder.embed_documents([q])
+            timings.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        embedder.embed_documents(batch)
+        throughput = len(batch) / (time.perf_counter() - start)
+        print(
+            f"{backend:<22} {load_s:>7.2f} {statistics.median(timings):>8.2f} "
+            f"{_percentile(timings, 0.99):>8.2f} {throughput:>13.1f}"
+        )
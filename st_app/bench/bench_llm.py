@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable, List
+
+# 상위 디렉토리를 path에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from st_app.config import LLM_MODEL
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument("-n", "--turns", type=int, default=20, help="흉내 낼 대화 턴 수 (턴마다 라우터 + 답변 2회 호출)")
+    parser.add_argument(
+        "--live", action="store_true",
+        help="실제 API를 호출해 연결 재사용까지 측정 (UPSTAGE_API_KEY 필요). 없으면 클라이언트 생성 비용만 측정",
+    )
+    return parser
+
+
+def _fresh_llm(temperature: float):
+    """기존 방식: 호출마다 새 클라이언트와 새 연결 풀."""
+    from langchain_upstage import ChatUpstage
+    from st_app.rag.embedding_backends import upstage_api_key
+
+    return ChatUpstage(model=LLM_MODEL, temperature=temperature, api_key=upstage_api_key())
+
+
+def _turn(get: Callable[[float], object], live: bool) -> float:
+    start = time.perf_counter()
+    for temperature in (0.0, 0.2):
+        llm = get(temperature)
+        if live:
+            llm.invoke([{"role": "user", "content": "안녕이라고만 답해줘"}])  # type: ignore[attr-defined]
+    return (time.perf_counter() - start) * 1000
+
+
+def _report(name: str, timings: List[float]) -> None:
+    print(f"{name:<10} {statistics.median(timings):>9.2f} {statistics.mean(timings):>9.2f} {max(timings):>9.2f}")
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    if not args.live:
+        # 클라이언트 생성만 측정하므로 키 값은 쓰이지 않음
+        os.environ.setdefault("UPSTAGE_API_KEY", "bench-placeholder")
+    from st_app.rag.llm import get_llm
+
+    pooled = lambda t: get_llm(temperature=t)  # noqa: E731
+    pooled(0.0), pooled(0.2)  # 앱 시작 시 warm_up_llm과 같은 상태
+    if args.live:
+        _turn(pooled, live=True)
+
+    fresh = [_turn(_fresh_llm, args.live) for _ in range(args.turns)]
+    reused = [_turn(pooled, args.live) for _ in range(args.turns)]
+    print(f"턴당 오버헤드 ({'API 호출 포함' if args.live else '클라이언트 생성'}, ms)")
+    print(f"{'client':<10} {'p50':>9} {'mean':>9} {'max':>9}")
+    _report("fresh", fresh)
+    _report("pooled", reused)
+    print(f"턴당 절약: {statistics.median(fresh) - statistics.median(reused):.2f} ms (p50)")
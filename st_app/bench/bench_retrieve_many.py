@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import sys
+import time
+import zlib
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+# 상위 디렉토리를 path에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from st_app.rag.retriever import RETRIEVAL_MODES, Retriever, load_shards
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument("-n", "--queries", type=int, default=512, help="검색할 질의 수")
+    parser.add_argument("-b", "--batch_sizes", type=int, nargs="+", default=[1, 8, 32, 128], help="비교할 배치 크기")
+    parser.add_argument("-k", "--top_k", type=int, default=4, help="검색할 문서 수")
+    parser.add_argument("-m", "--mode", default="dense", choices=RETRIEVAL_MODES, help="검색 모드")
+    parser.add_argument(
+        "-l", "--encoder_latency_ms", type=float, default=0.0,
+        help="임베딩 호출 1회당 흉내 낼 왕복 지연 (원격 API의 호출당 비용)",
+    )
+    return parser
+
+
+def _stub_encoder(dim: int, latency_ms: float) -> Callable[[List[str]], np.ndarray]:
+    """질의마다 고정된 벡터를 돌려주고, 호출당 `latency_ms`만큼 기다리는 인코더."""
+
+    def encode(texts: List[str]) -> np.ndarray:
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+        return np.stack([
+            np.random.default_rng(zlib.crc32(t.encode("utf-8"))).standard_normal(dim).astype("float32")
+            for t in texts
+        ])
+
+    return encode
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    shards = load_shards()
+    if not shards:
+        raise FileNotFoundError("인덱스가 없습니다. 저장소 루트에서 실행하거나 먼저 인덱스를 생성하세요.")
+
+    dim = next(iter(shards.values())).index.d
+    retriever = Retriever(shards, encoder=_stub_encoder(dim, args.encoder_latency_ms), mode=args.mode)
+    queries = [f"배우 연기 어때? {i}" for i in range(args.queries)]
+
+    expected = [retriever.search(q, args.top_k) for q in queries[:32]]
+    assert retriever.search_many(queries[:32], args.top_k) == expected, "search_many 결과가 search 반복과 다릅니다"
+
+    print(f"질의 {args.queries}개, k={args.top_k}, mode={args.mode}, dim={dim}, 호출당 지연 {args.encoder_latency_ms}ms")
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        for i in range(0, len(queries), batch_size):
+            retriever.search_many(queries[i:i + batch_size], args.top_k)
+        elapsed = time.perf_counter() - start
+        print(f"batch={batch_size:<5} {len(queries) / elapsed:10.1f} queries/s")
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import resource
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Callable, List
+
+import faiss
+import numpy as np
+
+# 상위 디렉토리를 path에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from app.review.review_schema import SiteName
+from st_app.rag.docstore import DocStore
+from st_app.rag.index_store import docstore_path
+from st_app.rag.index_versions import current_version
+from st_app.rag.retriever import Retriever, _shard_paths, load_shards
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument("-n", "--queries", type=int, default=200, help="반복할 질의 수")
+    parser.add_argument("-k", "--top_k", type=int, default=4, help="검색할 문서 수")
+    return parser
+
+
+def _random_encoder(dim: int) -> Callable[[List[str]], np.ndarray]:
+    """임베딩 API 호출을 제외하고 I/O·검색 비용만 비교하기 위한 고정 인코더."""
+    rng = np.random.default_rng(0)
+
+    def encode(texts: List[str]) -> np.ndarray:
+        return rng.standard_normal((len(texts), dim)).astype("float32")
+
+    return encode
+
+
+def _legacy_retrieve(query: str, k: int, encoder) -> list:
+    """기존 retrieve(): 매 질의마다 인덱스와 문서 메타데이터를 새로 읽음."""
+    results = []
+    qvec = np.array(encoder([query]), dtype="float32")
+    for site in SiteName:
+        ipath, manifest = _shard_paths(site, current_version())
+        if not ipath.exists():
+            continue
+        index = faiss.read_index(str(ipath))
+        D, I = index.search(qvec, k)
+        documents = DocStore(docstore_path(manifest), readonly=True).get_many(i for i in I[0] if i != -1)
+        results.extend((float(d), documents[int(i)]) for d, i in zip(D[0], I[0]) if i != -1)
+    return sorted(results, key=lambda r: r[0], reverse=True)[:k]
+
+
+def _report(name: str, timings: List[float]) -> None:
+    timings_ms = sorted(t * 1000 for t in timings)
+    p99 = timings_ms[min(len(timings_ms) - 1, int(len(timings_ms) * 0.99))]
+    print(
+        f"{name:<10} mean={statistics.mean(timings_ms):8.3f}ms "
+        f"p50={statistics.median(timings_ms):8.3f}ms p99={p99:8.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    start = time.perf_counter()
+    shards = load_shards()
+    if not shards:
+        raise FileNotFoundError("인덱스가 없습니다. 저장소 루트에서 실행하거나 먼저 인덱스를 생성하세요.")
+
+    dim = next(iter(shards.values())).index.d
+    encoder = _random_encoder(dim)
+    retriever = Retriever(shards, encoder=encoder, mode="dense")
+    print(f"Retriever 초기 로드: {(time.perf_counter() - start) * 1000:.3f}ms (프로세스당 1회)")
+    # Linux에서 ru_maxrss 단위는 KB
+    print(f"초기 로드 후 최대 RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f}MB")
+
+    before = []
+    for _ in range(args.queries):
+        start = time.perf_counter()
+        _legacy_retrieve("배우 연기 어때?", args.top_k, encoder)
+        before.append(time.perf_counter() - start)
+
+    after = []
+    for _ in range(args.queries):
+        start = time.perf_counter()
+        retriever.search("배우 연기 어때?", args.top_k)
+        after.append(time.perf_counter() - start)
+
+    print(f"질의 {args.queries}회, k={args.top_k}, dim={dim}, 샤드 {len(shards)}개 (임베딩 호출 제외)")
+    _report("before", before)
+    _report("after", after)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from collections import Counter
+from pathlib import Path
+from typing import List, Tuple
+
+# 상위 디렉토리를 path에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from st_app.config import ROUTER_LABELED_PATH
+from st_app.graph.fast_router import FastRouter, NaiveBayesRouter, load_examples
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument("-d", "--data", nargs="+", default=[ROUTER_LABELED_PATH], help="라벨된 질의 JSONL")
+    parser.add_argument("-k", "--folds", type=int, default=5, help="교차 검증 폴드 수")
+    parser.add_argument(
+        "-t", "--thresholds", type=float, nargs="+", default=[0.6, 0.8, 0.9, 0.95, 0.99], help="비교할 확신도 임계값"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser
+
+
+def cross_validate(examples: List[Tuple[str, str]], folds: int, threshold: float) -> dict:
+    """폴드마다 나머지로 분류기를 학습해 평가. 로컬에서 답한 질의의 정확도와 LLM 호출 절감률을 집계."""
+    counts: Counter = Counter()
+    elapsed = 0.0
+    for fold in range(folds):
+        train = [e for i, e in enumerate(examples) if i % folds != fold]
+        test = [e for i, e in enumerate(examples) if i % folds == fold]
+        router = FastRouter(NaiveBayesRouter().fit(train), threshold=threshold)
+        for text, label in test:
+            start = time.perf_counter()
+            decision = router.decide(text)
+            elapsed += time.perf_counter() - start
+            if decision is None:
+                counts["llm"] += 1
+                continue
+            counts[decision.source] += 1
+            counts["local_correct"] += decision.route == label
+    local = counts["rule"] + counts["classifier"]
+    return {
+        "rule": counts["rule"],
+        "classifier": counts["classifier"],
+        "llm": counts["llm"],
+        "avoided": local / len(examples),
+        "accuracy": counts["local_correct"] / local if local else 0.0,
+        "us_per_query": elapsed / len(examples) * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    examples = load_examples(*args.data)
+    random.Random(args.seed).shuffle(examples)
+    print(f"라벨 질의 {len(examples)}개, {args.folds}-fold 교차 검증")
+    print(f"{'threshold':>9} {'rule':>5} {'clf':>5} {'llm':>5} {'avoided':>8} {'local_acc':>10} {'us/query':>9}")
+    for threshold in args.thresholds:
+        r = cross_validate(examples, args.folds, threshold)
+        print(
+            f"{threshold:>9.2f} {r['rule']:>5} {r['classifier']:>5} {r['llm']:>5} {r['avoided']:>8.1%} "
+            f"{r['accuracy']:>10.1%} {r['us_per_query']:>9.1f}"
+        )
+    # 기존에는 모든 턴이 라우팅 LLM 호출 1회: avoided 비율만큼 호출이 사라짐
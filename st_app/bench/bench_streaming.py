@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import statistics
+import sys
+import uuid
+from argparse import ArgumentParser
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from st_app.graph.graph_builder import get_or_create_graph, thread_config
+from st_app.graph.streaming import StreamStats, stream_answer
+from st_app.rag.llm import warm_up_llm
+
+DEFAULT_QUERIES = [
+    "안녕! 오늘 기분 어때?",
+    "기생충 감독이 누구야?",
+    "기생충 리뷰 요약해줘",
+    "관객들이 연기에 대해 뭐라고 했어?",
+]
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument("-q", "--queries", nargs="+", default=DEFAULT_QUERIES, help="측정할 질문")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="질문당 반복 횟수")
+    return parser
+
+
+if __name__ == "__main__":
+    args = create_parser().parse_args()
+    graph = get_or_create_graph()
+    warm_up_llm(background=False)
+
+    print(f"{'query':<30} {'ttft_ms':>9} {'total_ms':>9} {'chunks':>7}")
+    ttfts, totals = [], []
+    for query in args.queries:
+        for _ in range(args.repeat):
+            stats = StreamStats()
+            # 매번 새 대화(thread)로 실행
+            inputs = {"input": query, "output": "", "history": [{"role": "user", "content": query}]}
+            for _ in stream_answer(graph, inputs, stats, config=thread_config(uuid.uuid4().hex)):
+                pass
+            ttfts.append(stats.ttft_ms or 0.0)
+            totals.append(stats.total_ms or 0.0)
+            print(f"{query[:30]:<30} {ttfts[-1]:>9.0f} {totals[-1]:>9.0f} {stats.tokens:>7}")
+    # 스트리밍 전에는 전체 시간이 곧 사용자가 빈 화면을 보는 시간이었음
+    print(f"p50 첫 토큰 {statistics.median(ttfts):.0f} ms / 전체 {statistics.median(totals):.0f} ms")
@@ -0,0 +1,109 @@
+import os
+
+# 임베딩 백엔드: upstage(원격 API) | sentence-transformers(로컬 CPU) | hashing(결정적, 오프라인 테스트용)
+# 백엔드를 바꾸면 벡터 차원이 달라지므로 인덱스를 `--rebuild`로 다시 만들어야 함
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "upstage")
+DEFAULT_EMBEDDING_MODELS = {
+    "upstage": "solar-embedding-1-large",
+    "sentence-transformers": "paraphrase-multilingual-MiniLM-L12-v2",
+    "hashing": "hashing-384",
+}
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODELS.get(EMBEDDING_BACKEND, ""))
+# 프로세스 내 쿼리 임베딩 LRU 크기
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+# 비어 있으면 디스크(SQLite) 임베딩 캐시를 사용하지 않음
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "")
+EMBEDDING_DISK_CACHE_SIZE = int(os.getenv("EMBEDDING_DISK_CACHE_SIZE", "100000"))
+
+# 비동기 임베딩 클라이언트 (aencode_texts): 연결 풀 공유, 초당 요청 수·동시 요청 수 제한, 재시도
+EMBEDDING_API_BASE = os.getenv("EMBEDDING_API_BASE", "https://api.upstage.ai/v1")
+EMBED_API_MAX_BATCH = int(os.getenv("EMBED_API_MAX_BATCH", "100"))
+EMBED_API_MAX_CHARS = int(os.getenv("EMBED_API_MAX_CHARS", "200000"))
+EMBED_API_CONCURRENCY = int(os.getenv("EMBED_API_CONCURRENCY", "8"))
+EMBED_API_RATE = float(os.getenv("EMBED_API_RATE", "10"))
+EMBED_API_MAX_RETRIES = int(os.getenv("EMBED_API_MAX_RETRIES", "5"))
+EMBED_API_TIMEOUT = float(os.getenv("EMBED_API_TIMEOUT", "30"))
+
+# 인덱스 빌드용 문서 임베딩 파이프라인
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_MAX_WORKERS = int(os.getenv("EMBED_MAX_WORKERS", "4"))
+# 내용 해시 → 문서 벡터 저장소. 재빌드 시 바뀌지 않은 리뷰는 다시 임베딩하지 않음
+DOC_EMBEDDING_STORE_PATH = os.getenv("DOC_EMBEDDING_STORE_PATH", "st_app/db/faiss_index/doc_embeddings.sqlite")
+
+# 리뷰 인덱스 타입: flat | ivf_flat | hnsw | ivf_pq (모두 L2 정규화 + 내적 = 코사인 유사도)
+INDEX_TYPE = os.getenv("INDEX_TYPE", "flat")
+INDEX_NLIST = int(os.getenv("INDEX_NLIST", "1024"))
+INDEX_NPROBE = int(os.getenv("INDEX_NPROBE", "16"))
+HNSW_M = int(os.getenv("HNSW_M", "32"))
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "64"))
+PQ_M = int(os.getenv("PQ_M", "64"))
+# 벡터 저장 정밀도: float32 | float16 | sq8 (ivf_pq는 이미 압축되므로 무시)
+VECTOR_STORAGE = os.getenv("VECTOR_STORAGE", "float32")
+# 0보다 크면 말뭉치로 학습한 PCA로 이 차원까지 줄인 뒤 색인
+PCA_DIM = int(os.getenv("PCA_DIM", "0"))
+
+# 검색 모드: dense(FAISS) | lexical(BM25) | hybrid(RRF 결합)
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")
+RRF_K = int(os.getenv("RRF_K", "60"))
+# hybrid 모드에서 각 검색기가 RRF에 넘기는 후보 수
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))
+# 검색 결과 캐시: (정규화된 질의, k, 모드, 필터, 인덱스 버전) → 결과
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "512"))
+RETRIEVAL_CACHE_TTL = float(os.getenv("RETRIEVAL_CACHE_TTL", "600"))
+
+# rag_review_node 컨텍스트 구성: 후보 수, MMR 관련도 가중치(1이면 순위만), 컨텍스트 토큰 예산과 최대 개수
+# 짧은 리뷰가 많아도 프롬프트가 기존(상위 4개)보다 커지지 않도록 개수도 제한
+CONTEXT_CANDIDATES = int(os.getenv("CONTEXT_CANDIDATES", "8"))
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+CONTEXT_MAX_PASSAGES = int(os.getenv("CONTEXT_MAX_PASSAGES", "4"))
+TOKENIZER_ENCODING = os.getenv("TOKENIZER_ENCODING", "cl100k_base")
+
+# 긴 리뷰를 겹치는 패시지로 나눠 색인 (0이면 나누지 않음). 바꾸면 해당 리뷰만 다시 색인됨
+CHUNK_MAX_CHARS = int(os.getenv("CHUNK_MAX_CHARS", "800"))
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "150"))
+
+# 인덱스 빌드 시 말뭉치를 이 행 수만큼씩 읽어 임베딩·추가 (빌드 메모리 상한)
+CORPUS_CHUNK_ROWS = int(os.getenv("CORPUS_CHUNK_ROWS", "2048"))
+
+# 인덱스 버전 디렉토리 루트. 빌드마다 versions/<버전>/에 쓰고 CURRENT 파일을 원자적으로 교체해 게시
+INDEX_ROOT = os.getenv("INDEX_ROOT", "st_app/db/faiss_index")
+INDEX_KEEP_VERSIONS = int(os.getenv("INDEX_KEEP_VERSIONS", "3"))
+# 실행 중인 리트리버가 새 버전을 확인하는 간격(초). 교체된 이전 리트리버는 진행 중인 검색이 끝나면 닫힘
+INDEX_POLL_INTERVAL = float(os.getenv("INDEX_POLL_INTERVAL", "5"))
+# 앱 시작 시 게시된 인덱스가 없으면 백그라운드에서 생성 (0이면 배포 단계에서 build_index.py로 미리 게시해야 함)
+INDEX_BUILD_ON_START = os.getenv("INDEX_BUILD_ON_START", "1") == "1"
+
+# 채팅 LLM. (모델, temperature)마다 클라이언트 하나를 만들고 keep-alive 연결 풀을 모두가 공유
+LLM_MODEL = os.getenv("LLM_MODEL", "solar-pro-250422")
+LLM_API_BASE = os.getenv("LLM_API_BASE", "https://api.upstage.ai/v1")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+# 앱 시작 시 백그라운드에서 API에 연결을 미리 열어 첫 턴의 TLS 핸드셰이크를 숨김 (0이면 끔)
+LLM_WARMUP = os.getenv("LLM_WARMUP", "1") == "1"
+
+# 로컬 라우터: 키워드 규칙 + 나이브 베이즈 분류기. 확신도가 ROUTER_CONFIDENCE 미만일 때만 LLM 라우팅
+FAST_ROUTER = os.getenv("FAST_ROUTER", "1") == "1"
+ROUTER_CONFIDENCE = float(os.getenv("ROUTER_CONFIDENCE", "0.9"))
+ROUTER_LABELED_PATH = os.getenv("ROUTER_LABELED_PATH", "st_app/db/router/labeled_queries.jsonl")
+# LLM 라우팅 결과를 쌓아 다음 실행부터 분류기 학습에 사용 (비어 있으면 기록하지 않음)
+ROUTER_LOG_PATH = os.getenv("ROUTER_LOG_PATH", "st_app/db/router/route_log.jsonl")
+# 1이면 LLM 라우팅이 필요한 턴에서 라우트와 chat 답변을 구조화 출력 한 번으로 받음 (chat 답변은 토큰 스트리밍 대신 한 번에 표시)
+ROUTE_AND_ANSWER = os.getenv("ROUTE_AND_ANSWER", "0") == "1"
+
+# 의미 기반 답변 캐시: 비슷한 질문(코사인 유사도 >= 임계값)에는 그래프를 실행하지 않고 이전 답변을 반환
+# 라우트·인덱스 버전별로 분리하며 chat 답변은 캐시하지 않음. 경로가 비어 있으면 메모리에만 보관
+ANSWER_CACHE = os.getenv("ANSWER_CACHE", "1") == "1"
+ANSWER_CACHE_PATH = os.getenv("ANSWER_CACHE_PATH", "st_app/db/answer_cache.sqlite")
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.93"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "86400"))
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "1000"))
+
+# 대화 기록: 최근 HISTORY_TOKEN_BUDGET 토큰은 원문 그대로, 그 이전은 누적 요약(최대 HISTORY_SUMMARY_TOKENS)으로 압축
+# 요약은 원문 창을 넘긴 메시지가 HISTORY_SUMMARY_BATCH개 쌓일 때마다 이전 요약에 이어서 갱신
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "800"))
+HISTORY_SUMMARY_TOKENS = int(os.getenv("HISTORY_SUMMARY_TOKENS", "300"))
+HISTORY_SUMMARY_BATCH = int(os.getenv("HISTORY_SUMMARY_BATCH", "4"))
+
+# 대화 상태 체크포인트(SQLite). thread_id별로 기록이 저장되어 재시작 후에도 이어서 대화할 수 있음
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", "st_app/db/checkpoints.sqlite")
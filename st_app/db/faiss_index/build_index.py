@@ -1,51 +1,66 @@
 from __future__ import annotations
 
-import json
 import os
 import sys
+from argparse import ArgumentParser
+from functools import partial
 from pathlib import Path
-from typing import List
-
-import faiss
-import numpy as np
 
 # 상위 디렉토리를 path에 추가
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
-from st_app.rag.embedder import encode_texts
-
-
-def build_faiss_index():
-    """FAISS 인덱스를 빌드합니다."""
-    current_dir = Path(__file__).parent
-    meta_file = current_dir / "meta.json"
-    
-    # 메타데이터 로드
-    with open(meta_file, "r", encoding="utf-8") as f:
-        reviews = json.load(f)
-    
-    print(f"총 {len(reviews)}개의 리뷰 데이터를 로드했습니다.")
-    
-    # 리뷰 텍스트 추출
-    texts = [review["review"] for review in reviews]
-    
-    # 임베딩 생성
-    print("임베딩을 생성하고 있습니다...")
-    embeddings = encode_texts(texts)
-    embeddings_np = np.array(embeddings, dtype=np.float32)
-    
-    # FAISS 인덱스 생성
-    dimension = embeddings_np.shape[1]
-    index = faiss.IndexFlatL2(dimension)
-    index.add(embeddings_np)
-    
-    # 인덱스 저장
-    index_file = current_dir / "index.faiss"
-    faiss.write_index(index, str(index_file))
-    
-    print(f"FAISS 인덱스가 생성되었습니다: {index_file}")
-    print(f"임베딩 차원: {dimension}")
-    print(f"인덱스된 문서 수: {index.ntotal}")
+from app.review.review_schema import SiteName
+from st_app.config import DOC_EMBEDDING_STORE_PATH, EMBED_BATCH_SIZE, EMBED_MAX_WORKERS
+from st_app.rag.batch_embedder import embed_corpus
+from st_app.rag.embedding_cache import DiskEmbeddingStore
+from st_app.rag.retriever import load_shards, update_index_from_datasets
+
+
+def create_parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument("-b", "--batch_size", type=int, default=EMBED_BATCH_SIZE, help="임베딩 요청당 텍스트 수")
+    parser.add_argument("-w", "--workers", type=int, default=EMBED_MAX_WORKERS, help="동시 임베딩 요청 수")
+    parser.add_argument(
+        "-r", "--rebuild", action="store_true", help="기존 인덱스를 버리고 처음부터 다시 만듭니다. Default to False."
+    )
+    parser.add_argument(
+        "-s",
+        "--site",
+        type=str,
+        nargs="+",
+        choices=[site.value for site in SiteName],
+        help=f"갱신할 사이트 샤드. Choices: {', '.join(site.value for site in SiteName)}. Default to all.",
+    )
+    return parser
+
+
+def build_faiss_index(
+    rebuild: bool = False,
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_workers: int = EMBED_MAX_WORKERS,
+    sites: list[SiteName] | None = None,
+):
+    """사이트별 FAISS 인덱스 샤드를 빌드합니다.
+
+    - 기본은 증분 갱신: 새로 크롤링된 리뷰만 임베딩해 추가하고, 사라진 리뷰는 삭제
+    - 샤드는 사이트마다 독립적이므로 `sites`로 일부만 갱신 가능
+    """
+    # 문서 벡터 저장소는 빌드 전체에서 하나만 열어 모든 청크가 공유
+    store = DiskEmbeddingStore(DOC_EMBEDDING_STORE_PATH)
+    try:
+        embed = partial(embed_corpus, store=store, batch_size=batch_size, max_workers=max_workers)
+        results = update_index_from_datasets(rebuild=rebuild, embed=embed, sites=sites)
+    finally:
+        store.close()
+    shards = load_shards(mmap=False)
+    for site, (added, removed) in results.items():
+        shard = shards.get(site)
+        print(f"[{site.value}] 추가된 리뷰: {added}개, 삭제된 리뷰: {removed}개")
+        if shard is not None:
+            print(f"[{site.value}] 임베딩 차원: {shard.index.d}, 인덱스된 문서 수: {shard.ntotal}")
 
 
 if __name__ == "__main__":
-    build_faiss_index()
\ No newline at end of file
+    os.chdir(Path(__file__).parent.parent.parent.parent)
+    args = create_parser().parse_args()
+    sites = [SiteName(site) for site in args.site] if args.site else None
+    build_faiss_index(rebuild=args.rebuild, batch_size=args.batch_size, max_workers=args.workers, sites=sites)
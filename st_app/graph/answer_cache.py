@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import ANSWER_CACHE_PATH, ANSWER_CACHE_SIZE, ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_TTL
+from ..rag.embedding_cache import normalize_text
+
+
+# 리뷰·주제 정보 답변만 캐시. chat 답변은 대화 맥락에 따라 달라지므로 제외
+CACHEABLE_ROUTES = ("subject_info", "rag_review")
+# 유사 질문 조회용 임베딩을 만드는 라우트. rag_review는 검색에서 같은 질의 임베딩을 쓰므로(임베딩 캐시) 추가 호출이 없음
+# subject_info는 임베딩이 필요 없으므로, 로컬 라우터가 subject_info로 확신하면 완전히 같은 질문만 찾음
+SEMANTIC_ROUTES = ("rag_review",)
+
+
+@dataclass
+class CachedAnswer:
+    route: str
+    query: str
+    answer: str
+    similarity: float
+
+
+class SemanticAnswerCache:
+    """(라우트, 인덱스 버전)별로 질문 임베딩 → 답변을 저장하는 캐시.
+
+    - 정규화한 질문이 같으면 임베딩 없이 바로 반환, 아니면 코사인 유사도가 `threshold` 이상인 가장 가까운 항목
+    - `ttl`(초)이 지난 항목은 조회 시 제거, `maxsize`를 넘으면 오래 안 쓴 항목부터 제거
+    - SQLite에 함께 기록하므로 재시작 후에도 유지 (`path=":memory:"`이면 메모리만)
+    - 벡터 없이 저장한 항목은 정규화한 질문이 같을 때만 반환
+    """
+
+    def __init__(
+        self, path: str | Path = ":memory:", threshold: float = 0.93, ttl: Optional[float] = None, maxsize: int = 1000
+    ):
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.exact_hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        # 범위별 (행 ID 목록, 정규화된 벡터 행렬). 변경 시 다시 만듦
+        self._matrices: Dict[Tuple[str, str], Tuple[List[int], np.ndarray]] = {}
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                "id INTEGER PRIMARY KEY, route TEXT NOT NULL, version TEXT NOT NULL, query TEXT NOT NULL, "
+                "normalized TEXT NOT NULL, answer TEXT NOT NULL, vector BLOB NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_scope ON answers(route, version, normalized)")
+            self._conn.commit()
+
+    def _expire(self) -> None:
+        if self.ttl is None:
+            return
+        cur = self._conn.execute("DELETE FROM answers WHERE created_at < ?", (time.time() - self.ttl,))
+        if cur.rowcount:
+            self._conn.commit()
+            self._matrices.clear()
+
+    def _matrix(self, route: str, version: str) -> Tuple[List[int], np.ndarray]:
+        if (route, version) not in self._matrices:
+            rows = self._conn.execute(
+                "SELECT id, vector FROM answers WHERE route = ? AND version = ? AND length(vector) > 0",
+                (route, version),
+            ).fetchall()
+            ids = [row[0] for row in rows]
+            matrix = np.stack([np.frombuffer(row[1], dtype="float32") for row in rows]) if rows else np.empty((0, 0))
+            self._matrices[(route, version)] = (ids, matrix)
+        return self._matrices[(route, version)]
+
+    def _touch(self, row_id: int) -> None:
+        self._conn.execute("UPDATE answers SET accessed_at = ? WHERE id = ?", (time.time(), row_id))
+        self._conn.commit()
+
+    def get_exact(self, query: str, routes: Sequence[str], version: str) -> Optional[CachedAnswer]:
+        """정규화한 질문이 완전히 같은 항목. 임베딩 호출 없이 확인할 수 있음."""
+        with self._lock:
+            self._expire()
+            for route in routes:
+                row = self._conn.execute(
+                    "SELECT id, query, answer FROM answers WHERE route = ? AND version = ? AND normalized = ? "
+                    "ORDER BY created_at DESC LIMIT 1",
+                    (route, version, normalize_text(query)),
+                ).fetchone()
+                if row is not None:
+                    self._touch(row[0])
+                    self.hits += 1
+                    self.exact_hits += 1
+                    return CachedAnswer(route, row[1], row[2], 1.0)
+        return None
+
+    def get_similar(self, vector: Sequence[float], routes: Sequence[str], version: str) -> Optional[CachedAnswer]:
+        query = _normalize(vector)
+        best: Optional[Tuple[float, int, str]] = None
+        with self._lock:
+            self._expire()
+            for route in routes:
+                ids, matrix = self._matrix(route, version)
+                if not ids or matrix.shape[1] != query.shape[0]:
+                    continue
+                scores = matrix @ query
+                i = int(np.argmax(scores))
+                if best is None or scores[i] > best[0]:
+                    best = (float(scores[i]), ids[i], route)
+            if best is None or best[0] < self.threshold:
+                self.misses += 1
+                return None
+            similarity, row_id, route = best
+            row = self._conn.execute("SELECT query, answer FROM answers WHERE id = ?", (row_id,)).fetchone()
+            self._touch(row_id)
+            self.hits += 1
+        return CachedAnswer(route, row[0], row[1], similarity)
+
+    def put(
+        self, query: str, vector: Optional[Sequence[float]], route: str, version: str, answer: str
+    ) -> None:
+        now = time.time()
+        blob = b"" if vector is None else _normalize(vector).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO answers (route, version, query, normalized, answer, vector, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (route, version, query, normalize_text(query), answer, blob, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM answers WHERE id IN ("
+                "SELECT id FROM answers ORDER BY accessed_at DESC, id DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+            self._conn.commit()
+            self._matrices.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM answers")
+            self._conn.commit()
+            self._matrices.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "exact_hits": self.exact_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    vec = np.asarray(vector, dtype="float32")
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+class CachedGraph:
+    """컴파일된 그래프를 감싸 비슷한 질문에는 그래프를 실행하지 않고 캐시된 답변을 돌려줍니다.
+
+    `stream`/`invoke`는 원래 그래프와 같은 형태로 결과를 내보내며, 캐시 적중 시에는 최종 상태 하나만 내보냄.
+    나머지 속성은 원래 그래프로 위임. 임베딩·조회·저장이 실패해도 로그만 남기고 그래프 결과를 그대로 돌려줌.
+    """
+
+    def __init__(
+        self,
+        graph: Any,
+        cache: SemanticAnswerCache,
+        embed: Callable[[List[str]], List[List[float]]],
+        version: Callable[[], str],
+        route_hint: Optional[Callable[[str], Optional[str]]] = None,
+    ):
+        self.graph = graph
+        self.cache = cache
+        self.embed = embed
+        self.version = version
+        self.route_hint = route_hint
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.graph, name)
+
+    def _routes(self, query: str) -> Tuple[str, ...]:
+        # 로컬 라우터가 확신하면 그 라우트에서만 찾고, chat이면 캐시를 건너뜀
+        hint = self.route_hint(query) if self.route_hint is not None else None
+        if hint is None:
+            return CACHEABLE_ROUTES
+        return (hint,) if hint in CACHEABLE_ROUTES else ()
+
+    def _lookup(self, inputs: Dict) -> Tuple[Optional[Dict], Optional[List[float]], Optional[str]]:
+        """(캐시된 상태, 질문 임베딩, 인덱스 버전). 조회에 실패하면 버전이 None이고 이번 답변은 저장하지 않음."""
+        try:
+            return self._try_lookup(inputs)
+        except Exception as e:
+            print(f"답변 캐시 조회 실패, 그래프 실행: {e}")
+            return None, None, None
+
+    def _try_lookup(self, inputs: Dict) -> Tuple[Optional[Dict], Optional[List[float]], str]:
+        query = inputs.get("input", "")
+        routes = self._routes(query)
+        version = self.version() or ""
+        if not query or not routes:
+            return None, None, version
+        start = time.perf_counter()
+        hit = self.cache.get_exact(query, routes, version)
+        vector = None
+        if hit is None and any(route in SEMANTIC_ROUTES for route in routes):
+            vector = self.embed([query])[0]
+            hit = self.cache.get_similar(vector, routes, version)
+        if hit is None:
+            return None, vector, version
+        print(
+            f"답변 캐시 적중: '{hit.query}' ({hit.route}, 유사도 {hit.similarity:.3f}, "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms)"
+        )
+        return {**inputs, "next_node": hit.route, "output": hit.answer}, vector, version
+
+    def _store(
+        self, inputs: Dict, state: Optional[Dict], vector: Optional[List[float]], version: Optional[str]
+    ) -> None:
+        if version is None or not state or not state.get("output"):
+            return
+        route = state.get("next_node", "chat")
+        if route not in CACHEABLE_ROUTES:
+            return
+        query = inputs["input"]
+        try:
+            if vector is None and route in SEMANTIC_ROUTES:
+                vector = self.embed([query])[0]
+            self.cache.put(query, vector, route, version, state["output"])
+        except Exception as e:
+            # 답변은 이미 사용자에게 전달됐으므로 캐시에 남기지 않고 넘어감
+            print(f"답변 캐시 저장 실패: {e}")
+
+    def _record(self, inputs: Dict, cached: Dict, config: Optional[dict]) -> None:
+        """캐시 적중 턴도 그래프를 실행한 것처럼 체크포인트의 대화 기록에 남김."""
+        if not config or getattr(self.graph, "checkpointer", None) is None:
+            return
+        update = {
+            "input": inputs["input"],
+            "output": cached["output"],
+            "next_node": cached["next_node"],
+            "history": list(inputs.get("history", [])) + [{"role": "assistant", "content": cached["output"]}],
+        }
+        self.graph.update_state(config, update, as_node=cached["next_node"])
+
+    def stream(self, inputs: Dict, config: Optional[dict] = None, stream_mode: Any = "values", **kwargs) -> Iterator:
+        modes = [stream_mode] if isinstance(stream_mode, str) else list(stream_mode)
+        cached, vector, version = self._lookup(inputs)
+        if cached is not None:
+            self._record(inputs, cached, config)
+            if "values" in modes:
+                yield cached if isinstance(stream_mode, str) else ("values", cached)
+            return
+        if "values" not in modes:
+            # 최종 상태를 알 수 없으므로 저장하지 않고 그대로 전달
+            yield from self.graph.stream(inputs, config=config, stream_mode=stream_mode, **kwargs)
+            return
+        final = None
+        for event in self.graph.stream(inputs, config=config, stream_mode=stream_mode, **kwargs):
+            if isinstance(stream_mode, str):
+                final = event
+            elif event[0] == "values":
+                final = event[1]
+            yield event
+        self._store(inputs, final, vector, version)
+
+    def invoke(self, inputs: Dict, config: Optional[dict] = None, **kwargs) -> Dict:
+        cached, vector, version = self._lookup(inputs)
+        if cached is not None:
+            self._record(inputs, cached, config)
+            return cached
+        state = self.graph.invoke(inputs, config=config, **kwargs)
+        self._store(inputs, state, vector, version)
+        return state
+
+
+_ANSWER_CACHE: Optional[SemanticAnswerCache] = None
+
+
+def get_answer_cache() -> SemanticAnswerCache:
+    global _ANSWER_CACHE
+    if _ANSWER_CACHE is None:
+        _ANSWER_CACHE = SemanticAnswerCache(
+            ANSWER_CACHE_PATH or ":memory:",
+            threshold=ANSWER_CACHE_THRESHOLD,
+            ttl=ANSWER_CACHE_TTL,
+            maxsize=ANSWER_CACHE_SIZE,
+        )
+    return _ANSWER_CACHE
+
+
+def answer_cache_stats() -> dict:
+    return get_answer_cache().stats()
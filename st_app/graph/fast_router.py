@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import math
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..config import FAST_ROUTER, ROUTER_CONFIDENCE, ROUTER_LABELED_PATH, ROUTER_LOG_PATH
+from ..rag.lexical import tokenize
+
+
+ROUTES = ("chat", "subject_info", "rag_review")
+
+# 한 라우트의 키워드만 나오면 규칙으로 바로 결정. 여러 라우트가 섞이면 분류기에 맡김
+KEYWORD_RULES: Dict[str, Tuple[str, ...]] = {
+    "rag_review": (
+        "리뷰", "후기", "평점", "별점", "감상평", "관객 반응", "관객들 반응", "호평", "혹평", "review", "critic",
+    ),
+    "subject_info": (
+        "감독", "출연", "주연", "개봉", "장르", "러닝타임", "상영시간", "상영 시간", "관람가", "관람 등급", "줄거리",
+        "director", "runtime",
+    ),
+    # 인사·감사는 다른 라우트 키워드가 없을 때만 적용
+    "chat": ("안녕", "반가워", "반갑", "고마워", "감사합니다", "hello", "thanks"),
+}
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    route: str
+    confidence: float
+    source: str  # rule | classifier | llm
+
+
+def features(text: str) -> List[str]:
+    """단어 토큰과 단어 안의 글자 2-gram. 어미가 달라도("요약해줘"/"요약 좀") 같은 특징을 공유하게 함."""
+    feats = []
+    for token in tokenize(text):
+        feats.append(token)
+        feats.extend("#" + token[i:i + 2] for i in range(len(token) - 1))
+    return feats
+
+
+class NaiveBayesRouter:
+    """다항 나이브 베이즈 라우트 분류기. 수십~수백 개 예시로 학습해도 충분하고 예측은 수 마이크로초."""
+
+    def __init__(self, alpha: float = 0.5):
+        self.alpha = alpha
+        self.priors: Dict[str, float] = {}
+        self.counts: Dict[str, Counter] = {}
+        self.totals: Dict[str, int] = {}
+        self.vocab: set = set()
+
+    def fit(self, examples: Iterable[Tuple[str, str]]) -> "NaiveBayesRouter":
+        counts: Dict[str, Counter] = defaultdict(Counter)
+        docs: Counter = Counter()
+        for text, route in examples:
+            counts[route].update(features(text))
+            docs[route] += 1
+        n = sum(docs.values())
+        self.priors = {route: math.log(c / n) for route, c in docs.items()}
+        self.counts = dict(counts)
+        self.totals = {route: sum(c.values()) for route, c in counts.items()}
+        self.vocab = {f for c in counts.values() for f in c}
+        return self
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        if not self.priors:
+            return {}
+        feats = [f for f in features(text) if f in self.vocab]
+        v = len(self.vocab)
+        scores = {
+            route: prior + sum(
+                math.log((self.counts[route][f] + self.alpha) / (self.totals[route] + self.alpha * v)) for f in feats
+            )
+            for route, prior in self.priors.items()
+        }
+        top = max(scores.values())
+        exp = {route: math.exp(s - top) for route, s in scores.items()}
+        norm = sum(exp.values())
+        return {route: e / norm for route, e in exp.items()}
+
+
+def keyword_route(text: str) -> Optional[str]:
+    lowered = text.lower()
+    matched = {route for route, words in KEYWORD_RULES.items() if any(w in lowered for w in words)}
+    if len(matched) > 1:
+        matched.discard("chat")
+    return matched.pop() if len(matched) == 1 else None
+
+
+class FastRouter:
+    """LLM 호출 없이 라우트를 정합니다. 확신할 수 없으면 None을 돌려 LLM 라우팅으로 넘김."""
+
+    def __init__(self, classifier: Optional[NaiveBayesRouter] = None, threshold: float = ROUTER_CONFIDENCE):
+        self.classifier = classifier
+        self.threshold = threshold
+        self.counts: Counter = Counter()
+
+    def decide(self, text: str, record: bool = True) -> Optional[RouteDecision]:
+        """`record=False`면 통계에 세지 않음 (실제 라우팅이 아닌 답변 캐시 힌트 등)."""
+        decision = self._decide(text)
+        if record:
+            self.counts[decision.source if decision is not None else "llm"] += 1
+        return decision
+
+    def _decide(self, text: str) -> Optional[RouteDecision]:
+        route = keyword_route(text)
+        if route is not None:
+            return RouteDecision(route, 1.0, "rule")
+        if self.classifier is not None:
+            proba = self.classifier.predict_proba(text)
+            if proba:
+                route, confidence = max(proba.items(), key=lambda kv: kv[1])
+                if confidence >= self.threshold:
+                    return RouteDecision(route, confidence, "classifier")
+        return None
+
+    def stats(self) -> Dict[str, float]:
+        total = sum(self.counts.values())
+        local = self.counts["rule"] + self.counts["classifier"]
+        return {**self.counts, "llm_calls_avoided": local, "local_rate": local / total if total else 0.0}
+
+
+def load_examples(*paths: str) -> List[Tuple[str, str]]:
+    """`{"query": ..., "route": ...}` 형식 JSONL을 읽습니다. 없는 파일과 알 수 없는 라우트는 건너뜀."""
+    examples = []
+    for path in paths:
+        if not path or not Path(path).exists():
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if row.get("route") in ROUTES and row.get("query"):
+                    examples.append((row["query"], row["route"]))
+    return examples
+
+
+_LOG_LOCK = threading.Lock()
+
+
+def log_route(query: str, route: str) -> None:
+    """LLM 라우팅 결과를 기록. 다음 실행에서 분류기 학습 데이터로 쓰임."""
+    if not ROUTER_LOG_PATH:
+        return
+    with _LOG_LOCK:
+        Path(ROUTER_LOG_PATH).parent.mkdir(parents=True, exist_ok=True)
+        with open(ROUTER_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"query": query, "route": route}, ensure_ascii=False) + "\n")
+
+
+_FAST_ROUTER: Optional[FastRouter] = None
+
+
+def get_fast_router() -> Optional[FastRouter]:
+    """라벨 데이터와 LLM 라우팅 기록으로 학습한 프로세스 공용 라우터. `FAST_ROUTER=0`이면 None."""
+    global _FAST_ROUTER
+    if not FAST_ROUTER:
+        return None
+    if _FAST_ROUTER is None:
+        examples = load_examples(ROUTER_LABELED_PATH, ROUTER_LOG_PATH)
+        _FAST_ROUTER = FastRouter(NaiveBayesRouter().fit(examples) if examples else None)
+        print(f"로컬 라우터 학습: 예시 {len(examples)}개")
+    return _FAST_ROUTER
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional
 
 from langgraph.graph import END, StateGraph
 
+from ..config import ANSWER_CACHE, CHECKPOINT_PATH
+from ..rag.embedder import encode_texts
+from ..rag.index_versions import current_version
+from .answer_cache import CachedGraph, get_answer_cache
+from .fast_router import get_fast_router
 from .nodes.chat_node import chat_node
 from .nodes.subject_info_node import subject_info_node
 from .nodes.rag_review_node import rag_review_node
@@ -49,10 +56,38 @@ def build_graph() -> StateGraph:
 _GRAPH = None
 
 
+def _route_hint(query: str) -> Optional[str]:
+    """답변 캐시 조회 범위를 좁히기 위한 로컬 라우팅 (LLM 호출 없음)
+
+    - 같은 질의를 chat_node가 다시 라우팅하므로 라우터 통계에는 세지 않음
+    """
+    fast = get_fast_router()
+    decision = fast.decide(query, record=False) if fast is not None else None
+    return decision.route if decision is not None else None
+
+
+def get_checkpointer():
+    """thread_id별 대화 상태를 로컬 SQLite 파일에 저장하는 체크포인터 (별도 서비스 불필요)"""
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    Path(CHECKPOINT_PATH).parent.mkdir(parents=True, exist_ok=True)
+    # 스트림릿 세션 스레드들이 연결 하나를 공유 (SqliteSaver가 내부에서 잠금)
+    return SqliteSaver(sqlite3.connect(CHECKPOINT_PATH, check_same_thread=False))
+
+
+def thread_config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
 def get_or_create_graph():
     global _GRAPH
     if _GRAPH is None:
-        _GRAPH = build_graph().compile()
+        _GRAPH = build_graph().compile(checkpointer=get_checkpointer())
+        if ANSWER_CACHE:
+            # 비슷한 질문은 라우팅·검색·생성을 건너뛰고 캐시된 답변을 반환
+            _GRAPH = CachedGraph(
+                _GRAPH, get_answer_cache(), encode_texts, version=current_version, route_hint=_route_hint
+            )
     return _GRAPH
 
 
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from ..config import HISTORY_SUMMARY_BATCH, HISTORY_SUMMARY_TOKENS, HISTORY_TOKEN_BUDGET
+from ..rag.context import count_tokens, truncate_to_tokens
+from ..utils.cache import LRUCache
+
+
+# 메시지마다 붙는 역할 표시 등의 오버헤드 (근사)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+Summarizer = Callable[[str, List[dict], int], str]
+
+
+def _message_tokens(message: dict) -> int:
+    return count_tokens(str(message.get("content", ""))) + MESSAGE_OVERHEAD_TOKENS
+
+
+def _prefix_keys(history: Sequence[dict]) -> List[str]:
+    """`keys[i]`는 history[:i]를 나타내는 해시. 앞부분이 같은 대화끼리 요약을 공유하기 위한 키."""
+    keys = [""]
+    for m in history:
+        digest = hashlib.sha1(f"{keys[-1]}\x00{m.get('role')}\x00{m.get('content')}".encode("utf-8"))
+        keys.append(digest.hexdigest())
+    return keys
+
+
+def _llm_summarize(previous: str, messages: List[dict], max_tokens: int) -> str:
+    from ..rag.llm import get_llm
+    from ..rag.prompt import SYSTEM_HISTORY_SUMMARY, build_history_summary_prompt
+    from .streaming import HISTORY_SUMMARY_TAG, NOSTREAM_TAG
+
+    msgs = [
+        {"role": "system", "content": SYSTEM_HISTORY_SUMMARY},
+        {"role": "user", "content": build_history_summary_prompt(previous, messages, max_tokens)},
+    ]
+    # 내부 호출이므로 사용자 화면에 스트리밍하지 않음
+    return get_llm(temperature=0.0).invoke(msgs, config={"tags": [HISTORY_SUMMARY_TAG, NOSTREAM_TAG]}).content
+
+
+class HistoryManager:
+    """대화 기록을 토큰 예산 안으로 줄입니다: 최근 메시지는 원문, 그 이전은 누적 요약.
+
+    요약은 대화 앞부분의 해시를 키로 캐시하며, 새로 창 밖으로 밀려난 메시지만 이전 요약에 이어 붙여 갱신.
+    밀려난 메시지가 `batch`개 미만이면 요약을 다시 만들지 않고 원문으로 남겨 둠 (예산을 잠시 넘을 수 있음).
+    """
+
+    def __init__(
+        self,
+        budget: int = HISTORY_TOKEN_BUDGET,
+        summary_tokens: int = HISTORY_SUMMARY_TOKENS,
+        batch: int = HISTORY_SUMMARY_BATCH,
+        summarize: Summarizer = _llm_summarize,
+        maxsize: int = 256,
+    ):
+        self.budget = budget
+        self.summary_tokens = summary_tokens
+        self.batch = max(1, batch)
+        self.summarize = summarize
+        self.summaries: LRUCache[str] = LRUCache(maxsize=maxsize)
+        self.summary_calls = 0
+
+    def _split(self, history: Sequence[dict]) -> int:
+        """원문으로 남길 최근 메시지의 시작 위치 (마지막 메시지는 항상 포함)."""
+        used = 0
+        start = len(history)
+        for i in range(len(history) - 1, -1, -1):
+            used += _message_tokens(history[i])
+            if used > self.budget and i < len(history) - 1:
+                break
+            start = i
+        return start
+
+    def _cached(self, keys: List[str], end: int) -> Tuple[int, str]:
+        """history[:end] 이하에서 가장 긴, 이미 요약된 앞부분 (길이, 요약)."""
+        for i in range(end, 0, -1):
+            summary = self.summaries.get(keys[i])
+            if summary is not None:
+                return i, summary
+        return 0, ""
+
+    def window(self, history: Sequence[dict]) -> Tuple[str, List[dict]]:
+        """(요약, 원문 메시지 목록). 요약할 것이 없으면 요약은 빈 문자열."""
+        history = list(history)
+        split = self._split(history)
+        if split == 0:
+            return "", history
+        keys = _prefix_keys(history)
+        folded, summary = self._cached(keys, split)
+        if split - folded >= self.batch:
+            try:
+                summary = self.summarize(summary, history[folded:split], self.summary_tokens)
+                summary = truncate_to_tokens(summary.strip(), self.summary_tokens)
+                self.summary_calls += 1
+                folded = split
+                self.summaries.put(keys[split], summary)
+            except Exception as e:
+                # 요약에 실패하면 오래된 기록은 버리고 최근 창만 사용
+                print(f"대화 기록 요약 실패: {e}")
+                return summary, history[split:]
+        recent = history[folded:]
+        if recent and _message_tokens(recent[-1]) > self.budget:
+            recent[-1] = {**recent[-1], "content": truncate_to_tokens(str(recent[-1]["content"]), self.budget)}
+        return summary, recent
+
+    def messages(self, history: Sequence[dict]) -> List[dict]:
+        """LLM 메시지 목록에 바로 붙일 수 있는 형태. 요약은 시스템 메시지 하나로 앞에 둠."""
+        summary, recent = self.window(history)
+        prefix = [{"role": "system", "content": f"[이전 대화 요약]\n{summary}"}] if summary else []
+        return prefix + recent
+
+
+_HISTORY_MANAGER: Optional[HistoryManager] = None
+
+
+def get_history_manager() -> HistoryManager:
+    """세 노드가 공유하는 기록 관리자 (요약 캐시도 공유)."""
+    global _HISTORY_MANAGER
+    if _HISTORY_MANAGER is None:
+        _HISTORY_MANAGER = HistoryManager()
+    return _HISTORY_MANAGER
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Literal, Optional, Tuple
 
-from ...rag.llm import get_llm
+from pydantic import BaseModel, Field
+
+from ...config import ROUTE_AND_ANSWER
+from ...rag.llm import get_llm, stream_text
 from ...rag.prompt import build_chat_prompt
+from ..fast_router import get_fast_router, log_route
+from ..history import get_history_manager
+from ..streaming import NOSTREAM_TAG, ROUTER_TAG
 
 
 SYSTEM_DECIDER = (
@@ -15,8 +21,60 @@ SYSTEM_DECIDER = (
     "다른 텍스트나 설명은 포함하지 마세요."
 )
 
+SYSTEM_ROUTE_AND_ANSWER = (
+    "당신은 라우팅 분류기이자 대화 어시스턴트입니다. 사용자의 입력을 분석하여 route를 정하세요:\n\n"
+    "- chat: 일반적인 대화, 인사, 잡담 등 특별한 정보가 필요하지 않은 경우\n"
+    "- subject_info: 영화나 제품의 기본 정보, 스펙, 감독, 배우 등에 대한 문의\n"
+    "- rag_review: 리뷰 내용, 평점, 관객 반응, 리뷰 요약/분석에 대한 문의\n\n"
+    "route가 chat이면 answer에 사용자에게 보낼 최종 답변을 쓰고, 그 외에는 answer를 비워 두세요."
+)
+
+
+class RouteOrAnswer(BaseModel):
+    """라우팅과 chat 답변을 한 번의 호출로 받기 위한 구조화 출력"""
+
+    route: Literal["chat", "subject_info", "rag_review"] = Field(description="처리할 노드")
+    answer: str = Field(default="", description="route가 chat일 때만 사용자에게 보낼 최종 답변")
+
+
+def _history(state: Dict) -> Tuple[List[dict], str]:
+    """토큰 예산으로 줄인 (최근 기록, 이전 요약)"""
+    summary, recent = get_history_manager().window(state.get("history", []))
+    return recent, summary
+
+
+def _fast_route(user_text: str) -> Optional[str]:
+    """로컬 라우터가 확신하는 경우의 라우트. 아니면 None"""
+    fast = get_fast_router()
+    if fast is not None:
+        decision = fast.decide(user_text)
+        if decision is not None:
+            print(f"로컬 라우팅: {decision.route} ({decision.source}, {decision.confidence:.2f})")
+            return decision.route
+    return None
+
+
+def _route_and_answer(user_text: str, state: Dict) -> Tuple[Optional[str], str]:
+    """한 번의 구조화 출력 호출로 라우트와 (chat이면) 답변을 함께 받습니다. 실패하면 (None, "")"""
+    try:
+        llm = get_llm(temperature=0.0).with_structured_output(RouteOrAnswer)
+        msgs = [
+            {"role": "system", "content": SYSTEM_ROUTE_AND_ANSWER},
+            {"role": "user", "content": build_chat_prompt(user_text, *_history(state))},
+        ]
+        print("라우팅+답변 LLM 호출 중...")
+        # JSON 조각이 화면에 스트리밍되지 않도록 라우터 태그를 붙임. chat 답변은 최종 output으로 전달됨
+        result = llm.invoke(msgs, config={"tags": [ROUTER_TAG, NOSTREAM_TAG]})
+        print(f"LLM 라우팅 응답: '{result.route}'")
+        log_route(user_text, result.route)
+        # chat 답변이 비어 있으면 호출한 쪽에서 일반 채팅 호출로 처리
+        return result.route, result.answer.strip() if result.route == "chat" else ""
+    except Exception as e:
+        print(f"라우팅+답변 호출 중 오류: {e}")
+        return None, ""
+
 
-def _decide_route(user_text: str) -> str:
+def _llm_route(user_text: str) -> str:
     """LLM을 사용한 지능형 라우팅 결정"""
     try:
         llm = get_llm(temperature=0.0)
@@ -25,12 +83,14 @@ def _decide_route(user_text: str) -> str:
             {"role": "user", "content": f"사용자 입력: {user_text}"},
         ]
         print("라우팅 LLM 호출 중...")
-        response = llm.invoke(msgs).content.strip().lower()
+        # 라우팅 응답은 사용자에게 스트리밍하지 않도록 태그로 구분
+        response = llm.invoke(msgs, config={"tags": [ROUTER_TAG, NOSTREAM_TAG]}).content.strip().lower()
         print(f"LLM 라우팅 응답: '{response}'")
 
         # 유효한 라우트인지 확인
         if response in {"chat", "subject_info", "rag_review"}:
             print(f"유효한 라우트 반환: {response}")
+            log_route(user_text, response)
             return response
         else:
             print(f"유효하지 않은 라우트: '{response}', 기본값 사용")
@@ -47,35 +107,41 @@ def _decide_route(user_text: str) -> str:
 def chat_node(state: Dict) -> Dict:
     user_input = state["input"]
     print(f"사용자 입력: '{user_input}'")
-    # 라우팅 결정
-    route = _decide_route(user_input)
+    # 라우팅 결정. 로컬 라우터가 확신하지 못하면 LLM 호출 (단일 호출 모드에서는 chat 답변까지)
+    answer = ""
+    route = _fast_route(user_input)
+    if route is None and ROUTE_AND_ANSWER:
+        route, answer = _route_and_answer(user_input, state)
+    if route is None:
+        route = _llm_route(user_input)
 
     # 다른 노드로 라우팅
+    # 기록은 체크포인트에 누적되므로 바뀐 키만 반환
     if route == "subject_info":
         print("Subject Info Node로 라우팅")
-        state["next_node"] = "subject_info"
-        return state
+        return {"next_node": "subject_info"}
     elif route == "rag_review":
         print("RAG Review Node로 라우팅")
-        state["next_node"] = "rag_review"
-        return state
+        return {"next_node": "rag_review"}
 
     # 일반 채팅 처리
     print("일반 채팅으로 처리")
+    if answer:
+        print(f"단일 호출 답변 사용: {answer}")
+        return {"output": answer, "next_node": "chat", "history": [{"role": "assistant", "content": answer}]}
     print("=== CHAT_NODE DEBUG ===")
     llm = get_llm()
 
     # 채팅 프롬프트 생성
-    prompt = build_chat_prompt(user_input, state)
+    prompt = build_chat_prompt(user_input, *_history(state))
 
     print("=== CHAT 프롬프트 ===")
     print(prompt)
     print("=== CHAT 프롬프트 끝 ===")
 
     print("LLM 호출 중...")
-    resp = llm.invoke([{"role": "user", "content": prompt}])
-    output = resp.content
+    output = stream_text(llm, [{"role": "user", "content": prompt}])
     print(f"LLM 응답: {output}")
     print("=== CHAT DEBUG END ===\n")
 
-    return {"output": output}
\ No newline at end of file
+    return {"output": output, "next_node": "chat", "history": [{"role": "assistant", "content": output}]}
\ No newline at end of file
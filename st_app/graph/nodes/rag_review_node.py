@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from typing import Dict
 
-from ...rag.llm import get_llm
+from ...config import CONTEXT_CANDIDATES
+from ...rag.context import count_tokens, pack_contexts
+from ...rag.llm import get_llm, stream_text
 from ...rag.prompt import SYSTEM_RAG, build_rag_prompt
 from ...rag.retriever import retrieve
+from ..history import get_history_manager
 
 
 def rag_review_node(state: Dict) -> Dict:
@@ -17,10 +20,16 @@ def rag_review_node(state: Dict) -> Dict:
 
     # 리뷰 검색
     print("리뷰 검색 시작...")
-    retrieve_results = retrieve(query, k=4)
+    retrieve_results = retrieve(query, k=CONTEXT_CANDIDATES)
     print(f"검색 결과 수: {len(retrieve_results)}")
 
-    contexts = [t for t, _ in retrieve_results]
+    # 중복 리뷰를 걸러내고 토큰 예산 안으로 압축
+    candidates = [t for t, _ in retrieve_results]
+    contexts = pack_contexts(candidates)
+    print(
+        f"컨텍스트 {len(candidates)}개 → {len(contexts)}개, "
+        f"토큰 {sum(map(count_tokens, candidates))} → {sum(map(count_tokens, contexts))}"
+    )
     print("=== 검색된 리뷰 컨텍스트 ===")
     for i, context in enumerate(contexts):
         print(f"컨텍스트 {i+1}: {context[:100]}...")
@@ -30,14 +39,15 @@ def rag_review_node(state: Dict) -> Dict:
     prompt = build_rag_prompt(query, contexts)
 
     history: list = state.get("history", [])
-    msgs = [{"role": "system", "content": prompt}] + history
+    # 최근 기록은 원문, 오래된 기록은 요약으로 토큰 예산 안에 맞춤
+    msgs = [{"role": "system", "content": prompt}] + get_history_manager().messages(history)
     print("=== RAG 프롬프트 ===")
     print(msgs)
     print("=== RAG 프롬프트 끝 ===")
 
     print("LLM 호출 중...")
-    resp = llm.invoke(msgs)
-    print(f"LLM 응답: {resp.content}")
+    output = stream_text(llm, msgs)
+    print(f"LLM 응답: {output}")
     print("=== RAG DEBUG END ===\n")
 
-    return {"output": resp.content, "history": history}
+    return {"output": output, "history": [{"role": "assistant", "content": output}]}
@@ -8,7 +8,8 @@ from ...rag.prompt import (
     build_subject_info_prompt,
     SYSTEM_SUBJECT,
 )
-from ...rag.llm import get_llm
+from ...rag.llm import get_llm, stream_text
+from ..history import get_history_manager
 
 
 def subject_info_node(state: Dict) -> Dict:
@@ -38,23 +39,24 @@ def subject_info_node(state: Dict) -> Dict:
                 {"role": "system", "content": SYSTEM_SUBJECT},
                 {"role": "user", "content": prompt},
             ]
-            resp = llm.invoke(msgs)
+            output = stream_text(llm, msgs)
             print("=== SUBJECT LLM RESP (matched) ===")
-            print(resp.content)
+            print(output)
             print("=== SUBJECT DEBUG END ===\n")
-            return {"output": resp.content}
+            return {"output": output, "history": [{"role": "assistant", "content": output}]}
 
     # 매칭이 없으면 LLM에 주제 목록과 함께 질의를 전달해 선택·응답하도록 위임
     llm = get_llm()
     prompt = build_subject_info_prompt(state["input"], db)
 
     history: list = state.get("history", [])
-    msgs = [{"role": "system", "content": prompt}] + history
+    # 최근 기록은 원문, 오래된 기록은 요약으로 토큰 예산 안에 맞춤
+    msgs = [{"role": "system", "content": prompt}] + get_history_manager().messages(history)
     print("=== SUBJECT 프롬프트 ===")
     print(msgs)
     print("=== SUBJECT 프롬프트 끝 ===")
-    resp = llm.invoke(msgs)
+    output = stream_text(llm, msgs)
     print("=== SUBJECT LLM RESP ===")
-    print(resp.content)
+    print(output)
     print("=== SUBJECT DEBUG END ===\n")
-    return {"output": resp.content, "history": history}
+    return {"output": output, "history": [{"role": "assistant", "content": output}]}
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+
+# 사용자에게 보내지 않을 내부 LLM 호출(라우팅, 대화 기록 요약 등)에 붙이는 태그
+NOSTREAM_TAG = "nostream"
+# 호출 종류 구분용 태그. 스트리밍 여부와는 무관하며 NOSTREAM_TAG와 함께 붙임
+ROUTER_TAG = "router"
+HISTORY_SUMMARY_TAG = "history_summary"
+
+
+@dataclass
+class StreamStats:
+    """한 턴의 스트리밍 시간 측정. `ttft_ms`(첫 토큰까지)가 사용자가 체감하는 지연."""
+
+    started: float = field(default_factory=time.perf_counter)
+    first_token: Optional[float] = None
+    finished: Optional[float] = None
+    tokens: int = 0
+    output: str = ""
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        return (self.first_token - self.started) * 1000 if self.first_token is not None else None
+
+    @property
+    def total_ms(self) -> Optional[float]:
+        return (self.finished - self.started) * 1000 if self.finished is not None else None
+
+
+def stream_answer(
+    graph: Any, inputs: Dict, stats: Optional[StreamStats] = None, config: Optional[dict] = None
+) -> Iterator[str]:
+    """그래프를 실행하며 답변 노드의 토큰 조각을 만들어지는 대로 내보냅니다 (`st.write_stream`용).
+
+    노드가 LLM을 스트리밍하지 않고 결과만 돌려준 경우에는 최종 `output`을 한 번에 내보냄.
+    """
+    stats = stats if stats is not None else StreamStats()
+    streamed = []
+    output = ""
+    for mode, payload in graph.stream(inputs, config=config, stream_mode=["messages", "values"]):
+        if mode == "values":
+            output = payload.get("output") or output
+            continue
+        chunk, metadata = payload
+        if NOSTREAM_TAG in (metadata.get("tags") or []):
+            continue
+        text = chunk.content if isinstance(chunk.content, str) else ""
+        if not text:
+            continue
+        if stats.first_token is None:
+            stats.first_token = time.perf_counter()
+        stats.tokens += 1
+        streamed.append(text)
+        yield text
+    if not streamed and output:
+        stats.first_token = time.perf_counter()
+        yield output
+    stats.finished = time.perf_counter()
+    stats.output = output or "".join(streamed)
+    print(f"스트리밍 완료: 첫 토큰 {stats.ttft_ms or 0:.0f} ms, 전체 {stats.total_ms:.0f} ms, 조각 {stats.tokens}개")
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import List, Optional
+
+import httpx
+
+from ..config import (
+    EMBED_API_CONCURRENCY,
+    EMBED_API_MAX_BATCH,
+    EMBED_API_MAX_CHARS,
+    EMBED_API_MAX_RETRIES,
+    EMBED_API_RATE,
+    EMBED_API_TIMEOUT,
+    EMBEDDING_API_BASE,
+    EMBEDDING_MODEL,
+)
+
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+# langchain_upstage와 같은 규칙: 문서 임베딩은 passage 모델로 보냄
+_PASSAGE_MODELS = {"solar-embedding-1-large": "solar-embedding-1-large-passage"}
+
+
+class EmbeddingAPIError(RuntimeError):
+    pass
+
+
+class TokenBucket:
+    """초당 `rate`개씩 채워지는 토큰 버킷 (최대 `capacity`개). 요청 하나에 토큰 하나."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def split_batches(texts: List[str], max_items: int, max_chars: int) -> List[List[str]]:
+    """요청 하나에 담을 수 있도록 개수·글자 수 기준으로 나눕니다."""
+    batches: List[List[str]] = []
+    batch: List[str] = []
+    chars = 0
+    for text in texts:
+        if batch and (len(batch) >= max_items or chars + len(text) > max_chars):
+            batches.append(batch)
+            batch, chars = [], 0
+        batch.append(text)
+        chars += len(text)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class AsyncEmbeddingClient:
+    """OpenAI 호환 `/embeddings` 엔드포인트용 asyncio 클라이언트.
+
+    - 하나의 `httpx.AsyncClient` 연결 풀을 모든 요청이 공유
+    - 토큰 버킷으로 초당 요청 수를, 세마포어로 동시에 진행 중인 요청 수를 제한
+    - 408/429/5xx·네트워크 오류는 지수 백오프 + full jitter로 재시도 (`Retry-After` 우선)
+    - 큰 입력은 미리 나누고, 413이 오면 배치를 반으로 쪼개 다시 보냄
+    """
+
+    def __init__(
+        self,
+        base_url: str = EMBEDDING_API_BASE,
+        model: str = EMBEDDING_MODEL,
+        api_key: Optional[str] = None,
+        max_batch: int = EMBED_API_MAX_BATCH,
+        max_chars: int = EMBED_API_MAX_CHARS,
+        concurrency: int = EMBED_API_CONCURRENCY,
+        rate: float = EMBED_API_RATE,
+        max_retries: int = EMBED_API_MAX_RETRIES,
+        timeout: float = EMBED_API_TIMEOUT,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+    ):
+        self.model = _PASSAGE_MODELS.get(model, model)
+        self.max_batch = max_batch
+        self.max_chars = max_chars
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._bucket = TokenBucket(rate)
+        self._inflight = asyncio.Semaphore(concurrency)
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        try:
+            return max(delay, float(retry_after)) if retry_after else delay
+        except ValueError:
+            return delay
+
+    async def _post(self, batch: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            await self._bucket.acquire()
+            try:
+                async with self._inflight:
+                    response = await self._client.post("/embeddings", json={"model": self.model, "input": batch})
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise EmbeddingAPIError(f"임베딩 요청 실패: {e}") from e
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code == 413 and len(batch) > 1:
+                half = len(batch) // 2
+                left, right = await asyncio.gather(self._post(batch[:half]), self._post(batch[half:]))
+                return left + right
+            if response.status_code in RETRYABLE_STATUS and attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+                continue
+            if response.status_code != 200:
+                raise EmbeddingAPIError(f"임베딩 요청 실패 ({response.status_code}): {response.text[:200]}")
+            data = sorted(response.json()["data"], key=lambda item: item["index"])
+            return [item["embedding"] for item in data]
+        raise EmbeddingAPIError("임베딩 요청 재시도 횟수 초과")
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """입력 순서대로 벡터를 반환. 나뉜 배치는 동시에 보냄 (동시성은 제한기가 조절)."""
+        batches = split_batches(list(texts), self.max_batch, self.max_chars)
+        results = await asyncio.gather(*(self._post(batch) for batch in batches))
+        return [vec for vectors in results for vec in vectors]
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from ..config import DOC_EMBEDDING_STORE_PATH, EMBED_BATCH_SIZE, EMBED_MAX_WORKERS, EMBEDDING_MODEL
+from .embedding_cache import DiskEmbeddingStore
+
+
+def content_hash(model_name: str, text: str) -> str:
+    """문서 벡터 저장소 키. 쿼리 캐시와 달리 원문 그대로를 해시합니다."""
+    return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def _default_compute(texts: List[str]) -> List[List[float]]:
+    from .embedder import get_embedder
+
+    return get_embedder().embed_documents(texts)
+
+
+def embed_corpus(
+    texts: List[str],
+    compute: Optional[Callable[[List[str]], List[List[float]]]] = None,
+    store: Optional[DiskEmbeddingStore] = None,
+    model_name: str = EMBEDDING_MODEL,
+    batch_size: int = EMBED_BATCH_SIZE,
+    max_workers: int = EMBED_MAX_WORKERS,
+) -> List[List[float]]:
+    """인덱스 빌드용 문서 임베딩.
+
+    - 저장소에 이미 있는 내용 해시는 건너뛰고, 새로 바뀐 텍스트만 임베딩
+    - 남은 텍스트를 `batch_size` 단위로 나눠 최대 `max_workers`개를 동시에 요청
+    - 배치가 끝날 때마다 저장소에 기록하므로 중간에 실패해도 다시 실행하면 이어서 진행
+    """
+    compute = compute or _default_compute
+    if store is None:
+        # 호출자가 저장소를 넘기지 않았으면 이번 호출에서만 열고 닫음
+        store = DiskEmbeddingStore(DOC_EMBEDDING_STORE_PATH)
+        try:
+            return embed_corpus(texts, compute, store, model_name, batch_size, max_workers)
+        finally:
+            store.close()
+
+    keys = [content_hash(model_name, t) for t in texts]
+    vectors: Dict[str, List[float]] = store.get_many(dict.fromkeys(keys))
+    key_to_text = {key: text for key, text in zip(keys, texts)}
+    missing = [key for key in key_to_text if key not in vectors]
+    batches = [missing[i:i + batch_size] for i in range(0, len(missing), batch_size)]
+    print(f"임베딩 대상 {len(key_to_text)}개 중 재사용 {len(key_to_text) - len(missing)}개, 신규 {len(missing)}개 ({len(batches)}배치)")
+
+    def run(batch: List[str]) -> Dict[str, List[float]]:
+        computed = compute([key_to_text[key] for key in batch])
+        if len(computed) != len(batch):
+            # zip으로 잘리면 일부 문서가 벡터 없이 빠지므로 저장하기 전에 실패 처리
+            raise ValueError(f"Embedding backend returned {len(computed)} vectors for {len(batch)} texts.")
+        embedded = dict(zip(batch, computed))
+        store.put_many(embedded)
+        return embedded
+
+    if batches:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            futures = [pool.submit(run, batch) for batch in batches]
+            done, pending = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in pending:
+                future.cancel()
+            for future in done:
+                # 실패한 배치가 있으면 그대로 전파. 완료된 배치는 이미 저장소에 기록됨
+                vectors.update(future.result())
+
+    return [vectors[key] for key in keys]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+from ..config import CHUNK_MAX_CHARS, CHUNK_OVERLAP
+from .docstore import IndexedDoc, review_id
+from .lexical import passage_tokens
+
+
+# 문장 끝(마침표·느낌표·물음표·줄바꿈) 뒤에서 자르는 것을 우선
+_SENTENCE_END = re.compile(r"[.!?。…]+[\"')\]]*\s+|\n+")
+
+
+def chunk_spans(text: str, max_chars: int = CHUNK_MAX_CHARS, overlap: int = CHUNK_OVERLAP) -> List[Tuple[int, int]]:
+    """`text`를 최대 `max_chars`글자, `overlap`글자씩 겹치는 (시작, 끝) 구간으로 나눕니다.
+
+    끝은 창의 뒤쪽 절반에 있는 마지막 문장 경계, 없으면 공백, 그것도 없으면 그대로 자름.
+    다음 구간은 겹침 구간 안의 첫 공백 뒤에서 시작해 단어 중간에서 시작하지 않게 함.
+    """
+    if max_chars <= 0 or len(text) <= max_chars:
+        return [(0, len(text))]
+    overlap = min(overlap, max_chars // 2)
+    spans: List[Tuple[int, int]] = []
+    start = 0
+    while True:
+        end = start + max_chars
+        if end >= len(text):
+            spans.append((start, len(text)))
+            return spans
+        window = text[start:end]
+        half = max_chars // 2
+        cut = max((m.end() for m in _SENTENCE_END.finditer(window) if m.end() > half), default=0)
+        if not cut:
+            space = window.rfind(" ", half)
+            cut = space + 1 if space > 0 else max_chars
+        end = start + cut
+        spans.append((start, end))
+        next_start = max(start + 1, end - overlap)
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space != -1 else next_start
+
+
+def iter_passages(
+    docs: Iterable[IndexedDoc], max_chars: int = CHUNK_MAX_CHARS, overlap: int = CHUNK_OVERLAP
+) -> Iterator[IndexedDoc]:
+    """리뷰를 패시지로 나눕니다. 메타데이터에 부모 리뷰 ID(`parent_id`)와 원문 내 글자 위치(`start`, `end`)를 기록.
+
+    짧은 리뷰는 패시지 하나가 되며 ID도 리뷰 ID와 같음. 입력을 한 건씩 흘려보내므로 스트리밍 빌드에 사용.
+    리뷰에 전처리 토큰이 있으면 각 패시지에는 그 패시지에 나오는 토큰만 넘김.
+    """
+    for doc in docs:
+        meta = doc.metadata
+        parent = review_id(str(meta.get("source", "")), str(meta.get("date", "")), doc.text)
+        spans = chunk_spans(doc.text, max_chars, overlap)
+        for n, (start, end) in enumerate(spans):
+            text = doc.text[start:end]
+            tokens = doc.tokens
+            if tokens is not None and len(spans) > 1:
+                tokens = passage_tokens(tokens, text)
+            yield IndexedDoc(
+                text=text,
+                metadata={**meta, "parent_id": parent, "chunk": n, "start": start, "end": end},
+                tokens=tokens,
+            )
+
+
+def chunk_docs(
+    docs: Iterable[IndexedDoc], max_chars: int = CHUNK_MAX_CHARS, overlap: int = CHUNK_OVERLAP
+) -> List[IndexedDoc]:
+    return list(iter_passages(docs, max_chars, overlap))
+
+
+def merge_passages(passages: Sequence[IndexedDoc]) -> str:
+    """한 리뷰의 패시지들을 글자 위치로 이어 붙여 원문을 복원 (겹친 부분은 한 번만)."""
+    parts: List[str] = []
+    covered = 0
+    for p in sorted(passages, key=lambda p: p.metadata.get("start", 0)):
+        start = p.metadata.get("start", 0)
+        end = p.metadata.get("end", start + len(p.text))
+        if end <= covered:
+            continue
+        if start > covered:
+            # 빠진 패시지가 있으면 생략 표시
+            parts.append(" … " if parts else "… ")
+        parts.append(p.text[max(0, covered - start):])
+        covered = end
+    return "".join(parts)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+from ..config import CONTEXT_MAX_PASSAGES, CONTEXT_TOKEN_BUDGET, MMR_LAMBDA, TOKENIZER_ENCODING
+from .lexical import tokenize
+
+
+# 잘린 컨텍스트로 남길 최소 토큰 수. 이보다 적게 남으면 넣지 않음
+MIN_TRUNCATED_TOKENS = 32
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    """tiktoken 인코딩. 설치되어 있지 않거나 BPE 파일을 받을 수 없으면 None (근사치로 폴백)."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception as e:
+        print(f"tiktoken을 사용할 수 없어 글자 수로 토큰을 근사합니다: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """LLM 입력 토큰 수. Solar 토크나이저와 정확히 같지는 않지만 예산 관리에는 충분한 근사."""
+    encoding = _encoding()
+    if encoding is None:
+        # 한국어는 대략 2글자당 1토큰
+        return math.ceil(len(text) / 2)
+    return len(encoding.encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _encoding()
+    if encoding is None:
+        return text[: max_tokens * 2].rstrip() + "…"
+    return encoding.decode(encoding.encode(text)[:max_tokens]).rstrip() + "…"
+
+
+def _similarity(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def mmr_order(texts: Sequence[str], lambda_: float = MMR_LAMBDA, duplicate_threshold: float = 0.8) -> List[int]:
+    """검색 순위를 관련도로 보고 MMR(maximal marginal relevance)로 다시 정렬한 인덱스.
+
+    - 관련도: 검색 순위 (1위 = 1.0에서 선형 감소)
+    - 중복도: 이미 고른 컨텍스트와의 토큰 자카드 유사도 최댓값
+    - 중복도가 `duplicate_threshold` 이상인 거의 같은 리뷰는 버림
+    """
+    token_sets = [set(tokenize(t)) for t in texts]
+    n = len(texts)
+    relevance = [1.0 - i / n for i in range(n)]
+    remaining = list(range(n))
+    selected: List[int] = []
+    while remaining:
+        scored = []
+        for i in remaining:
+            redundancy = max((_similarity(token_sets[i], token_sets[j]) for j in selected), default=0.0)
+            scored.append((lambda_ * relevance[i] - (1 - lambda_) * redundancy, redundancy, i))
+        score, redundancy, best = max(scored, key=lambda item: (item[0], -item[2]))
+        remaining.remove(best)
+        if redundancy >= duplicate_threshold:
+            continue
+        selected.append(best)
+    return selected
+
+
+def pack_contexts(
+    texts: Sequence[str],
+    budget: int = CONTEXT_TOKEN_BUDGET,
+    lambda_: Optional[float] = None,
+    max_contexts: int = CONTEXT_MAX_PASSAGES,
+) -> List[str]:
+    """MMR로 중복을 걸러 고른 뒤 토큰 예산 안에 들어가는 만큼만, 최대 `max_contexts`개까지 담습니다.
+
+    넘치는 리뷰는 잘라서 넣음.
+    """
+    packed: List[str] = []
+    remaining = budget
+    for i in mmr_order(texts, MMR_LAMBDA if lambda_ is None else lambda_)[:max_contexts]:
+        tokens = count_tokens(texts[i])
+        if tokens <= remaining:
+            packed.append(texts[i])
+            remaining -= tokens
+        elif remaining >= MIN_TRUNCATED_TOKENS:
+            packed.append(truncate_to_tokens(texts[i], remaining))
+            remaining = 0
+        if remaining < MIN_TRUNCATED_TOKENS:
+            break
+    return packed
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, TypeVar
+
+from .docstore import IndexedDoc
+
+
+T = TypeVar("T")
+# 원문 리뷰 파일. `preprocessed_reviews_*.csv`(형태소 토큰)는 포함하지 않음
+CORPUS_GLOB = "reviews_*.csv"
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """이터러블을 최대 `size`개씩 묶어 흘려보냅니다."""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def iter_review_file(path: Path, site: str) -> Iterator[IndexedDoc]:
+    """리뷰 CSV를 한 행씩 읽습니다 (csv 모듈이라 따옴표 안 줄바꿈·쉼표도 안전)."""
+    with path.open(encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("review"):
+                yield IndexedDoc(
+                    text=row["review"], metadata={"source": site, "rating": row.get("rating"), "date": row.get("date")}
+                )
+
+
+def iter_corpus(database_dir: Path = Path("database"), sites: Optional[Iterable[str]] = None) -> Iterator[IndexedDoc]:
+    """`database/reviews_<site>.csv` 전체를 파일 순서대로 스트리밍. 말뭉치 크기와 무관하게 한 행씩만 메모리에 둠."""
+    wanted = set(sites) if sites is not None else None
+    for path in sorted(database_dir.glob(CORPUS_GLOB)):
+        site = path.stem[len("reviews_"):]
+        if wanted is None or site in wanted:
+            yield from iter_review_file(path, site)
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+@dataclass
+class IndexedDoc:
+    text: str
+    metadata: dict
+    # 전처리 CSV의 형태소 토큰. BM25에 원문 토큰과 함께 색인 (없으면 None)
+    tokens: Optional[List[str]] = None
+
+
+def review_id(source: str, date: str, text: str) -> int:
+    """출처·날짜·본문으로 만든 안정적인 63비트 리뷰 ID. 재빌드해도 같은 리뷰는 같은 ID를 갖습니다."""
+    digest = hashlib.blake2b(f"{source}\x00{date}\x00{text}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+def passage_id(parent_id: int, start: int) -> int:
+    digest = hashlib.blake2b(f"{parent_id}\x00{start}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+def doc_id(doc: IndexedDoc) -> int:
+    """패시지는 (부모 리뷰 ID, 시작 위치)로, 첫 패시지와 나뉘지 않은 리뷰는 리뷰 ID 그대로."""
+    meta = doc.metadata
+    if "parent_id" in meta:
+        return meta["parent_id"] if meta.get("chunk", 0) == 0 else passage_id(meta["parent_id"], meta["start"])
+    return review_id(str(meta.get("source", "")), str(meta.get("date", "")), doc.text)
+
+
+def _doc(text: str, meta: str, tokens: Optional[str]) -> IndexedDoc:
+    return IndexedDoc(text=text, metadata=json.loads(meta), tokens=None if tokens is None else tokens.split())
+
+
+class DocStore:
+    """리뷰 ID(FAISS ID) → 문서를 저장하는 SQLite 테이블.
+
+    시작할 때 전체를 파싱하지 않고, 검색마다 적중한 k개 행만 기본키로 읽어 옵니다.
+    source/rating/date는 별도 컬럼으로 두어 facet 색인을 본문 없이 만들 수 있게 함.
+    패시지별 전처리 토큰도 빌드 시 함께 저장해, 서빙 중에는 `database/` CSV 없이 BM25 색인을 만듦.
+    """
+
+    def __init__(self, path: str | Path = ":memory:", readonly: bool = False):
+        self.path = str(path)
+        if readonly:
+            uri = f"file:{Path(self.path).resolve()}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._ensure_schema()
+        # 패시지 도입 전의 읽기 전용 테이블은 ID 자체를 부모로 봄
+        columns = self._columns()
+        self._parent_key = "parent_id" if "parent_id" in columns else "id"
+        # 토큰 컬럼이 없는 예전 읽기 전용 테이블은 토큰 없이 읽음
+        self._tokens_col = "tokens" if "tokens" in columns else "NULL"
+        self._lock = threading.Lock()
+
+    def _ensure_schema(self) -> None:
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS docs ("
+            "id INTEGER PRIMARY KEY, source TEXT, rating TEXT, date TEXT, text TEXT NOT NULL, metadata TEXT NOT NULL, "
+            "parent_id INTEGER, tokens TEXT)"
+        )
+        if "parent_id" not in self._columns():
+            # 패시지 도입 전 테이블: 각 리뷰가 자기 자신의 부모
+            self._conn.execute("ALTER TABLE docs ADD COLUMN parent_id INTEGER")
+            self._conn.execute("UPDATE docs SET parent_id = id")
+        if "tokens" not in self._columns():
+            # 토큰 저장 전 테이블: 기존 행은 원문 토큰만 사용 (재빌드하면 채워짐)
+            self._conn.execute("ALTER TABLE docs ADD COLUMN tokens TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS docs_parent ON docs (parent_id)")
+        self._conn.commit()
+
+    def _columns(self) -> List[str]:
+        return [row[1] for row in self._conn.execute("PRAGMA table_info(docs)")]
+
+    @classmethod
+    def copy_of(cls, path: str | Path, into: str | Path = ":memory:") -> "DocStore":
+        """파일 테이블을 복사해 엽니다 (기본은 메모리, 큰 말뭉치는 `into` 작업 파일). 수정해도 `save_as` 전까지 원본은 그대로."""
+        if into != ":memory:":
+            Path(into).unlink(missing_ok=True)
+        store = cls(into)
+        src = sqlite3.connect(str(path))
+        src.backup(store._conn)
+        src.close()
+        store._ensure_schema()
+        store._parent_key = "parent_id"
+        store._tokens_col = "tokens"
+        return store
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def __contains__(self, doc_id: int) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM docs WHERE id = ?", (doc_id,)).fetchone() is not None
+
+    def ids(self) -> List[int]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM docs")]
+
+    def existing(self, ids: Iterable[int]) -> Set[int]:
+        """주어진 ID 중 저장된 것만 반환."""
+        return {i for chunk in self._chunks(ids) for (i,) in self._select("SELECT id", chunk)}
+
+    def put_many(self, items: Iterable[Tuple[int, IndexedDoc]]) -> None:
+        rows = [
+            (
+                i,
+                str(d.metadata.get("source", "")),
+                None if d.metadata.get("rating") is None else str(d.metadata["rating"]),
+                None if d.metadata.get("date") is None else str(d.metadata["date"]),
+                d.text,
+                json.dumps(d.metadata, ensure_ascii=False),
+                d.metadata.get("parent_id", i),
+                None if d.tokens is None else " ".join(d.tokens),
+            )
+            for i, d in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO docs (id, source, rating, date, text, metadata, parent_id, tokens) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+    def delete_many(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM docs WHERE id = ?", [(i,) for i in ids])
+            self._conn.commit()
+
+    @staticmethod
+    def _chunks(ids: Iterable[int], size: int = 500) -> Iterator[List[int]]:
+        # SQLite 바인딩 변수 한도를 넘지 않도록 나눠서 조회
+        ids = [int(i) for i in ids]
+        for start in range(0, len(ids), size):
+            yield ids[start:start + size]
+
+    def _select(self, columns: str, chunk: List[int], key: str = "id") -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                f"{columns} FROM docs WHERE {key} IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+
+    def get_many(self, ids: Iterable[int]) -> Dict[int, IndexedDoc]:
+        """적중한 ID의 행만 기본키로 읽어 문서로 만듭니다."""
+        return {
+            i: _doc(text, meta, tokens)
+            for chunk in self._chunks(ids)
+            for i, text, meta, tokens in self._select(f"SELECT id, text, metadata, {self._tokens_col}", chunk)
+        }
+
+    def begin_mark(self) -> None:
+        """스트리밍 동기화용: 이번 말뭉치에서 본 ID를 임시 테이블에 기록 (파이썬 집합 없이 상수 메모리)."""
+        with self._lock:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (id INTEGER PRIMARY KEY)")
+            self._conn.execute("DELETE FROM seen")
+
+    def mark(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO seen VALUES (?)", [(int(i),) for i in ids])
+
+    def unmarked(self) -> List[int]:
+        """저장되어 있지만 이번 말뭉치에 없었던 ID (삭제 대상)."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM docs WHERE id NOT IN (SELECT id FROM seen)")]
+
+    def passages_of(self, parent_ids: Iterable[int]) -> Dict[int, List[IndexedDoc]]:
+        """부모 리뷰 ID → 그 리뷰의 모든 패시지."""
+        key = self._parent_key
+        found: Dict[int, List[IndexedDoc]] = {}
+        for chunk in self._chunks(parent_ids):
+            for parent, text, meta, tokens in self._select(
+                f"SELECT {key}, text, metadata, {self._tokens_col}", chunk, key=key
+            ):
+                found.setdefault(parent, []).append(_doc(text, meta, tokens))
+        return found
+
+    def items(self) -> Iterator[Tuple[int, IndexedDoc]]:
+        """전체 문서를 한 행씩 흘려보냅니다 (색인 구축용, 전체를 메모리에 올리지 않음)."""
+        cursor = self._conn.cursor()
+        for i, text, meta, tokens in cursor.execute(f"SELECT id, text, metadata, {self._tokens_col} FROM docs"):
+            yield i, _doc(text, meta, tokens)
+
+    def facet_rows(self) -> Iterator[Tuple[int, str, str, str]]:
+        """(id, source, rating, date)만 읽어 옵니다. 본문은 읽지 않음."""
+        cursor = self._conn.cursor()
+        yield from cursor.execute("SELECT id, source, rating, date FROM docs")
+
+    def save_as(self, path: str | Path) -> None:
+        """SQLite backup API로 다른 파일에 통째로 복사합니다."""
+        tmp = Path(str(path) + ".tmp")
+        tmp.unlink(missing_ok=True)
+        dest = sqlite3.connect(str(tmp))
+        with self._lock:
+            self._conn.backup(dest)
+        dest.close()
+        tmp.replace(path)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
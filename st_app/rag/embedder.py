@@ -1,27 +1,79 @@
 from __future__ import annotations
 
-import os
-from typing import List
+import asyncio
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
 
-from langchain_upstage import UpstageEmbeddings
-from pydantic import SecretStr
-import streamlit as st
+from ..config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_SIZE,
+    EMBEDDING_DISK_CACHE_SIZE,
+    EMBEDDING_MODEL,
+)
+from .embedding_backends import EMBEDDING_BACKENDS
+from .embedding_cache import DiskEmbeddingStore, EmbeddingCache
 
 
-_MODEL_CACHE: dict[str, UpstageEmbeddings] = {}
-api_key = SecretStr(os.getenv("UPSTAGE_API_KEY") or st.secrets.get("UPSTAGE_API_KEY", ""))
+_MODEL_CACHE: Dict[Tuple[str, str], Any] = {}
+_EMBEDDING_CACHE: Optional[EmbeddingCache] = None
+# httpx 연결 풀은 이벤트 루프에 묶이므로 루프마다 클라이언트 하나
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
 
-def get_embedder(model_name: str = "solar-embedding-1-large") -> UpstageEmbeddings:
-    if not api_key:
-        raise RuntimeError("UPSTAGE_API_KEY 환경변수가 필요합니다.")
-    if model_name not in _MODEL_CACHE:
-        _MODEL_CACHE[model_name] = UpstageEmbeddings(model=model_name, api_key=api_key)
-    return _MODEL_CACHE[model_name]
+
+def get_embedder(model_name: str = EMBEDDING_MODEL, backend: str = EMBEDDING_BACKEND) -> Any:
+    """설정된 백엔드의 임베딩 모델을 (백엔드, 모델)당 한 번만 만들어 재사용합니다."""
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}. Choices: {', '.join(EMBEDDING_BACKENDS)}")
+    if (backend, model_name) not in _MODEL_CACHE:
+        _MODEL_CACHE[(backend, model_name)] = EMBEDDING_BACKENDS[backend](model_name)
+    return _MODEL_CACHE[(backend, model_name)]
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _EMBEDDING_CACHE
+    if _EMBEDDING_CACHE is None:
+        disk = (
+            DiskEmbeddingStore(EMBEDDING_CACHE_PATH, max_entries=EMBEDDING_DISK_CACHE_SIZE)
+            if EMBEDDING_CACHE_PATH
+            else None
+        )
+        _EMBEDDING_CACHE = EmbeddingCache(EMBEDDING_MODEL, maxsize=EMBEDDING_CACHE_SIZE, disk=disk)
+    return _EMBEDDING_CACHE
 
 
 def encode_texts(texts: List[str]) -> List[List[float]]:
+    """텍스트를 임베딩합니다. 캐시에 없는 텍스트만 설정된 백엔드로 보냅니다."""
     embedder = get_embedder()
-    vectors = embedder.embed_documents(texts)
-    return vectors
+    return get_embedding_cache().encode(texts, embedder.embed_documents)
+
+
+def get_async_client() -> Any:
+    """현재 이벤트 루프의 공유 `AsyncEmbeddingClient` (upstage 백엔드 전용)."""
+    from .async_embedder import AsyncEmbeddingClient
+    from .embedding_backends import upstage_api_key
+
+    loop = asyncio.get_running_loop()
+    if loop not in _ASYNC_CLIENTS:
+        _ASYNC_CLIENTS[loop] = AsyncEmbeddingClient(api_key=upstage_api_key().get_secret_value())
+    return _ASYNC_CLIENTS[loop]
+
+
+async def aencode_texts(texts: List[str]) -> List[List[float]]:
+    """`encode_texts`의 비동기 버전. 같은 캐시를 쓰고, 원격 호출은 공유 풀·속도 제한·재시도를 거칩니다.
+
+    로컬 백엔드는 이벤트 루프를 막지 않도록 스레드에서 실행.
+    """
+    if EMBEDDING_BACKEND == "upstage":
+        compute = get_async_client().embed
+    else:
+        embedder = get_embedder()
+
+        async def compute(batch: List[str]) -> List[List[float]]:
+            return await asyncio.to_thread(embedder.embed_documents, batch)
+
+    return await get_embedding_cache().aencode(texts, compute)
 
 
+def embedding_cache_stats() -> dict:
+    return get_embedding_cache().stats()
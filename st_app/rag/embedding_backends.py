@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+from collections import Counter
+from typing import Callable, Dict, List
+
+from .lexical import tokenize
+
+
+class HashingEmbeddings:
+    """결정적 feature hashing 임베딩. 네트워크·모델 파일 없이 동작하므로 테스트와 오프라인 빌드용.
+
+    토큰과 글자 3-gram을 부호 있는 해시로 `dim`차원에 뿌린 뒤 L2 정규화합니다.
+    의미 유사도는 약하지만 같은 단어를 공유하는 문장끼리는 가깝게 나옴.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _features(self, text: str) -> Counter:
+        features: Counter = Counter()
+        for token in tokenize(text):
+            features[token] += 1
+            padded = f"<{token}>"
+            for i in range(len(padded) - 2):
+                features["#" + padded[i:i + 3]] += 0.5
+        return features
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for feature, weight in self._features(text).items():
+            h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+            vector[h % self.dim] += weight if (h >> 63) & 1 else -weight
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(t) for t in texts]
+
+
+class SentenceTransformerEmbeddings:
+    """sentence-transformers 모델을 프로세스당 한 번 로드해 CPU에서 실행하는 로컬 임베딩."""
+
+    def __init__(self, model_name: str, device: str = "cpu", batch_size: int = 32):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device=device)
+        self.batch_size = batch_size
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.model.encode(
+            list(texts), batch_size=self.batch_size, normalize_embeddings=True, show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def upstage_api_key():
+    """API 키는 업스테이지 백엔드를 실제로 쓸 때만 읽음 (로컬 백엔드는 키·streamlit 불필요)."""
+    from pydantic import SecretStr
+
+    key = os.getenv("UPSTAGE_API_KEY")
+    if not key:
+        import streamlit as st
+
+        key = st.secrets.get("UPSTAGE_API_KEY", "")
+    if not key:
+        raise RuntimeError("UPSTAGE_API_KEY 환경변수가 필요합니다.")
+    return SecretStr(key)
+
+
+def _upstage(model_name: str):
+    from langchain_upstage import UpstageEmbeddings
+
+    return UpstageEmbeddings(model=model_name, api_key=upstage_api_key())
+
+
+def _sentence_transformers(model_name: str):
+    return SentenceTransformerEmbeddings(model_name)
+
+
+def _hashing(model_name: str):
+    # 모델 이름 끝의 숫자를 차원으로 사용 (예: hashing-384)
+    suffix = model_name.rsplit("-", 1)[-1]
+    return HashingEmbeddings(dim=int(suffix) if suffix.isdigit() else 384)
+
+
+# 백엔드 이름 → (모델 이름 → `embed_documents`/`embed_query`를 가진 객체)
+EMBEDDING_BACKENDS: Dict[str, Callable[[str], object]] = {
+    "upstage": _upstage,
+    "sentence-transformers": _sentence_transformers,
+    "hashing": _hashing,
+}
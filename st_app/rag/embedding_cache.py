@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..utils.cache import LRUCache
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 정규화: 유니코드 NFKC, 대소문자 무시, 공백 정리."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(model_name: str, text: str) -> str:
+    return hashlib.sha256(f"{model_name}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+def _pack(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob: bytes) -> List[float]:
+    vec = array("f")
+    vec.frombytes(blob)
+    return vec.tolist()
+
+
+class DiskEmbeddingStore:
+    """키 → float32 벡터를 저장하는 SQLite 저장소. `max_entries`를 넘으면 오래 안 쓴 항목부터 제거."""
+
+    def __init__(self, path: str | Path, max_entries: Optional[int] = None):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings(accessed_at)")
+            self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        keys = list(keys)
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            # SQLite 바인딩 변수 한도를 넘지 않도록 나눠서 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update((key, _unpack(blob)) for key, blob in rows)
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE key = ?", [(now, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]) -> None:
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+                [(key, _pack(vec), now) for key, vec in items.items()],
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingCache:
+    """2단계 임베딩 캐시: 프로세스 내 LRU → (선택) 디스크 SQLite → 원격 임베딩.
+
+    키는 모델명 + 정규화된 텍스트의 해시이므로, 대소문자·공백만 다른 질문은 같은 벡터를 재사용합니다.
+    """
+
+    def __init__(self, model_name: str, maxsize: int = 1024, disk: Optional[DiskEmbeddingStore] = None):
+        self.model_name = model_name
+        self.memory: LRUCache[List[float]] = LRUCache(maxsize=maxsize)
+        self.disk = disk
+        self.disk_hits = 0
+
+    def _lookup(self, texts: List[str]) -> Tuple[List[str], Dict[str, List[float]], List[str]]:
+        """(키 목록, 캐시에서 찾은 벡터, 계산해야 할 키) 반환."""
+        keys = [cache_key(self.model_name, t) for t in texts]
+        vectors: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            vec = self.memory.get(key)
+            if vec is None:
+                missing.append(key)
+            else:
+                vectors[key] = vec
+
+        if missing and self.disk is not None:
+            from_disk = self.disk.get_many(missing)
+            self.disk_hits += len(from_disk)
+            for key, vec in from_disk.items():
+                self.memory.put(key, vec)
+            vectors.update(from_disk)
+            missing = [key for key in missing if key not in from_disk]
+        return keys, vectors, missing
+
+    def _store(self, computed: Dict[str, List[float]]) -> None:
+        for key, vec in computed.items():
+            self.memory.put(key, vec)
+        if self.disk is not None:
+            self.disk.put_many(computed)
+
+    def encode(self, texts: List[str], compute: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        keys, vectors, missing = self._lookup(texts)
+        if missing:
+            # 같은 키의 중복 텍스트는 한 번만 원격 호출
+            key_to_text = dict(zip(keys, texts))
+            computed = dict(zip(missing, compute([key_to_text[key] for key in missing])))
+            self._store(computed)
+            vectors.update(computed)
+        return [vectors[key] for key in keys]
+
+    async def aencode(
+        self, texts: List[str], compute: Callable[[List[str]], Awaitable[List[List[float]]]]
+    ) -> List[List[float]]:
+        """`encode`의 비동기 버전. 계산은 `await compute(...)`로 수행."""
+        keys, vectors, missing = self._lookup(texts)
+        if missing:
+            key_to_text = dict(zip(keys, texts))
+            computed = dict(zip(missing, await compute([key_to_text[key] for key in missing])))
+            self._store(computed)
+            vectors.update(computed)
+        return [vectors[key] for key in keys]
+
+    def stats(self) -> dict:
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["disk_size"] = len(self.disk) if self.disk is not None else 0
+        return stats
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+import faiss  # type: ignore
+import numpy as np
+
+from .index_store import IndexedDoc
+from .lexical import normalize_date
+
+
+# 사이트별 평점 척도를 10점 만점으로 맞춤 (전처리기와 같은 기준)
+RATING_SCALE = {"letterboxd": 2.0, "rottentomatoes": 2.0}
+
+
+@dataclass(frozen=True)
+class ReviewFilter:
+    """검색 필터. 평점은 10점 만점 기준, 날짜는 YYYY-MM-DD (양 끝 포함)."""
+
+    sources: Optional[Tuple[str, ...]] = None
+    min_rating: Optional[float] = None
+    max_rating: Optional[float] = None
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return all(v is None for v in (self.sources, self.min_rating, self.max_rating, self.date_from, self.date_to))
+
+
+def _rating(source: str, rating: Any) -> float:
+    try:
+        return float(rating) * RATING_SCALE.get(source, 1.0)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _date_key(value: Optional[str]) -> int:
+    """YYYY-MM-DD → YYYYMMDD 정수. 해석할 수 없으면 0."""
+    digits = normalize_date(str(value or "")).replace("-", "")
+    return int(digits) if len(digits) == 8 and digits.isdigit() else 0
+
+
+class FacetIndex:
+    """facet별 문서 비트맵(불리언 마스크)과 정렬 컬럼을 미리 계산해 두는 필터 색인.
+
+    필터는 마스크 AND로 허용 ID 집합을 만들고, FAISS에는 `IDSelector`로 넘겨
+    후보를 한 번만 훑는 검색을 하게 합니다 (많이 가져와서 버리는 후처리 없음).
+    """
+
+    def __init__(self, documents: Mapping[int, IndexedDoc]):
+        self._build(
+            (i, d.metadata.get("source", ""), d.metadata.get("rating"), d.metadata.get("date"))
+            for i, d in documents.items()
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, str, Any, Any]]) -> "FacetIndex":
+        """(id, source, rating, date) 행으로 만듭니다. `DocStore.facet_rows()`를 그대로 넘기면 본문은 읽지 않음."""
+        facets = cls.__new__(cls)
+        facets._build(rows)
+        return facets
+
+    def _build(self, rows: Iterable[Tuple[int, str, Any, Any]]) -> None:
+        ids, sources, ratings, dates = [], [], [], []
+        for i, source, rating, date in rows:
+            ids.append(i)
+            sources.append(str(source or ""))
+            ratings.append(_rating(str(source or ""), rating))
+            dates.append(_date_key(date))
+        self.ids = np.array(ids, dtype="int64")
+        self.by_source: Dict[str, np.ndarray] = {
+            s: np.array([src == s for src in sources], dtype=bool) for s in set(sources)
+        }
+        self.ratings = np.array(ratings, dtype="float32")
+        self.dates = np.array(dates, dtype="int64")
+
+    def mask(self, flt: ReviewFilter) -> np.ndarray:
+        mask = np.ones(len(self.ids), dtype=bool)
+        if flt.sources is not None:
+            source_mask = np.zeros(len(self.ids), dtype=bool)
+            for s in flt.sources:
+                if s in self.by_source:
+                    source_mask |= self.by_source[s]
+            mask &= source_mask
+        # NaN 평점·알 수 없는 날짜는 범위 비교에서 자동으로 제외됨
+        if flt.min_rating is not None:
+            mask &= self.ratings >= flt.min_rating
+        if flt.max_rating is not None:
+            mask &= self.ratings <= flt.max_rating
+        if flt.date_from is not None:
+            mask &= self.dates >= _date_key(flt.date_from)
+        if flt.date_to is not None:
+            mask &= (self.dates <= _date_key(flt.date_to)) & (self.dates > 0)
+        return mask
+
+    def select(self, flt: ReviewFilter) -> np.ndarray:
+        return self.ids[self.mask(flt)]
+
+
+def id_selector(ids: np.ndarray) -> faiss.IDSelector:
+    ids = np.ascontiguousarray(ids, dtype="int64")
+    return faiss.IDSelectorBatch(len(ids), faiss.swig_ptr(ids))
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+import faiss  # type: ignore
+import numpy as np
+
+from ..config import HNSW_EF_SEARCH, HNSW_M, INDEX_NLIST, INDEX_NPROBE, INDEX_TYPE, PCA_DIM, PQ_M, VECTOR_STORAGE
+
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+# 벡터 저장 정밀도 → index_factory 코드 (차원당 4 / 2 / 1바이트)
+STORAGE_CODES = {"float32": "Flat", "float16": "SQfp16", "sq8": "SQ8"}
+# IVF 계열은 리스트당 학습 벡터가 부족하면 클러스터 품질이 떨어짐
+MIN_POINTS_PER_LIST = 39
+# faiss k-means는 중심당 이보다 많은 학습 벡터를 받으면 어차피 샘플링함
+MAX_POINTS_PER_LIST = 256
+METRIC = faiss.METRIC_INNER_PRODUCT
+
+
+def normalize_l2(vectors) -> np.ndarray:
+    """모든 인덱스가 같은 지표(코사인 = 정규화 벡터의 내적)를 쓰도록 L2 정규화한 사본을 반환."""
+    x = np.array(vectors, dtype="float32", copy=True, ndmin=2)
+    faiss.normalize_L2(x)
+    return x
+
+
+@dataclass
+class IndexSpec:
+    kind: str = INDEX_TYPE
+    nlist: int = INDEX_NLIST
+    nprobe: int = INDEX_NPROBE
+    hnsw_m: int = HNSW_M
+    ef_search: int = HNSW_EF_SEARCH
+    pq_m: int = PQ_M
+    pq_nbits: int = 8
+    storage: str = VECTOR_STORAGE
+    pca_dim: int = PCA_DIM
+
+    def __post_init__(self):
+        if self.kind not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type: {self.kind}. Choices: {', '.join(INDEX_TYPES)}")
+        if self.storage not in STORAGE_CODES:
+            raise ValueError(f"Unknown vector storage: {self.storage}. Choices: {', '.join(STORAGE_CODES)}")
+
+    def effective_nlist(self, n_train: int) -> int:
+        """학습 벡터 수로 줄인 실제 nlist. 1 미만이면 IVF를 만들 수 없음."""
+        return min(self.nlist, n_train // MIN_POINTS_PER_LIST)
+
+    def train_size(self, n: int) -> int:
+        """벡터 `n`개 중 학습에 쓸 개수. IVF는 실제 nlist 기준 리스트당 `MAX_POINTS_PER_LIST`개까지만 사용.
+
+        이 수로 `build(dim, n_train=...)`를 호출해도 nlist는 `n`으로 정한 값과 같음.
+        """
+        nlist = self.effective_nlist(n)
+        if not self.kind.startswith("ivf") or nlist < 1:
+            return n
+        size = MAX_POINTS_PER_LIST * nlist
+        if self.kind == "ivf_pq":
+            # PQ 코드북(2^nbits 중심)도 같은 샘플로 학습
+            size = max(size, MAX_POINTS_PER_LIST * 2 ** self.pq_nbits)
+        return min(n, size)
+
+    def factory_string(self, dim: int, n_train: int) -> str:
+        """`faiss.index_factory` 문자열. 학습 데이터가 적으면 nlist를 줄이고, 너무 적으면 Flat으로 폴백.
+
+        `pca_dim`이 있으면 `PCA{d},L2norm,` 전처리를 붙여 차원을 줄이고 다시 정규화 (코사인 유지).
+        """
+        prefix = ""
+        if 0 < self.pca_dim < dim:
+            if n_train < self.pca_dim:
+                print(f"학습 벡터 {n_train}개로는 PCA{self.pca_dim}을 학습할 수 없어 차원 축소를 생략합니다.")
+            else:
+                prefix, dim = f"PCA{self.pca_dim},L2norm,", self.pca_dim
+        return prefix + self._base_factory_string(dim, n_train)
+
+    def _base_factory_string(self, dim: int, n_train: int) -> str:
+        code = STORAGE_CODES[self.storage]
+        if self.kind == "flat":
+            return code
+        if self.kind == "hnsw":
+            return f"HNSW{self.hnsw_m}" if self.storage == "float32" else f"HNSW{self.hnsw_m}_{code}"
+        nlist = self.effective_nlist(n_train)
+        if nlist < 1:
+            print(f"학습 벡터 {n_train}개로는 {self.kind}를 학습할 수 없어 Flat 인덱스를 사용합니다.")
+            return code
+        if self.kind == "ivf_flat":
+            return f"IVF{nlist},{code}"
+        # PQ 서브양자화기 수는 차원의 약수여야 함
+        pq_m = max(m for m in range(1, min(self.pq_m, dim) + 1) if dim % m == 0)
+        # 코드북 중심(2^nbits)당 학습 벡터가 부족하면 k-means 경고가 쏟아지고 양자화 품질이 떨어짐
+        if n_train < MIN_POINTS_PER_LIST * 2 ** self.pq_nbits:
+            print(f"학습 벡터 {n_train}개로는 PQ 코드북을 학습할 수 없어 IVF-Flat을 사용합니다.")
+            return f"IVF{nlist},Flat"
+        return f"IVF{nlist},PQ{pq_m}x{self.pq_nbits}"
+
+    def build(self, dim: int, n_train: int) -> faiss.Index:
+        return faiss.index_factory(dim, self.factory_string(dim, n_train), METRIC)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def unwrap(index: faiss.Index) -> faiss.Index:
+    """IDMap·PreTransform 래퍼를 벗겨 실제 검색 인덱스를 반환."""
+    index = faiss.downcast_index(index)
+    while isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2, faiss.IndexPreTransform)):
+        index = faiss.downcast_index(index.index)
+    return index
+
+
+def apply_search_params(index: faiss.Index, spec: IndexSpec) -> None:
+    """nprobe/efSearch는 인덱스 파일에 저장되지 않으므로 로드할 때마다 설정."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = spec.nprobe
+    base = unwrap(index)
+    if isinstance(base, faiss.IndexHNSW):
+        base.hnsw.efSearch = spec.ef_search
+
+
+def search_params(index: faiss.Index, spec: IndexSpec, sel: faiss.IDSelector) -> faiss.SearchParameters:
+    """ID 선택자를 인덱스 타입에 맞는 검색 파라미터로 감쌈 (nprobe/efSearch 유지)."""
+    if faiss.try_extract_index_ivf(index) is not None:
+        return faiss.SearchParametersIVF(sel=sel, nprobe=spec.nprobe)
+    if isinstance(unwrap(index), faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=sel, efSearch=spec.ef_search)
+    return faiss.SearchParameters(sel=sel)
+
+
+def with_ids(index: faiss.Index) -> faiss.Index:
+    """리뷰 ID로 벡터를 추가·삭제할 수 있게 합니다.
+
+    IVF 계열은 역색인 리스트에 ID를 직접 저장하고, ID로 `reconstruct`할 수 있도록 해시 direct map을 켬.
+    `IndexIDMap2`로 감싸면 `remove_ids`가 id_map만 줄이고 리스트의 라벨은 그대로 남아 검색 결과 ID가 어긋남.
+    """
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return index
+    return faiss.IndexIDMap2(index)
+
+
+def supports_remove(index: faiss.Index) -> bool:
+    if isinstance(unwrap(index), faiss.IndexHNSW):
+        return False
+    # 예전 빌드의 IDMap으로 감싼 IVF는 삭제하면 라벨이 어긋나므로 재구성 경로로 보냄
+    if faiss.try_extract_index_ivf(index) is not None:
+        return not isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2))
+    return True
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import faiss  # type: ignore
+import numpy as np
+
+from ..config import CORPUS_CHUNK_ROWS
+from .corpus import batched
+from .docstore import DocStore, IndexedDoc, doc_id, passage_id, review_id  # noqa: F401
+from .index_factory import IndexSpec, apply_search_params, normalize_l2, search_params, supports_remove, with_ids
+
+
+def read_index(ipath: Path, mmap: bool = True) -> faiss.Index:
+    """인덱스 파일을 읽습니다. 가능하면 mmap으로 열어 페이지 캐시를 공유합니다."""
+    if mmap:
+        try:
+            return faiss.read_index(str(ipath), faiss.IO_FLAG_MMAP)
+        except RuntimeError:
+            # mmap을 지원하지 않는 인덱스 타입은 일반 로드로 폴백
+            pass
+    return faiss.read_index(str(ipath))
+
+
+def docstore_path(manifest_path: Path) -> Path:
+    """매니페스트 옆에 두는 문서 테이블(SQLite) 경로."""
+    return manifest_path.with_name("docs.sqlite")
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class ReviewIndex:
+    """리뷰 ID를 키로 하는 FAISS 인덱스(IVF는 자체 ID, 그 외는 `IndexIDMap2`)와 ID → 문서 테이블(`DocStore`).
+
+    - 새 리뷰는 `add`로 추가, 사라진 리뷰는 `remove`로 삭제 (전체 재빌드 불필요)
+    - `sync`는 현재 말뭉치와 비교해 바뀐 부분만 반영
+    - 인덱스 타입은 `IndexSpec`으로 고르며, 벡터는 항상 L2 정규화 후 내적(코사인)으로 비교
+    """
+
+    def __init__(
+        self,
+        index: Optional[faiss.Index] = None,
+        docs: Optional[DocStore] = None,
+        spec: Optional[IndexSpec] = None,
+        version: str = "",
+    ):
+        self.spec = spec or IndexSpec()
+        self.index = index
+        # 새 인덱스는 메모리 테이블로 시작하고 `save` 때 파일로 복사
+        self.docs = docs if docs is not None else DocStore()
+        # 저장할 때마다 새로 발급되는 버전. 검색 결과 캐시 키에 넣어 재빌드 시 자동 무효화
+        self.version = version
+        if self.index is not None:
+            apply_search_params(self.index, self.spec)
+
+    @property
+    def ntotal(self) -> int:
+        return 0 if self.index is None else self.index.ntotal
+
+    @classmethod
+    def load(
+        cls,
+        index_path: Path,
+        manifest_path: Path,
+        mmap: bool = False,
+        spec: Optional[IndexSpec] = None,
+        readonly: bool = False,
+        scratch: Optional[Path] = None,
+    ) -> "ReviewIndex":
+        """`readonly=True`(검색용)면 문서 테이블을 열기만 하고 적중한 행만 조회.
+        기본값은 갱신용으로, 테이블을 메모리(또는 `scratch` 작업 파일)에 복사해 `save` 전까지 원본을 건드리지 않음.
+        """
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if spec is None and "index_spec" in manifest:
+            # 저장된 타입을 따르고, nprobe 등 검색 파라미터는 현재 설정값을 사용
+            saved = manifest["index_spec"]
+            spec = IndexSpec(
+                kind=saved["kind"],
+                storage=saved.get("storage", "float32"),
+                pca_dim=saved.get("pca_dim", 0),
+            )
+        path = docstore_path(manifest_path)
+        if readonly:
+            docs = DocStore(path, readonly=True)
+        else:
+            docs = DocStore.copy_of(path, into=scratch if scratch is not None else ":memory:")
+        return cls(read_index(index_path, mmap=mmap), docs, spec=spec, version=manifest.get("version", ""))
+
+    def save(self, index_path: Path, manifest_path: Path) -> None:
+        if self.index is None:
+            raise ValueError("Index is empty. Add documents before saving.")
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(index_path, faiss.serialize_index(self.index).tobytes())
+        target = docstore_path(manifest_path)
+        if Path(self.docs.path).resolve() != target.resolve():
+            self.docs.save_as(target)
+        self.version = uuid.uuid4().hex
+        manifest = {"dim": self.index.d, "index_spec": self.spec.to_dict(), "version": self.version}
+        atomic_write_bytes(manifest_path, json.dumps(manifest, ensure_ascii=False).encode("utf-8"))
+
+    def add(self, docs: List[IndexedDoc], vectors) -> List[int]:
+        """문서를 추가합니다. 이미 색인된 ID는 건너뜁니다."""
+        vectors = normalize_l2(vectors)
+        candidates = [doc_id(doc) for doc in docs]
+        existing = self.docs.existing(candidates)
+        ids, rows, seen = [], [], set()
+        for row, i in enumerate(candidates):
+            if i in existing or i in seen:
+                continue
+            seen.add(i)
+            ids.append(i)
+            rows.append(row)
+        if not ids:
+            return []
+        if self.index is None:
+            self.index = with_ids(self.spec.build(vectors.shape[1], n_train=len(rows)))
+            apply_search_params(self.index, self.spec)
+        if not self.index.is_trained:
+            # 학습은 리스트당 필요한 만큼만 고르게 뽑아서 (나머지는 학습 없이 추가만)
+            step = max(1, len(rows) // self.spec.train_size(len(rows)))
+            self.index.train(np.ascontiguousarray(vectors[rows[::step]]))
+        self.index.add_with_ids(np.ascontiguousarray(vectors[rows]), np.array(ids, dtype="int64"))
+        self.docs.put_many((i, docs[row]) for i, row in zip(ids, rows))
+        return ids
+
+    def remove(self, ids: Iterable[int]) -> int:
+        ids = list(self.docs.existing(ids))
+        if not ids or self.index is None:
+            return 0
+        if supports_remove(self.index):
+            removed = int(self.index.remove_ids(np.array(ids, dtype="int64")))
+            self.docs.delete_many(ids)
+            return removed
+        # HNSW는 삭제를 지원하지 않으므로 남은 벡터로 그래프만 다시 구성 (재임베딩 없음)
+        self.docs.delete_many(ids)
+        ivf = faiss.try_extract_index_ivf(self.index)
+        if ivf is not None and ivf.direct_map.type == faiss.DirectMap.NoMap:
+            # IDMap으로 감싼 예전 IVF: 내부 순번으로 reconstruct할 수 있게 direct map 생성
+            ivf.make_direct_map()
+        keep = self.docs.ids()
+        vectors = np.vstack([self.index.reconstruct(i) for i in keep]) if keep else None
+        kept = self.docs.get_many(keep)
+        self.docs.delete_many(keep)
+        self.index = None
+        if vectors is not None:
+            self.add([kept[i] for i in keep], vectors)
+        return len(ids)
+
+    def sync(
+        self,
+        docs: Iterable[IndexedDoc],
+        embed: Callable[[List[str]], List[List[float]]],
+        chunk_size: int = CORPUS_CHUNK_ROWS,
+    ) -> Tuple[int, int]:
+        """말뭉치와 비교해 새 리뷰만 임베딩·추가하고, 사라진 리뷰는 삭제합니다. (추가 수, 삭제 수) 반환.
+
+        `docs`는 제너레이터여도 되며 `chunk_size`개씩 읽어 임베딩·추가하므로 말뭉치 전체를 메모리에 두지 않음.
+        IVF 계열은 첫 묶음으로 학습.
+        """
+        self.docs.begin_mark()
+        added = 0
+        for batch in batched(docs, chunk_size):
+            ids = [doc_id(d) for d in batch]
+            self.docs.mark(ids)
+            existing = self.docs.existing(ids)
+            new_docs = list({i: d for i, d in zip(ids, batch) if i not in existing}.values())
+            if new_docs:
+                added += len(self.add(new_docs, embed([d.text for d in new_docs])))
+        removed = self.remove(self.docs.unmarked())
+        return added, removed
+
+    def search(
+        self, qvecs: np.ndarray, k: int, sel: Optional[faiss.IDSelector] = None
+    ) -> List[List[Tuple[int, float]]]:
+        """`sel`을 주면 선택된 리뷰 ID 안에서만 검색합니다."""
+        if self.index is None or self.index.ntotal == 0:
+            return [[] for _ in range(len(qvecs))]
+        params = search_params(self.index, self.spec, sel) if sel is not None else None
+        D, I = self.index.search(normalize_l2(qvecs), k, params=params)
+        return [
+            [(int(i), float(s)) for s, i in zip(scores, ids) if i != -1]
+            for scores, ids in zip(D, I)
+        ]
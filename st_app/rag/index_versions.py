@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from ..config import INDEX_KEEP_VERSIONS, INDEX_ROOT
+from .index_store import atomic_write_bytes
+
+
+# <INDEX_ROOT>/
+#   CURRENT                      게시된 버전 이름 (os.replace로 원자적 교체)
+#   versions/<버전>/manifest.json 빌드 매니페스트 (생성 시각, 이전 버전, 샤드별 통계)
+#   versions/<버전>/<사이트>/     index.faiss, manifest.json, docs.sqlite
+# 게시된 버전 디렉토리는 다시 쓰지 않으므로, 읽는 쪽은 반쯤 쓰인 파일을 볼 수 없음
+
+
+def index_root() -> Path:
+    return Path(INDEX_ROOT)
+
+
+def versions_dir() -> Path:
+    return index_root() / "versions"
+
+
+def version_dir(version: str) -> Path:
+    return versions_dir() / version
+
+
+def current_version() -> Optional[str]:
+    """CURRENT가 가리키는 버전. 아직 게시된 적이 없으면 None."""
+    try:
+        version = (index_root() / "CURRENT").read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def new_version() -> str:
+    """이름순 정렬이 생성 순서가 되도록 시각을 앞에 붙인 버전 이름."""
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def link_tree(src: Path, dst: Path) -> None:
+    """바뀌지 않은 샤드를 새 버전으로 가져옴. 가능하면 하드 링크 (게시된 파일은 수정하지 않으므로 안전)."""
+    dst.mkdir(parents=True, exist_ok=True)
+    for path in src.iterdir():
+        if not path.is_file():
+            continue
+        try:
+            os.link(path, dst / path.name)
+        except OSError:
+            shutil.copy2(path, dst / path.name)
+
+
+def publish(version: str, manifest: dict) -> None:
+    """빌드 매니페스트를 쓰고 CURRENT를 원자적으로 교체한 뒤 오래된 버전을 정리합니다."""
+    atomic_write_bytes(
+        version_dir(version) / "manifest.json", json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+    )
+    atomic_write_bytes(index_root() / "CURRENT", version.encode("utf-8"))
+    prune_versions(keep=INDEX_KEEP_VERSIONS)
+
+
+def prune_versions(keep: int = INDEX_KEEP_VERSIONS) -> None:
+    """최근 `keep`개와 현재 버전만 남기고 삭제. 이미 열린 파일은 닫힐 때까지 유지됨 (POSIX)."""
+    if not versions_dir().exists():
+        return
+    current = current_version()
+    names = sorted(p.name for p in versions_dir().iterdir() if p.is_dir())
+    for name in names[:-keep] if keep > 0 else names:
+        if name != current:
+            shutil.rmtree(version_dir(name), ignore_errors=True)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import csv
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Container, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+
+# 긴 조사부터 떼어냄. 전처리 토큰(Okt 어간)과 질의어를 맞추기 위한 가벼운 규칙
+_JOSA = sorted(
+    ["은", "는", "이", "가", "을", "를", "에", "의", "도", "로", "으로", "에서", "에게", "한테", "와", "과",
+     "이랑", "랑", "까지", "부터", "보다", "처럼", "만", "요", "이나", "나", "에서의", "으로는", "로는", "에는",
+     "들", "들은", "들이", "들의", "들을"],
+    key=len,
+    reverse=True,
+)
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-zA-Z0-9]+")
+_DATE_FORMATS = ("%Y-%m-%d", "%Y.%m.%d. %H:%M", "%Y.%m.%d.", "%Y.%m.%d", "%b %d, %Y")
+
+
+def tokenize(text: str) -> List[str]:
+    """질의/원문 토큰화: 한글·영숫자 단어를 소문자로 자르고 한국어 조사를 제거."""
+    tokens = []
+    for word in _TOKEN_RE.findall(text.lower()):
+        if "가" <= word[0] <= "힣":
+            for josa in _JOSA:
+                if len(word) > len(josa) + 1 and word.endswith(josa):
+                    word = word[: -len(josa)]
+                    break
+        tokens.append(word)
+    return tokens
+
+
+def normalize_date(value: str) -> str:
+    """사이트마다 다른 날짜 형식을 YYYY-MM-DD로 맞춥니다. 해석할 수 없으면 원문을 반환."""
+    value = value.strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    try:
+        # Letterboxd 원문은 ISO 8601 타임스탬프 (예: 2019-08-17T11:15:50.633Z)
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).strftime("%Y-%m-%d")
+    except ValueError:
+        return value
+
+
+def _looks_aligned(raw_text: str, tokens: Sequence[str]) -> bool:
+    """전처리 토큰이 원문에서 나온 것인지 대략 확인 (어간 앞 두 글자가 원문에 있는지)."""
+    if not tokens:
+        return True
+    haystack = raw_text.lower()
+    probe = tokens[:5]
+    return sum(t[:2] in haystack for t in probe) * 2 >= len(probe)
+
+
+def align_preprocessed(raw_rows: List[dict], pre_rows: List[dict], window: int = 20) -> Dict[str, List[str]]:
+    """원문 리뷰 → 전처리 토큰(`review` + `keywords`) 대응표.
+
+    전처리는 행을 걸러내기만 하고 순서는 유지하므로, 앞에서부터 `window`행 안에서
+    날짜와 토큰이 맞는 원문을 찾아 짝지음. 못 찾은 전처리 행은 건너뜀.
+    """
+    aligned: Dict[str, List[str]] = {}
+    i = 0
+    for pre in pre_rows:
+        tokens = pre.get("review", "").lower().split()
+        date = normalize_date(pre.get("date", ""))
+        for j in range(i, min(i + window, len(raw_rows))):
+            raw = raw_rows[j]
+            if normalize_date(raw.get("date", "")) == date and _looks_aligned(raw.get("review", ""), tokens):
+                # 키워드는 TF-IDF 상위 단어이므로 한 번 더 넣어 가중
+                aligned[raw["review"]] = tokens + pre.get("keywords", "").lower().split()
+                i = j + 1
+                break
+    return aligned
+
+
+def load_preprocessed_tokens(
+    database_dir: Path, sites: Optional[Iterable[str]] = None
+) -> Dict[Tuple[str, str], List[str]]:
+    """`database/preprocessed_reviews_<site>.csv`의 토큰을 (사이트, 원문) 키로 불러옵니다. 인덱스 빌드 시에만 사용."""
+    wanted = set(sites) if sites is not None else None
+    tokens: Dict[Tuple[str, str], List[str]] = {}
+    for pre_path in sorted(database_dir.glob("preprocessed_reviews_*.csv")):
+        site = pre_path.stem.replace("preprocessed_reviews_", "")
+        raw_path = database_dir / f"reviews_{site}.csv"
+        if wanted is not None and site not in wanted:
+            continue
+        if not raw_path.exists():
+            continue
+        with raw_path.open(encoding="utf-8", newline="") as f:
+            raw_rows = list(csv.DictReader(f))
+        with pre_path.open(encoding="utf-8", newline="") as f:
+            pre_rows = list(csv.DictReader(f))
+        for text, toks in align_preprocessed(raw_rows, pre_rows).items():
+            tokens[(site, text)] = toks
+    return tokens
+
+
+def passage_tokens(tokens: Sequence[str], passage: str) -> List[str]:
+    """리뷰 전체의 전처리 토큰 중 패시지에 나오는 것만 남깁니다.
+
+    어간("좋다")은 활용형("좋았다")과 끝이 다르므로 앞부분(세 글자 이상이면 두 글자, 아니면 한 글자)으로 확인.
+    """
+    haystack = passage.lower()
+    return [t for t in tokens if t[: 2 if len(t) > 2 else 1] in haystack]
+
+
+def lexical_tokens(text: str, tokens: Optional[Sequence[str]] = None) -> List[str]:
+    """BM25에 색인할 토큰: 저장된 전처리 토큰 + 원문 토큰."""
+    return list(tokens or []) + tokenize(text)
+
+
+class BM25Index:
+    """순수 파이썬 BM25 역색인. 네트워크 없이 1ms 안쪽으로 검색합니다."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[Hashable, int]]] = defaultdict(list)
+        self.doc_len: Dict[Hashable, int] = {}
+        self._idf: Dict[str, float] = {}
+        self._avgdl = 0.0
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    def add(self, doc_id: Hashable, tokens: Iterable[str]) -> None:
+        counts = Counter(tokens)
+        self.doc_len[doc_id] = sum(counts.values())
+        for token, tf in counts.items():
+            self.postings[token].append((doc_id, tf))
+        self._idf.clear()
+
+    def prepare(self) -> None:
+        """IDF·평균 길이를 미리 계산합니다. 생략하면 첫 검색 때 계산."""
+        n = len(self.doc_len)
+        self._avgdl = sum(self.doc_len.values()) / n if n else 0.0
+        self._idf = {
+            token: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for token, p in self.postings.items()
+        }
+
+    def search(
+        self, tokens: Iterable[str], k: int, allowed: Optional[Container[Hashable]] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """`allowed`를 주면 그 안의 문서만 점수를 매깁니다."""
+        if not self.doc_len:
+            return []
+        if not self._idf:
+            self.prepare()
+        scores: Dict[Hashable, float] = defaultdict(float)
+        for token in set(tokens):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            for doc_id, tf in self.postings[token]:
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / (self._avgdl or 1.0))
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[Hashable]], k: int = 60, limit: Optional[int] = None
+) -> List[Tuple[Hashable, float]]:
+    """여러 순위 목록을 RRF(1 / (k + rank))로 합칩니다. 점수 척도가 달라도 순위만으로 결합."""
+    fused: Dict[Hashable, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] += 1.0 / (k + rank)
+    ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return ranked[:limit] if limit is not None else ranked
@@ -1,16 +1,79 @@
 from __future__ import annotations
 
-import os
-from typing import Optional
-from pydantic import SecretStr
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
 from langchain_upstage import ChatUpstage
-import streamlit as st
 
-api_key = SecretStr(os.getenv("UPSTAGE_API_KEY") or st.secrets.get("UPSTAGE_API_KEY", ""))
+from ..config import LLM_API_BASE, LLM_MAX_CONNECTIONS, LLM_MODEL, LLM_TIMEOUT, LLM_WARMUP
+from .embedding_backends import upstage_api_key
+
+
+_LLM_CACHE: Dict[Tuple[str, float], ChatUpstage] = {}
+_LLM_LOCK = threading.Lock()
+_HTTP_CLIENT: Optional[httpx.Client] = None
+_WARMUP_THREAD: Optional[threading.Thread] = None
+
+
+def get_http_client() -> httpx.Client:
+    """모든 LLM 클라이언트가 공유하는 keep-alive 연결 풀. 턴마다 TCP/TLS 연결을 새로 맺지 않음."""
+    global _HTTP_CLIENT
+    with _LLM_LOCK:
+        if _HTTP_CLIENT is None:
+            _HTTP_CLIENT = httpx.Client(
+                timeout=LLM_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS
+                ),
+            )
+        return _HTTP_CLIENT
+
+
+def get_llm(model: str = LLM_MODEL, temperature: float = 0.2) -> ChatUpstage:
+    """(모델, temperature)당 한 번만 만든 `ChatUpstage`를 재사용합니다."""
+    key = (model, float(temperature))
+    client = _LLM_CACHE.get(key)
+    if client is None:
+        http_client = get_http_client()
+        with _LLM_LOCK:
+            if key not in _LLM_CACHE:
+                _LLM_CACHE[key] = ChatUpstage(
+                    model=model, temperature=temperature, api_key=upstage_api_key(), http_client=http_client
+                )
+            client = _LLM_CACHE[key]
+    return client
+
+
+def _ping() -> None:
+    try:
+        # 응답 내용과 상관없이 연결이 풀에 남아 다음 요청이 재사용함
+        get_http_client().get(
+            f"{LLM_API_BASE}/models",
+            headers={"Authorization": f"Bearer {upstage_api_key().get_secret_value()}"},
+        )
+        print("LLM 연결 워밍업 완료")
+    except Exception as e:
+        print(f"LLM 연결 워밍업 실패: {e}")
+
+
+def warm_up_llm(background: bool = True) -> None:
+    """라우터·답변용 클라이언트를 미리 만들고 API 연결을 열어 둡니다. 프로세스당 한 번만 실행."""
+    global _WARMUP_THREAD
+    if not LLM_WARMUP or _WARMUP_THREAD is not None:
+        return
+    # 노드들이 쓰는 조합: 라우터(0.0), 답변(기본값)
+    get_llm(temperature=0.0)
+    get_llm()
+    _WARMUP_THREAD = threading.Thread(target=_ping, daemon=True)
+    _WARMUP_THREAD.start()
+    if not background:
+        _WARMUP_THREAD.join()
 
-def get_llm(model: str = "solar-pro-250422", temperature: float = 0.2) -> ChatUpstage:
-    if not api_key:
-        raise RuntimeError("UPSTAGE_API_KEY 환경변수가 필요합니다.")
-    return ChatUpstage(model=model, temperature=temperature, api_key=api_key)
 
+def stream_text(llm: ChatUpstage, messages: list, config: Optional[dict] = None) -> str:
+    """스트리밍으로 호출해 전체 답변을 이어 붙여 반환합니다.
 
+    그래프를 `stream_mode="messages"`로 실행하면 토큰 조각이 만들어지는 대로 호출자에게 전달됨.
+    """
+    return "".join(str(chunk.content) for chunk in llm.stream(messages, config=config))
@@ -35,19 +35,18 @@ def build_subject_info_prompt(query: str, items: list[dict]) -> str:
     )
 
 
-def build_chat_prompt(user_input: str, state: dict) -> str:
-    """기본 채팅 노드용 프롬프트를 구성합니다."""
+def build_chat_prompt(user_input: str, history: list[dict], summary: str = "") -> str:
+    """기본 채팅 노드용 프롬프트를 구성합니다. `history`는 토큰 예산으로 줄인 최근 기록, `summary`는 그 이전의 요약."""
 
-    # state에서 대화 히스토리 추출
     history_text = ""
-    if state and "history" in state:
-        history = state["history"][-10:]  # 최근 10개 메시지만 (5턴)
-        if history:
-            history_items = []
-            for msg in history:
-                role = "사용자" if msg["role"] == "user" else "AI"
-                history_items.append(f"{role}: {msg['content']}")
-            history_text = f"\n[대화 히스토리]\n" + "\n".join(history_items) + "\n"
+    if summary:
+        history_text += f"\n[이전 대화 요약]\n{summary}\n"
+    if history:
+        history_items = []
+        for msg in history:
+            role = "사용자" if msg["role"] == "user" else "AI"
+            history_items.append(f"{role}: {msg['content']}")
+        history_text += f"\n[대화 히스토리]\n" + "\n".join(history_items) + "\n"
 
     return f"""
 당신은 도움이 되는 AI 어시스턴트입니다. 사용자와 자연스럽고 친근한 대화를 나누며 질문에 답변해주세요.
@@ -60,4 +59,19 @@ def build_chat_prompt(user_input: str, state: dict) -> str:
 3. 도움이 되는 정보를 제공
 4. 마크다운 포맷 사용 가능
 5. 한국어로 답변
-"""
\ No newline at end of file
+"""
+
+# 오래된 대화 기록을 누적 요약할 때 쓰는 시스템 메시지
+SYSTEM_HISTORY_SUMMARY = (
+    "당신은 대화 기록 요약기입니다. 이전 요약과 새 대화를 합쳐, 이후 대화에 필요한 사실·사용자의 관심사·"
+    "이미 답한 내용을 한국어로 간결히 정리하세요."
+)
+
+
+def build_history_summary_prompt(previous: str, messages: list[dict], max_tokens: int) -> str:
+    lines = [f"{'사용자' if m['role'] == 'user' else 'AI'}: {m['content']}" for m in messages]
+    return (
+        f"[지시] 이전 요약에 새 대화를 반영해 {max_tokens}토큰 이내로 다시 요약하세요.\n"
+        f"[이전 요약]\n{previous or '없음'}\n"
+        f"[새 대화]\n" + "\n".join(lines) + "\n"
+    )
@@ -1,100 +1,529 @@
 from __future__ import annotations
 
+import heapq
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from functools import lru_cache
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import faiss  # type: ignore
-import json
+import numpy as np
 
+from app.review.review_schema import SiteName
+
+from ..config import (
+    DOC_EMBEDDING_STORE_PATH,
+    HYBRID_CANDIDATES,
+    INDEX_BUILD_ON_START,
+    INDEX_POLL_INTERVAL,
+    RETRIEVAL_CACHE_SIZE,
+    RETRIEVAL_CACHE_TTL,
+    RETRIEVAL_MODE,
+    RRF_K,
+)
+from ..utils.cache import LRUCache
+from .batch_embedder import embed_corpus
+from .chunker import iter_passages, merge_passages
+from .corpus import iter_corpus
 from .embedder import encode_texts
+from .embedding_cache import DiskEmbeddingStore, normalize_text
+from .docstore import DocStore
+from .filters import FacetIndex, ReviewFilter, id_selector
+from .index_store import IndexedDoc, ReviewIndex, docstore_path
+from .index_versions import current_version, link_tree, new_version, publish, version_dir
+from .lexical import BM25Index, lexical_tokens, load_preprocessed_tokens, reciprocal_rank_fusion, tokenize
+
+
+RETRIEVAL_MODES = ("dense", "lexical", "hybrid")
+# collapse 검색 시 k개 리뷰를 채우기 위해 가져올 패시지 배수
+COLLAPSE_OVERSAMPLE = 3
 
 
 @dataclass
-class IndexedDoc:
+class SearchHit:
     text: str
     metadata: dict
+    score: float
+    doc_id: int = -1
 
 
-@lru_cache(maxsize=1)
-def _index_path() -> Path:
-    return Path("st_app/db/faiss_index/index.faiss")
+def _shard_paths(site: SiteName, version: str) -> Tuple[Path, Path]:
+    """버전별 사이트 샤드의 (index.faiss, manifest.json) 경로."""
+    shard_dir = version_dir(version) / site.value
+    return shard_dir / "index.faiss", shard_dir / "manifest.json"
 
 
-@lru_cache(maxsize=1)
-def _meta_path() -> Path:
-    return Path("st_app/db/faiss_index/meta.json")
+def _with_preprocessed_tokens(
+    docs: Iterable[IndexedDoc], preprocessed: Dict[Tuple[str, str], List[str]]
+) -> Iterator[IndexedDoc]:
+    for doc in docs:
+        doc.tokens = preprocessed.get((str(doc.metadata.get("source", "")), doc.text))
+        yield doc
+
+
+def update_index_from_datasets(
+    rebuild: bool = False,
+    embed: Optional[Callable[[List[str]], List[List[float]]]] = None,
+    sites: Optional[Iterable[SiteName]] = None,
+) -> Dict[SiteName, Tuple[int, int]]:
+    """사이트별 샤드를 데이터셋과 비교해 새 리뷰는 추가하고 사라진 리뷰는 삭제한 새 인덱스 버전을 게시합니다.
+
+    - 새 버전 디렉토리에 모든 샤드를 쓴 뒤 CURRENT를 원자적으로 바꿈. 실행 중인 앱은 반쯤 쓰인 파일을 보지 않음
+    - 샤드마다 독립적으로 갱신되므로 `sites`로 일부 사이트만 다시 만들 수 있음 (나머지와 안 바뀐 샤드는 링크로 가져옴)
+    - `rebuild=True`면 빈 인덱스에서 다시 만듦 (임베딩은 내용 해시 저장소에서 재사용)
+    - 긴 리뷰는 겹치는 패시지로 나눠 색인 (`CHUNK_MAX_CHARS`)
+    - 전처리 CSV의 형태소 토큰은 여기서 패시지별로 나눠 문서 테이블에 저장 (서빙 시에는 CSV를 읽지 않음)
+    - CSV는 `CORPUS_CHUNK_ROWS`행씩 스트리밍하고 문서 테이블도 새 버전 디렉토리에 바로 쓰므로 말뭉치 크기와 무관한 메모리로 빌드
+    - 바뀐 것이 없으면 새 버전을 게시하지 않음
+    - `embed`를 넘기지 않으면 문서 벡터 저장소를 한 번 열어 모든 청크가 공유하고 끝나면 닫음
+    - 반환값: 사이트 → (추가 수, 삭제 수), 패시지 단위
+    """
+    if embed is None:
+        embedding_store = DiskEmbeddingStore(DOC_EMBEDDING_STORE_PATH)
+        try:
+            return update_index_from_datasets(rebuild, partial(embed_corpus, store=embedding_store), sites)
+        finally:
+            embedding_store.close()
+
+    previous = current_version()
+    version = new_version()
+    targets = set(sites) if sites is not None else set(SiteName)
+    results: Dict[SiteName, Tuple[int, int]] = {}
+    shards: Dict[str, dict] = {}
+    changed = rebuild or previous is None
+    for site in SiteName:
+        ipath, manifest = _shard_paths(site, version)
+        old_manifest = _shard_paths(site, previous)[1] if previous is not None else None
+        has_old = old_manifest is not None and old_manifest.exists()
+        if site not in targets:
+            if has_old:
+                link_tree(old_manifest.parent, manifest.parent)
+            continue
+
+        manifest.parent.mkdir(parents=True, exist_ok=True)
+        if rebuild or not has_old:
+            store = ReviewIndex(docs=DocStore(docstore_path(manifest)))
+        else:
+            store = ReviewIndex.load(old_manifest.with_name("index.faiss"), old_manifest, scratch=docstore_path(manifest))
+        try:
+            preprocessed = load_preprocessed_tokens(Path("database"), sites=[site.value])
+            docs = _with_preprocessed_tokens(iter_corpus(sites=[site.value]), preprocessed)
+            added, removed = store.sync(iter_passages(docs), embed)
+            ntotal = store.ntotal
+            if ntotal and (added or removed or not has_old):
+                store.save(ipath, manifest)
+        finally:
+            store.docs.close()
+        if ntotal and not (added or removed or not has_old):
+            # 바뀌지 않은 샤드는 이전 버전 파일을 그대로 가져옴
+            shutil.rmtree(manifest.parent)
+            link_tree(old_manifest.parent, manifest.parent)
+        elif not ntotal:
+            # 리뷰가 하나도 남지 않은 샤드는 새 버전에서 제외
+            shutil.rmtree(manifest.parent)
+        changed = changed or bool(added or removed) or has_old != bool(ntotal)
+        results[site] = (added, removed)
+        shards[site.value] = {"ntotal": ntotal, "added": added, "removed": removed}
+
+    if not changed:
+        shutil.rmtree(version_dir(version), ignore_errors=True)
+        return results
+    version_dir(version).mkdir(parents=True, exist_ok=True)
+    publish(version, {"version": version, "parent": previous, "created_at": time.time(), "shards": shards})
+    print(f"인덱스 버전 {version} 게시 (이전: {previous})")
+    return results
 
 
 def ensure_simple_index_from_datasets() -> None:
-    """데모용 RAG 인덱스. 프로젝트의 `database/` 리뷰 CSV 일부를 묶어 인덱스 생성.
+    """데모용 RAG 인덱스. 게시된 버전이 없거나 샤드가 없는 사이트가 있으면 `database/` 리뷰 CSV로 생성.
 
-    - 실제 운영에서는 사전 전처리 후 임베딩/색인 과정을 별도 파이프라인으로 두어야 함
+    - 질의 경로에서는 호출하지 않음. 배포 시 `build_index.py` 또는 앱 시작 시 `prepare_retriever()`에서 실행
     """
-    ipath = _index_path()
-    mpath = _meta_path()
-    if ipath.exists() and mpath.exists():
+    version = current_version()
+    if version is None:
+        update_index_from_datasets(rebuild=True)
         return
+    missing = [site for site in SiteName if not _shard_paths(site, version)[1].exists()]
+    if missing:
+        update_index_from_datasets(sites=missing)
 
-    docs: List[IndexedDoc] = []
-    # 간단히 네이버 리뷰에서 앞부분만 사용
-    src = Path("database/reviews_naver.csv")
-    if src.exists():
-        lines = src.read_text(encoding="utf-8").splitlines()[1:300]
-        for line in lines:
-            parts = line.split(",", 3)
-            if len(parts) == 4:
-                rating, date, text = parts[1], parts[2], parts[3]
-                docs.append(IndexedDoc(text=text, metadata={"source": "naver", "rating": rating, "date": date}))
-    else:
-        # fallback 문서
-        docs = [
-            IndexedDoc(text="이 영화는 스토리가 탄탄하고 연출이 뛰어나다", metadata={"source": "fallback"}),
-            IndexedDoc(text="배우들의 연기가 훌륭해 감정 이입이 잘된다", metadata={"source": "fallback"}),
+
+def load_shards(mmap: bool = True, version: Optional[str] = None) -> Dict[SiteName, ReviewIndex]:
+    """게시된(또는 지정한) 버전의 샤드를 읽기 전용으로 엽니다."""
+    version = version or current_version()
+    shards: Dict[SiteName, ReviewIndex] = {}
+    if version is None:
+        return shards
+    for site in SiteName:
+        ipath, manifest = _shard_paths(site, version)
+        if ipath.exists() and manifest.exists():
+            shards[site] = ReviewIndex.load(ipath, manifest, mmap=mmap, readonly=True)
+    return shards
+
+
+def build_lexical_index(documents: Iterable[Tuple[int, IndexedDoc]]) -> BM25Index:
+    """(ID, 문서) 스트림으로 BM25 역색인을 만듭니다. 샤드에 저장된 패시지별 전처리 토큰을 원문 토큰과 함께 사용."""
+    index = BM25Index()
+    for i, doc in documents:
+        index.add(i, lexical_tokens(doc.text, doc.tokens))
+    index.prepare()
+    return index
+
+
+class Retriever:
+    """인덱스를 프로세스당 한 번만 로드해 상주시키는 리트리버.
+
+    - dense: 쿼리 임베딩 + `index.search`
+    - lexical: BM25만 사용 (네트워크 호출 없음)
+    - hybrid: 두 결과를 RRF로 결합. 임베딩 호출이 실패하면 lexical 결과로 폴백
+    - `filters`: 사이트·평점·날짜 facet 비트맵으로 허용 ID를 만들어 두 검색기 모두 그 안에서만 검색
+    - dense 검색은 사이트별 샤드를 스레드로 동시에 검색한 뒤 점수순으로 병합 (FAISS는 검색 중 GIL을 놓음)
+    - 문서 본문은 샤드의 `DocStore`에 두고 질의마다 최종 k개 행만 읽음 (시작 시 전체 파싱 없음)
+    - `cache`를 주면 (정규화된 질의, k, 모드, 필터, 인덱스 버전)별 결과를 재사용
+    - 결과는 패시지 단위. `collapse=True`면 같은 리뷰의 패시지를 묶어 원문 리뷰로 돌려줌
+    """
+
+    def __init__(
+        self,
+        shards: Dict[SiteName, ReviewIndex],
+        encoder: Callable[[List[str]], List[List[float]]] = encode_texts,
+        mode: str = RETRIEVAL_MODE,
+        cache: Optional[LRUCache[List[SearchHit]]] = None,
+    ):
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}. Choices: {', '.join(RETRIEVAL_MODES)}")
+        self._encoder = encoder
+        self.mode = mode
+        self.shards = shards
+        self.cache = cache
+        # 샤드 중 하나라도 다시 저장되면 바뀜
+        self.version = "|".join(f"{site.value}:{shard.version}" for site, shard in sorted(
+            shards.items(), key=lambda item: item[0].value
+        ))
+        self.lexical = build_lexical_index(chain.from_iterable(s.docs.items() for s in shards.values()))
+        self.facets = FacetIndex.from_rows(chain.from_iterable(s.docs.facet_rows() for s in shards.values()))
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(shards)), thread_name_prefix="shard-search")
+        # 진행 중인 검색 수. 닫기 요청 후 마지막 검색이 끝날 때 실제로 닫음
+        self._active = 0
+        self._closing = False
+        self._state_lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._state_lock:
+            if self._closing:
+                raise RuntimeError("Retriever is closed.")
+            self._active += 1
+
+    def release(self) -> None:
+        with self._state_lock:
+            self._active -= 1
+            ready = self._closing and self._active == 0
+        if ready:
+            self._close_now()
+
+    def close(self) -> None:
+        """진행 중인 검색이 없으면 바로 닫고, 있으면 마지막 검색이 끝날 때 닫음. 이후 새 검색은 거부."""
+        with self._state_lock:
+            if self._closing:
+                return
+            self._closing = True
+            ready = self._active == 0
+        if ready:
+            self._close_now()
+
+    def _close_now(self) -> None:
+        self._pool.shutdown(wait=True)
+        for shard in self.shards.values():
+            shard.docs.close()
+
+    def _dense_many(
+        self,
+        queries: List[str],
+        k: int,
+        allowed: Optional[np.ndarray] = None,
+        filters: Optional[ReviewFilter] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """질의 전체를 한 번에 임베딩하고, 샤드마다 쌓은 행렬로 `index.search`를 한 번만 호출."""
+        qvecs = np.asarray(self._encoder(queries), dtype="float32")
+        sel = id_selector(allowed) if allowed is not None else None
+        shards = [
+            shard for site, shard in self.shards.items()
+            if filters is None or filters.sources is None or site.value in filters.sources
+        ]
+        futures = [self._pool.submit(shard.search, qvecs, k, sel) for shard in shards]
+        per_shard = [f.result() for f in futures]
+        # 모든 샤드가 같은 모델·정규화(코사인)를 쓰므로 점수를 그대로 비교해 병합
+        return [
+            heapq.nlargest(k, chain.from_iterable(hits[q] for hits in per_shard), key=lambda hit: hit[1])
+            for q in range(len(queries))
+        ]
+
+    def _materialize(self, ids: List[int]) -> Dict[int, IndexedDoc]:
+        """적중한 ID의 문서만 샤드 테이블에서 읽어 옵니다."""
+        found: Dict[int, IndexedDoc] = {}
+        for shard in self.shards.values():
+            missing = [i for i in ids if i not in found]
+            if not missing:
+                break
+            found.update(shard.docs.get_many(missing))
+        return found
+
+    def search(
+        self,
+        query: str,
+        k: int = 3,
+        mode: Optional[str] = None,
+        filters: Optional[ReviewFilter] = None,
+        collapse: bool = False,
+    ) -> List[SearchHit]:
+        return self.search_many([query], k, mode=mode, filters=filters, collapse=collapse)[0]
+
+    def collapse(self, hits: List[SearchHit], k: int) -> List[SearchHit]:
+        """패시지 적중을 부모 리뷰별로 묶습니다. 순위·점수는 가장 좋은 패시지를 따르고 본문은 원문 전체."""
+        best: Dict[int, SearchHit] = {}
+        for hit in hits:
+            parent = hit.metadata.get("parent_id", hit.doc_id)
+            if parent not in best:
+                best[parent] = hit
+            if len(best) == k:
+                break
+        passages: Dict[int, List[IndexedDoc]] = {}
+        for shard in self.shards.values():
+            for parent, found in shard.docs.passages_of([p for p in best if p not in passages]).items():
+                passages[parent] = found
+        collapsed = []
+        for parent, hit in best.items():
+            metadata = {
+                key: value for key, value in hit.metadata.items() if key not in ("parent_id", "chunk", "start", "end")
+            }
+            text = merge_passages(passages[parent]) if parent in passages else hit.text
+            collapsed.append(SearchHit(text=text, metadata=metadata, score=hit.score, doc_id=parent))
+        return collapsed
+
+    def search_many(
+        self,
+        queries: List[str],
+        k: int = 3,
+        mode: Optional[str] = None,
+        filters: Optional[ReviewFilter] = None,
+        collapse: bool = False,
+    ) -> List[List[SearchHit]]:
+        """여러 질의를 한 번에 검색합니다. 임베딩 1회 + 샤드별 `index.search` 1회.
+
+        `search`를 반복 호출한 것과 같은 결과를 질의 순서대로 반환. 캐시에 있는 질의는 검색하지 않음.
+        """
+        self.acquire()
+        try:
+            return self._search_cached(queries, k, mode, filters, collapse)
+        finally:
+            self.release()
+
+    def _search_cached(
+        self, queries: List[str], k: int, mode: Optional[str], filters: Optional[ReviewFilter], collapse: bool
+    ) -> List[List[SearchHit]]:
+        mode = mode or self.mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}. Choices: {', '.join(RETRIEVAL_MODES)}")
+        if filters is not None and filters.is_empty():
+            filters = None
+        if collapse:
+            # 한 리뷰의 패시지가 여러 개 걸릴 수 있으므로 넉넉히 가져와 묶은 뒤 k개로 자름
+            return [
+                self.collapse(hits, k)
+                for hits in self._search_cached(queries, k * COLLAPSE_OVERSAMPLE, mode, filters, False)
+            ]
+        if self.cache is None:
+            return self._search_many(queries, k, mode, filters)[0]
+
+        keys = [(normalize_text(q), k, mode, filters, self.version) for q in queries]
+        results: List[Optional[List[SearchHit]]] = [self.cache.get(key) for key in keys]
+        todo = [n for n, hits in enumerate(results) if hits is None]
+        if todo:
+            computed, degraded = self._search_many([queries[n] for n in todo], k, mode, filters)
+            for n, hits in zip(todo, computed):
+                results[n] = hits
+                # 임베딩 실패로 BM25만 쓴 결과는 캐시하지 않음
+                if not degraded:
+                    self.cache.put(keys[n], hits)
+        return [list(hits) for hits in results]
+
+    def _search_many(
+        self, queries: List[str], k: int, mode: str, filters: Optional[ReviewFilter]
+    ) -> Tuple[List[List[SearchHit]], bool]:
+        """(질의별 결과, hybrid에서 dense 검색이 실패해 폴백했는지) 반환."""
+        if not queries:
+            return [], False
+        pool = max(k, HYBRID_CANDIDATES) if mode == "hybrid" else k
+
+        allowed: Optional[np.ndarray] = None
+        if filters is not None:
+            allowed = self.facets.select(filters)
+            if len(allowed) == 0:
+                return [[] for _ in queries], False
+
+        dense: Optional[List[List[Tuple[int, float]]]] = None
+        if mode in ("dense", "hybrid"):
+            try:
+                dense = self._dense_many(queries, pool, allowed, filters)
+            except Exception as e:
+                if mode == "dense":
+                    raise
+                print(f"임베딩 검색 실패, BM25 결과만 사용: {e}")
+        lexical: Optional[List[List[Tuple[int, float]]]] = None
+        if mode in ("lexical", "hybrid"):
+            allowed_set = set(allowed.tolist()) if allowed is not None else None
+            lexical = [self.lexical.search(tokenize(q), pool, allowed=allowed_set) for q in queries]
+
+        ranked_per_query: List[List[Tuple[int, float]]] = []
+        for q in range(len(queries)):
+            if dense is not None and lexical is not None:
+                ranked = reciprocal_rank_fusion(
+                    [[i for i, _ in dense[q]], [i for i, _ in lexical[q]]], k=RRF_K, limit=k
+                )
+            else:
+                ranked = (dense[q] if dense is not None else lexical[q])[:k]
+            ranked_per_query.append(ranked)
+
+        docs = self._materialize(list(dict.fromkeys(i for ranked in ranked_per_query for i, _ in ranked)))
+        hits = [
+            [
+                SearchHit(text=docs[i].text, metadata=docs[i].metadata, score=score, doc_id=i)
+                for i, score in ranked
+                if i in docs
+            ]
+            for ranked in ranked_per_query
         ]
+        return hits, mode == "hybrid" and dense is None
+
+
+_RETRIEVER: Optional[Retriever] = None
+_RETRIEVER_VERSION: Optional[str] = None
+_RETRIEVER_LOCK = threading.Lock()
+_SWAP_THREAD: Optional[threading.Thread] = None
+_PREPARE_THREAD: Optional[threading.Thread] = None
+_LAST_VERSION_CHECK = 0.0
+# 리트리버를 다시 만들어도 유지. 키에 인덱스 버전이 들어 있어 재빌드된 인덱스와 섞이지 않음
+_RESULT_CACHE: LRUCache[List[SearchHit]] = LRUCache(maxsize=RETRIEVAL_CACHE_SIZE, ttl=RETRIEVAL_CACHE_TTL)
+
+
+def _swap_to(version: str) -> None:
+    """새 버전을 백그라운드에서 로드한 뒤 참조만 바꿔 끼움. 로드하는 동안에는 이전 리트리버가 계속 응답."""
+    global _RETRIEVER, _RETRIEVER_VERSION
+    try:
+        retriever = Retriever(load_shards(version=version), cache=_RESULT_CACHE)
+    except Exception as e:
+        print(f"인덱스 버전 {version} 로드 실패, 이전 버전 유지: {e}")
+        return
+    with _RETRIEVER_LOCK:
+        old, _RETRIEVER, _RETRIEVER_VERSION = _RETRIEVER, retriever, version
+    print(f"인덱스 버전 교체: {version}")
+    if old is not None:
+        # 교체 직전에 이전 리트리버를 잡은 검색이 모두 끝나면 닫힘
+        old.close()
+
+
+def _maybe_swap() -> None:
+    """`INDEX_POLL_INTERVAL`마다 CURRENT를 확인하고, 바뀌었으면 백그라운드 교체를 시작."""
+    global _LAST_VERSION_CHECK, _SWAP_THREAD
+    now = time.monotonic()
+    if now - _LAST_VERSION_CHECK < INDEX_POLL_INTERVAL:
+        return
+    _LAST_VERSION_CHECK = now
+    version = current_version()
+    if version is None or version == _RETRIEVER_VERSION:
+        return
+    with _RETRIEVER_LOCK:
+        if _SWAP_THREAD is not None and _SWAP_THREAD.is_alive():
+            return
+        _SWAP_THREAD = threading.Thread(target=_swap_to, args=(version,), name="retriever-swap", daemon=True)
+        _SWAP_THREAD.start()
 
-    texts = [d.text for d in docs]
-    vectors = encode_texts(texts)
-    dim = len(vectors[0])
-    index = faiss.IndexFlatIP(dim)
-    import numpy as np
-
-    index.add(np.array(vectors, dtype="float32"))
-    ipath.parent.mkdir(parents=True, exist_ok=True)
-    faiss.write_index(index, str(ipath))
-    mpath.write_text(json.dumps({"documents": [d.__dict__ for d in docs]}, ensure_ascii=False), encoding="utf-8")
-
-
-def retrieve(query: str, k: int = 3) -> List[Tuple[str, dict]]:
-    ensure_simple_index_from_datasets()
-    import numpy as np
-    ipath, mpath = _index_path(), _meta_path()
-    index = faiss.read_index(str(ipath))
-    meta = json.loads(mpath.read_text(encoding="utf-8"))
-    
-    # Handle different meta.json formats
-    if isinstance(meta, dict) and "documents" in meta:
-        documents = meta["documents"]
-        texts = [d["text"] for d in documents]
+
+def _prepare() -> None:
+    try:
+        if INDEX_BUILD_ON_START:
+            ensure_simple_index_from_datasets()
+        get_retriever()
+    except Exception as e:
+        print(f"인덱스 준비 실패: {e}")
+
+
+def prepare_retriever(background: bool = True) -> None:
+    """앱 시작 시 인덱스를 준비(없으면 생성)하고 리트리버를 미리 로드. 프로세스당 한 번만 실행."""
+    global _PREPARE_THREAD
+    if _PREPARE_THREAD is None:
+        _PREPARE_THREAD = threading.Thread(target=_prepare, name="retriever-prepare", daemon=True)
+        _PREPARE_THREAD.start()
+    if not background:
+        _PREPARE_THREAD.join()
+
+
+def get_retriever() -> Retriever:
+    """프로세스 공용 리트리버. 새 인덱스 버전이 게시되면 재시작 없이 질의 사이에 교체됨.
+
+    - 인덱스는 만들지 않음: 배포 시 `build_index.py`로 게시하거나 앱 시작 시 `prepare_retriever()`로 준비
+    """
+    global _RETRIEVER, _RETRIEVER_VERSION
+    if _RETRIEVER is None:
+        # 시작 시 준비 중이면 끝날 때까지 기다림
+        if _PREPARE_THREAD is not None and _PREPARE_THREAD is not threading.current_thread():
+            _PREPARE_THREAD.join()
+        with _RETRIEVER_LOCK:
+            if _RETRIEVER is None:
+                version = current_version()
+                if version is None:
+                    raise RuntimeError(
+                        "게시된 인덱스가 없습니다. `python st_app/db/faiss_index/build_index.py`로 먼저 생성하세요."
+                    )
+                _RETRIEVER = Retriever(load_shards(version=version), cache=_RESULT_CACHE)
+                _RETRIEVER_VERSION = version
     else:
-        # meta is a list directly
-        documents = meta
-        texts = [d["review"] for d in documents]  # Use "review" field from the actual structure
-    
-    qvec = encode_texts([query])[0]
-    D, I = index.search(np.array([qvec], dtype="float32"), k)
-    results: List[Tuple[str, dict]] = []
-    for idx in I[0]:
-        if idx == -1:
-            continue
-        doc = documents[int(idx)]
-        if isinstance(meta, dict) and "documents" in meta:
-            results.append((doc["text"], doc.get("metadata", {})))
-        else:
-            # Convert to expected format
-            metadata = {k: v for k, v in doc.items() if k != "review"}
-            results.append((doc["review"], metadata))
-    return results
+        _maybe_swap()
+    return _RETRIEVER
+
+
+@contextmanager
+def _checkout() -> Iterator[Retriever]:
+    """현재 리트리버를 검색이 끝날 때까지 붙잡음. 그 사이 교체되어도 이전 리트리버는 닫히지 않음."""
+    get_retriever()
+    with _RETRIEVER_LOCK:
+        retriever = _RETRIEVER
+        retriever.acquire()
+    try:
+        yield retriever
+    finally:
+        retriever.release()
+
+
+def retrieve(
+    query: str,
+    k: int = 3,
+    mode: Optional[str] = None,
+    filters: Optional[ReviewFilter] = None,
+    collapse: bool = False,
+) -> List[Tuple[str, dict]]:
+    with _checkout() as retriever:
+        hits = retriever.search(query, k, mode=mode, filters=filters, collapse=collapse)
+    return [(hit.text, hit.metadata) for hit in hits]
+
+
+def retrieve_many(
+    queries: List[str],
+    k: int = 3,
+    mode: Optional[str] = None,
+    filters: Optional[ReviewFilter] = None,
+    collapse: bool = False,
+) -> List[List[Tuple[str, dict]]]:
+    """`retrieve`의 배치 버전 (오프라인 평가, 질의 확장, 한 턴에 여러 질문)."""
+    with _checkout() as retriever:
+        results = retriever.search_many(queries, k, mode=mode, filters=filters, collapse=collapse)
+    return [[(hit.text, hit.metadata) for hit in hits] for hits in results]
 
 
+def retrieval_cache_stats() -> dict:
+    return _RESULT_CACHE.stats()
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import TypedDict
+import operator
+from typing import Annotated, TypedDict
 
 
 class ConversationState(TypedDict, total=False):
     input: str
     output: str
     next_node: str  # 라우터에서 결정된 다음 노드
-    history: list[dict]  # 대화 기록
+    # 대화 기록. 체크포인트에 누적되며 노드는 새 메시지만 반환 (operator.add로 이어 붙임)
+    history: Annotated[list[dict], operator.add]
 
 
@@ -1,4 +1,5 @@
 import os
+import uuid
 from pathlib import Path
 import streamlit as st
 from dotenv import load_dotenv
@@ -18,28 +19,39 @@ def main() -> None:
         "Upstage/OpenAI 등 LLM 키는 환경변수로 설정해주세요. 예: OPENAI_API_KEY"
     )
 
-    st.session_state.setdefault("messages", [])
+    # 대화 상태는 thread_id별로 SQLite 체크포인트에 저장. URL에 남겨 새로고침·재시작 후에도 이어서 대화
+    thread_id = st.query_params.get("thread") or uuid.uuid4().hex
+    st.query_params["thread"] = thread_id
 
     # 간단한 데모용 입력 UI. 실제 그래프 실행은 st_app/graph/router.py에 위임합니다.
-    from st_app.graph.graph_builder import get_or_create_graph
+    from st_app.graph.graph_builder import get_or_create_graph, thread_config
+    from st_app.graph.streaming import StreamStats, stream_answer
+    from st_app.rag.llm import warm_up_llm
+    from st_app.rag.retriever import prepare_retriever
 
     graph = get_or_create_graph()
+    warm_up_llm()
+    # 첫 리뷰 질문이 말뭉치 전체 임베딩을 기다리지 않도록 인덱스를 시작 시점에 준비
+    prepare_retriever()
+    config = thread_config(thread_id)
 
-    user_input = st.chat_input("메시지를 입력하세요… 예: 리뷰 내용 알려줘, 영화 정보 알려줘")
-    if user_input:
-        st.session_state["messages"].append({"role": "user", "content": user_input})
-        for event in graph.stream(
-            {"input": user_input, "history": st.session_state["messages"]}, 
-            stream_mode="values"
-        ):
-            last = event.get("output")
-            if last:
-                st.session_state["messages"].append({"role": "assistant", "content": last})
-
-    for m in st.session_state["messages"]:
+    for m in graph.get_state(config).values.get("history", []):
         with st.chat_message(m["role"]):
             st.markdown(m["content"])
 
+    user_input = st.chat_input("메시지를 입력하세요… 예: 리뷰 내용 알려줘, 영화 정보 알려줘")
+    if user_input:
+        with st.chat_message("user"):
+            st.markdown(user_input)
+        # 새 메시지만 보내고 이전 기록은 체크포인트에서 읽음. 지난 턴의 output은 비움
+        inputs = {"input": user_input, "output": "", "history": [{"role": "user", "content": user_input}]}
+        # 답변 노드의 토큰을 만들어지는 대로 화면에 표시
+        stats = StreamStats()
+        with st.chat_message("assistant"):
+            st.write_stream(stream_answer(graph, inputs, stats, config=config))
+            if stats.ttft_ms is not None:
+                st.caption(f"첫 토큰 {stats.ttft_ms:.0f} ms · 전체 {stats.total_ms:.0f} ms")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,108 @@
+import pytest
+
+pytest.importorskip("numpy")
+from st_app.graph.answer_cache import CachedGraph, SemanticAnswerCache  # noqa: E402
+
+VECTORS = {
+    "기생충 리뷰 요약해줘": [1.0, 0.0, 0.0],
+    "기생충 리뷰 요약 좀": [0.98, 0.2, 0.0],
+    "기생충 감독 누구야": [0.0, 0.0, 1.0],
+    "안녕": [0.0, 1.0, 0.0],
+}
+
+
+class FakeGraph:
+    def __init__(self):
+        self.runs = 0
+
+    def stream(self, inputs, config=None, stream_mode="values"):
+        self.runs += 1
+        route = {"기생충 감독 누구야": "subject_info", "안녕": "chat"}.get(inputs["input"], "rag_review")
+        state = {**inputs, "output": f"답변 {self.runs}"}
+        if route != "chat":
+            state["next_node"] = route
+        yield ("values", inputs)
+        yield ("messages", ("token", {}))
+        yield ("values", state)
+
+
+def _graph(cache, version="v1"):
+    embed = lambda texts: [VECTORS[t] for t in texts]  # noqa: E731
+    return CachedGraph(FakeGraph(), cache, embed, version=lambda: version)
+
+
+def _output(graph, query):
+    events = list(graph.stream({"input": query}, stream_mode=["messages", "values"]))
+    return [e for mode, e in events if mode == "values"][-1]["output"]
+
+
+def test_near_duplicate_question_is_served_from_cache():
+    cache = SemanticAnswerCache(threshold=0.9)
+    graph = _graph(cache)
+
+    assert _output(graph, "기생충 리뷰 요약해줘") == "답변 1"
+    assert _output(graph, "  기생충 리뷰 요약해줘 ") == "답변 1"
+    assert _output(graph, "기생충 리뷰 요약 좀") == "답변 1"
+    assert _output(graph, "기생충 감독 누구야") == "답변 2"
+    assert graph.graph.runs == 2
+    assert cache.stats()["exact_hits"] == 1
+
+
+def test_chat_answers_are_not_cached_and_versions_are_isolated():
+    cache = SemanticAnswerCache(threshold=0.9)
+
+    assert _output(_graph(cache), "안녕") == "답변 1"
+    assert len(cache) == 0
+
+    _output(_graph(cache, "v1"), "기생충 리뷰 요약해줘")
+    newer = _graph(cache, "v2")
+    assert _output(newer, "기생충 리뷰 요약해줘") == "답변 1"
+    assert newer.graph.runs == 1
+
+
+def test_persisted_entries_expire_and_evict(tmp_path):
+    path = tmp_path / "answers.sqlite"
+    cache = SemanticAnswerCache(path, maxsize=1)
+    cache.put("a", [1.0, 0.0], "rag_review", "v1", "A")
+    cache.put("b", [0.0, 1.0], "rag_review", "v1", "B")
+    cache.close()
+
+    reopened = SemanticAnswerCache(path, maxsize=1)
+    assert len(reopened) == 1
+    assert reopened.get_similar([0.0, 1.0], ["rag_review"], "v1").answer == "B"
+
+    expired = SemanticAnswerCache(path, ttl=-1)
+    assert expired.get_exact("b", ["rag_review"], "v1") is None
+    assert len(expired) == 0
+
+
+def test_embedding_failure_falls_through_to_graph():
+    def broken_embed(texts):
+        raise RuntimeError("embedding API down")
+
+    cache = SemanticAnswerCache(threshold=0.9)
+    graph = CachedGraph(FakeGraph(), cache, broken_embed, version=lambda: "v1")
+
+    assert _output(graph, "기생충 리뷰 요약해줘") == "답변 1"
+    assert len(cache) == 0
+
+    # 조회는 임베딩 없이 지나가고 답변을 스트리밍한 뒤 저장 단계에서 실패하는 경우
+    hinted = CachedGraph(FakeGraph(), cache, broken_embed, version=lambda: "v1", route_hint=lambda q: "subject_info")
+    assert _output(hinted, "기생충 리뷰 요약해줘") == "답변 1"
+    assert len(cache) == 0
+
+
+def test_subject_info_hint_skips_embedding():
+    calls = []
+
+    def embed(texts):
+        calls.append(texts)
+        return [VECTORS[t] for t in texts]
+
+    cache = SemanticAnswerCache(threshold=0.9)
+    graph = CachedGraph(FakeGraph(), cache, embed, version=lambda: "v1", route_hint=lambda q: "subject_info")
+
+    assert _output(graph, "기생충 감독 누구야") == "답변 1"
+    assert _output(graph, "기생충 감독 누구야 ") == "답변 1"
+    assert calls == []
+    assert graph.graph.runs == 1
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+from st_app.rag.async_embedder import AsyncEmbeddingClient, EmbeddingAPIError, split_batches  # noqa: E402
+
+
+class StubEmbeddingServer:
+    """/embeddings 스텁. 처음 `fail_first`번은 429, `max_batch`보다 큰 요청은 413을 반환."""
+
+    def __init__(self, fail_first=0, max_batch=None, status=None):
+        self.requests = []
+        self.accepted = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                stub.requests.append(body["input"])
+                if status is not None:
+                    return self._reply(status, {"error": "boom"})
+                if len(stub.requests) <= fail_first:
+                    return self._reply(429, {"error": "rate limited"})
+                if max_batch is not None and len(body["input"]) > max_batch:
+                    return self._reply(413, {"error": "too large"})
+                stub.accepted.append(body["input"])
+                data = [{"index": i, "embedding": [float(len(t)), 1.0]} for i, t in enumerate(body["input"])]
+                self._reply(200, {"data": list(reversed(data))})
+
+            def _reply(self, code, payload):
+                raw = json.dumps(payload).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def run_embed(server, texts, **kwargs):
+    async def main():
+        client = AsyncEmbeddingClient(base_url=server.url, rate=1000, backoff_base=0.01, **kwargs)
+        try:
+            return await client.embed(texts)
+        finally:
+            await client.aclose()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.close()
+
+
+def test_split_batches_respects_items_and_chars():
+    assert split_batches(["a", "bb", "ccc", "d"], max_items=2, max_chars=100) == [["a", "bb"], ["ccc", "d"]]
+    assert split_batches(["aaaa", "bbbb", "c"], max_items=10, max_chars=5) == [["aaaa"], ["bbbb", "c"]]
+
+
+def test_retries_on_429_and_keeps_order():
+    server = StubEmbeddingServer(fail_first=2)
+
+    vectors = run_embed(server, ["a", "bbb", "cc"])
+
+    assert vectors == [[1.0, 1.0], [3.0, 1.0], [2.0, 1.0]]
+    assert len(server.requests) == 3
+
+
+def test_splits_batch_on_413():
+    server = StubEmbeddingServer(max_batch=2)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+    vectors = run_embed(server, texts)
+
+    assert [v[0] for v in vectors] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    # 5개 → 2+3, 3개도 413이면 다시 나뉨. 성공한 요청만 보면 모두 2개 이하이고 각 텍스트는 한 번씩
+    assert all(len(batch) <= 2 for batch in server.accepted)
+    assert sorted(t for batch in server.accepted for t in batch) == texts
+
+
+def test_gives_up_after_max_retries():
+    server = StubEmbeddingServer(status=503)
+
+    with pytest.raises(EmbeddingAPIError):
+        run_embed(server, ["a"], max_retries=2)
+    assert len(server.requests) == 3
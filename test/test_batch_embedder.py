@@ -0,0 +1,60 @@
+import pytest
+from st_app.rag.batch_embedder import embed_corpus
+from st_app.rag.embedding_cache import DiskEmbeddingStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DiskEmbeddingStore(tmp_path / "docs.sqlite")
+
+
+def make_compute(fail_on=None):
+    calls = []
+
+    def compute(texts):
+        calls.append(list(texts))
+        if fail_on is not None and fail_on in texts:
+            raise RuntimeError("embedding API error")
+        return [[float(len(t))] for t in texts]
+
+    compute.calls = calls
+    return compute
+
+
+def test_batches_and_order(store):
+    compute = make_compute()
+    texts = [f"review {i}" for i in range(10)]
+
+    vectors = embed_corpus(texts, compute=compute, store=store, batch_size=3, max_workers=2)
+
+    assert vectors == [[float(len(t))] for t in texts]
+    assert sorted(len(batch) for batch in compute.calls) == [1, 3, 3, 3]
+
+
+def test_rebuild_only_embeds_changed_reviews(store):
+    texts = [f"review {i}" for i in range(10)]
+    embed_corpus(texts, compute=make_compute(), store=store, batch_size=4)
+
+    compute = make_compute()
+    embed_corpus(texts[:9] + ["edited review"], compute=compute, store=store, batch_size=4)
+
+    assert compute.calls == [["edited review"]]
+
+
+def test_resume_after_failure(store):
+    texts = [f"review {i}" for i in range(6)]
+    with pytest.raises(RuntimeError):
+        embed_corpus(texts, compute=make_compute(fail_on="review 5"), store=store, batch_size=2, max_workers=1)
+
+    compute = make_compute()
+    vectors = embed_corpus(texts, compute=compute, store=store, batch_size=2, max_workers=1)
+
+    assert compute.calls == [["review 4", "review 5"]]
+    assert len(vectors) == 6
+
+
+def test_short_backend_response_is_an_error(store):
+    with pytest.raises(ValueError):
+        embed_corpus(["a", "b", "c"], compute=lambda texts: [[1.0]] * (len(texts) - 1), store=store, batch_size=3)
+
+    assert len(store) == 0
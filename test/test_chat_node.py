@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("langchain_upstage")
+from st_app.graph.nodes import chat_node as node  # noqa: E402
+
+
+class FakeLLM:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def with_structured_output(self, schema):
+        return self
+
+    def invoke(self, msgs, config=None):
+        self.calls += 1
+        return self.result
+
+
+@pytest.fixture
+def single_call(monkeypatch):
+    monkeypatch.setattr(node, "ROUTE_AND_ANSWER", True)
+    monkeypatch.setattr(node, "_fast_route", lambda text: None)
+    monkeypatch.setattr(node, "log_route", lambda *args: None)
+
+
+def test_chat_answer_comes_from_the_routing_call(single_call, monkeypatch):
+    llm = FakeLLM(node.RouteOrAnswer(route="chat", answer="안녕하세요!"))
+    monkeypatch.setattr(node, "get_llm", lambda **kwargs: llm)
+
+    assert node.chat_node({"input": "음 심심해"}) == {
+        "output": "안녕하세요!", "next_node": "chat", "history": [{"role": "assistant", "content": "안녕하세요!"}]
+    }
+    assert llm.calls == 1
+
+
+def test_other_routes_hand_off_unchanged(single_call, monkeypatch):
+    llm = FakeLLM(node.RouteOrAnswer(route="rag_review", answer="무시됨"))
+    monkeypatch.setattr(node, "get_llm", lambda **kwargs: llm)
+
+    state = node.chat_node({"input": "사람들 반응 어때"})
+
+    assert state["next_node"] == "rag_review"
+    assert "output" not in state
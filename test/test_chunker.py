@@ -0,0 +1,47 @@
+from st_app.rag.chunker import chunk_docs, chunk_spans, merge_passages
+from st_app.rag.docstore import IndexedDoc, doc_id, review_id
+
+LONG_REVIEW = " ".join(f"Sentence number {i} talks about the acting and the score." for i in range(60))
+
+
+def test_short_review_is_one_passage_with_review_id():
+    doc = IndexedDoc("짧은 리뷰", {"source": "naver", "date": "2019-05-30"})
+
+    (passage,) = chunk_docs([doc], max_chars=100, overlap=20)
+
+    assert passage.text == "짧은 리뷰"
+    assert doc_id(passage) == review_id("naver", "2019-05-30", "짧은 리뷰") == passage.metadata["parent_id"]
+
+
+def test_spans_overlap_and_cover_text():
+    spans = chunk_spans(LONG_REVIEW, max_chars=300, overlap=60)
+
+    assert spans[0][0] == 0 and spans[-1][1] == len(LONG_REVIEW)
+    assert all(end - start <= 300 for start, end in spans)
+    assert all(next_start < end for (_, end), (next_start, _) in zip(spans, spans[1:]))
+    # 문장 경계에서 자름
+    assert all(LONG_REVIEW[start:end].rstrip().endswith(".") for start, end in spans[:-1])
+
+
+def test_passages_have_offsets_and_merge_back():
+    doc = IndexedDoc(LONG_REVIEW, {"source": "letterboxd", "date": "2019-08-14"})
+
+    passages = chunk_docs([doc], max_chars=300, overlap=60)
+
+    assert len(passages) > 1
+    assert len({doc_id(p) for p in passages}) == len(passages)
+    for p in passages:
+        assert LONG_REVIEW[p.metadata["start"]:p.metadata["end"]] == p.text
+    assert merge_passages(list(reversed(passages))) == LONG_REVIEW
+    assert merge_passages([passages[0], passages[-1]]).count("…") == 1
+
+
+def test_passages_keep_only_their_preprocessed_tokens():
+    text = "배우들의 연기가 정말 좋았다. " * 10 + "음악은 지루했다. " * 10
+    doc = IndexedDoc(text, {"source": "naver", "date": "2019-05-30"}, tokens=["배우", "연기", "좋다", "음악", "지루하다"])
+
+    first, *_, last = chunk_docs([doc], max_chars=120, overlap=20)
+
+    assert first.tokens == ["배우", "연기", "좋다"]
+    assert last.tokens == ["음악", "지루하다"]
+    assert chunk_docs([IndexedDoc("짧음", {}, tokens=["짧다"])])[0].tokens == ["짧다"]
@@ -0,0 +1,47 @@
+from st_app.rag.context import count_tokens, mmr_order, pack_contexts
+from st_app.rag.prompt import build_rag_prompt
+
+
+def test_mmr_drops_near_duplicates():
+    texts = [
+        "배우들의 연기가 정말 최고였다",
+        "배우들의 연기가 정말 최고였다!!",
+        "음악이 좋았지만 스토리가 지루했다",
+    ]
+
+    assert mmr_order(texts) == [0, 2]
+
+
+def test_mmr_prefers_novel_hits_over_overlapping_ones():
+    texts = [
+        "배우 연기 최고 스토리 최고",
+        "배우 연기 최고 스토리 별로",
+        "음악 영상미 훌륭",
+    ]
+
+    assert mmr_order(texts, lambda_=0.5)[:2] == [0, 2]
+
+
+def test_pack_respects_token_budget():
+    long_review = "연기가 좋았다 " * 200
+    texts = ["짧은 리뷰 하나", long_review, "다른 짧은 리뷰"]
+
+    packed = pack_contexts(texts, budget=100)
+
+    assert sum(count_tokens(t) for t in packed) <= 101
+    assert packed[0] == "짧은 리뷰 하나"
+    assert any(t.endswith("…") for t in packed)
+
+
+def test_pack_short_reviews_not_larger_than_top4_baseline():
+    # 네이버 한 줄 리뷰처럼 짧은 후보 8개는 모두 예산 안에 들어가므로 개수 제한이 없으면 프롬프트가 커짐
+    texts = [
+        "연기 최고", "스토리 탄탄", "음악 좋음", "영상미 훌륭",
+        "결말 아쉬움", "배우 몰입", "전개 빠름", "재관람 의향",
+    ]
+    query = "관객 반응 알려줘"
+
+    packed = pack_contexts(texts)
+
+    assert len(packed) == 4
+    assert count_tokens(build_rag_prompt(query, packed)) <= count_tokens(build_rag_prompt(query, texts[:4]))
@@ -0,0 +1,25 @@
+from st_app.rag.corpus import batched, iter_corpus
+
+
+def test_batched_streams_fixed_size_chunks():
+    assert list(batched(iter(range(5)), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_iter_corpus_handles_quoted_newlines(tmp_path):
+    (tmp_path / "reviews_naver.csv").write_text(
+        'rating,date,review\n10,2019.05.30. 15:11,"첫 줄\n둘째 줄, 쉼표 포함"\n2,2020.01.02. 10:00,별로\n',
+        encoding="utf-8",
+    )
+    (tmp_path / "preprocessed_reviews_naver.csv").write_text("review,keywords\n첫 줄,첫\n", encoding="utf-8")
+
+    docs = list(iter_corpus(tmp_path))
+
+    assert [d.text for d in docs] == ["첫 줄\n둘째 줄, 쉼표 포함", "별로"]
+    assert docs[0].metadata == {"source": "naver", "rating": "10", "date": "2019.05.30. 15:11"}
+
+
+def test_iter_corpus_filters_sites(tmp_path):
+    for site in ("naver", "letterboxd"):
+        (tmp_path / f"reviews_{site}.csv").write_text(f"rating,date,review\n5,2020-01-01,{site} review\n", encoding="utf-8")
+
+    assert [d.text for d in iter_corpus(tmp_path, sites=["letterboxd"])] == ["letterboxd review"]
@@ -0,0 +1,94 @@
+import sqlite3
+
+import pytest
+from st_app.rag.docstore import DocStore, IndexedDoc
+
+
+@pytest.fixture
+def store():
+    store = DocStore()
+    store.put_many([
+        (1, IndexedDoc("최고", {"source": "naver", "rating": "10", "date": "2019.05.30. 15:11"})),
+        (2, IndexedDoc("별로", {"source": "naver", "rating": "2", "date": "2020.01.02. 10:00"})),
+        (2**62, IndexedDoc("great", {"source": "rottentomatoes", "rating": "5.0", "date": "Jul 21, 2025"})),
+    ])
+    return store
+
+
+def test_get_many_returns_only_requested_rows(store):
+    docs = store.get_many([2, 2**62, 99])
+
+    assert docs == {
+        2: IndexedDoc("별로", {"source": "naver", "rating": "2", "date": "2020.01.02. 10:00"}),
+        2**62: IndexedDoc("great", {"source": "rottentomatoes", "rating": "5.0", "date": "Jul 21, 2025"}),
+    }
+
+
+def test_existing_and_delete(store):
+    store.delete_many([1])
+
+    assert store.existing([1, 2, 3]) == {2}
+    assert len(store) == 2
+
+
+def test_facet_rows_skip_text(store):
+    assert sorted(store.facet_rows()) == [
+        (1, "naver", "10", "2019.05.30. 15:11"),
+        (2, "naver", "2", "2020.01.02. 10:00"),
+        (2**62, "rottentomatoes", "5.0", "Jul 21, 2025"),
+    ]
+
+
+def test_save_as_and_copy_of(store, tmp_path):
+    path = tmp_path / "docs.sqlite"
+    store.save_as(path)
+
+    copy = DocStore.copy_of(path)
+    copy.delete_many([1])
+
+    assert len(DocStore(path, readonly=True)) == 3
+    assert len(copy) == 2
+
+
+def test_passages_of_groups_by_parent():
+    store = DocStore()
+    store.put_many([
+        (10, IndexedDoc("첫 패시지", {"source": "letterboxd", "parent_id": 10, "chunk": 0, "start": 0, "end": 5})),
+        (11, IndexedDoc("두 번째", {"source": "letterboxd", "parent_id": 10, "chunk": 1, "start": 4, "end": 8})),
+        (20, IndexedDoc("짧은 리뷰", {"source": "naver"})),
+    ])
+
+    found = store.passages_of([10, 20])
+
+    assert sorted(p.text for p in found[10]) == ["두 번째", "첫 패시지"]
+    assert [p.text for p in found[20]] == ["짧은 리뷰"]
+
+
+def test_old_table_is_migrated(tmp_path):
+    path = tmp_path / "docs.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE docs (id INTEGER PRIMARY KEY, source TEXT, rating TEXT, date TEXT, text TEXT NOT NULL, "
+        "metadata TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO docs VALUES (1, 'naver', '10', '2019-05-30', '최고', '{\"source\": \"naver\"}')")
+    conn.commit()
+    conn.close()
+
+    assert [p.text for p in DocStore(path, readonly=True).passages_of([1])[1]] == ["최고"]
+    assert [p.text for p in DocStore.copy_of(path).passages_of([1])[1]] == ["최고"]
+    assert DocStore(path, readonly=True).get_many([1])[1].tokens is None
+
+
+def test_tokens_round_trip(tmp_path):
+    store = DocStore()
+    store.put_many([
+        (1, IndexedDoc("연기가 좋았다", {"source": "naver"}, tokens=["연기", "좋다"])),
+        (2, IndexedDoc("!!", {"source": "naver"}, tokens=[])),
+    ])
+    store.save_as(tmp_path / "docs.sqlite")
+
+    readonly = DocStore(tmp_path / "docs.sqlite", readonly=True)
+
+    assert readonly.get_many([1])[1].tokens == ["연기", "좋다"]
+    assert dict(readonly.items())[2].tokens == []
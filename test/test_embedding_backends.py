@@ -0,0 +1,31 @@
+import math
+
+import pytest
+from st_app.rag.embedder import get_embedder
+
+
+def cosine(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+def test_hashing_backend_is_deterministic_and_normalized():
+    embedder = get_embedder("hashing-64", backend="hashing")
+
+    first, second = embedder.embed_documents(["배우들의 연기가 최고", "배우들의 연기가 최고"])
+
+    assert len(first) == 64
+    assert first == second
+    assert math.isclose(sum(v * v for v in first), 1.0, rel_tol=1e-9)
+
+
+def test_hashing_backend_shares_tokens():
+    embedder = get_embedder("hashing-384", backend="hashing")
+    query, close, far = embedder.embed_documents(["배우 연기 어때?", "배우들 연기가 좋았다", "음악이 지루했다"])
+
+    assert cosine(query, close) > cosine(query, far)
+
+
+def test_get_embedder_reuses_instance_and_rejects_unknown_backend():
+    assert get_embedder("hashing-32", backend="hashing") is get_embedder("hashing-32", backend="hashing")
+    with pytest.raises(ValueError):
+        get_embedder("x", backend="unknown")
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from st_app.rag.embedding_cache import DiskEmbeddingStore, EmbeddingCache, cache_key
+
+
+@pytest.fixture
+def fake_compute():
+    calls = []
+
+    def compute(texts):
+        calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    compute.calls = calls
+    return compute
+
+
+def test_normalized_duplicate_hits_memory(fake_compute):
+    cache = EmbeddingCache("test-model", maxsize=8)
+
+    first = cache.encode(["배우 연기 어때?"], fake_compute)
+    second = cache.encode(["  배우   연기 어때? "], fake_compute)
+
+    assert first == second
+    assert len(fake_compute.calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_only_missing_texts_are_computed(fake_compute):
+    cache = EmbeddingCache("test-model", maxsize=8)
+    cache.encode(["a"], fake_compute)
+
+    vectors = cache.encode(["a", "bb", "bb"], fake_compute)
+
+    assert fake_compute.calls[-1] == ["bb"]
+    assert vectors == [[1.0, 1.0], [2.0, 1.0], [2.0, 1.0]]
+
+
+def test_lru_eviction(fake_compute):
+    cache = EmbeddingCache("test-model", maxsize=2)
+    cache.encode(["a", "bb", "ccc"], fake_compute)
+
+    assert cache.stats()["size"] == 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_disk_tier_survives_new_process(tmp_path, fake_compute):
+    path = tmp_path / "emb.sqlite"
+    EmbeddingCache("test-model", disk=DiskEmbeddingStore(path)).encode(["hello"], fake_compute)
+
+    cache = EmbeddingCache("test-model", disk=DiskEmbeddingStore(path))
+    vectors = cache.encode(["HELLO"], fake_compute)
+
+    assert vectors == [[5.0, 1.0]]
+    assert len(fake_compute.calls) == 1
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_store_bounded(tmp_path):
+    store = DiskEmbeddingStore(tmp_path / "emb.sqlite", max_entries=2)
+    store.put_many({"a": [1.0]})
+    store.put_many({"b": [2.0]})
+    store.put_many({"c": [3.0]})
+
+    assert len(store) == 2
+    assert "c" in store.get_many(["a", "b", "c"])
+
+
+def test_cache_key_depends_on_model():
+    assert cache_key("m1", "text") != cache_key("m2", "text")
+
+
+def test_async_encode_shares_cache(fake_compute):
+    cache = EmbeddingCache("test-model", maxsize=8)
+
+    async def acompute(texts):
+        return fake_compute(texts)
+
+    first = asyncio.run(cache.aencode(["배우", "연기", "배우"], acompute))
+    second = cache.encode(["연기"], fake_compute)
+
+    assert first == [[2.0, 1.0], [2.0, 1.0], [2.0, 1.0]]
+    assert second == [[2.0, 1.0]]
+    assert fake_compute.calls == [["배우", "연기"]]
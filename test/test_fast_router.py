@@ -0,0 +1,57 @@
+from st_app.graph.fast_router import FastRouter, NaiveBayesRouter, keyword_route, load_examples
+
+EXAMPLES = [
+    ("기생충 리뷰 요약해줘", "rag_review"),
+    ("관객 평가 어때", "rag_review"),
+    ("사람들이 연기 칭찬해?", "rag_review"),
+    ("기생충 감독 누구야", "subject_info"),
+    ("기생충 어떤 영화야", "subject_info"),
+    ("기생충 몇 년도 영화야", "subject_info"),
+    ("안녕 반가워", "chat"),
+    ("오늘 날씨 어때", "chat"),
+    ("점심 메뉴 추천해줘", "chat"),
+]
+
+
+def test_keyword_rules_need_a_single_route():
+    assert keyword_route("기생충 평점 알려줘") == "rag_review"
+    assert keyword_route("안녕! 기생충 감독 누구야?") == "subject_info"
+    assert keyword_route("감독 연출에 대한 리뷰") is None
+    assert keyword_route("오늘 뭐 먹지") is None
+
+
+def test_classifier_generalizes_across_endings():
+    clf = NaiveBayesRouter().fit(EXAMPLES)
+
+    proba = clf.predict_proba("연기 평가 요약 좀")
+
+    assert max(proba, key=proba.get) == "rag_review"
+    assert abs(sum(proba.values()) - 1) < 1e-9
+
+
+def test_low_confidence_falls_back_to_llm():
+    router = FastRouter(NaiveBayesRouter().fit(EXAMPLES), threshold=0.999)
+
+    assert router.decide("기생충 별점 몇 점?").source == "rule"
+    assert router.decide("음") is None
+    assert router.stats()["llm_calls_avoided"] == 1
+
+
+def test_unrecorded_decisions_do_not_count():
+    router = FastRouter(NaiveBayesRouter().fit(EXAMPLES), threshold=0.999)
+
+    # 답변 캐시 힌트 → 실제 라우팅 순서로 같은 질의를 두 번 판단해도 한 번만 집계
+    assert router.decide("기생충 별점 몇 점?", record=False).route == "rag_review"
+    assert router.decide("기생충 별점 몇 점?").route == "rag_review"
+    assert router.decide("음", record=False) is None
+
+    assert router.stats()["rule"] == 1
+    assert router.stats()["llm_calls_avoided"] == 1
+    assert router.counts["llm"] == 0
+
+
+def test_load_examples_skips_unknown_routes(tmp_path):
+    path = tmp_path / "routes.jsonl"
+    path.write_text('{"query": "안녕", "route": "chat"}\n\n{"query": "x", "route": "weather"}\n', encoding="utf-8")
+
+    assert load_examples(str(path), str(tmp_path / "missing.jsonl")) == [("안녕", "chat")]
@@ -0,0 +1,34 @@
+import pytest
+from st_app.rag.filters import FacetIndex, ReviewFilter
+from st_app.rag.index_store import IndexedDoc
+
+
+@pytest.fixture
+def facets():
+    return FacetIndex({
+        1: IndexedDoc("최고", {"source": "naver", "rating": "10", "date": "2019.05.30. 15:11"}),
+        2: IndexedDoc("별로", {"source": "naver", "rating": "2", "date": "2020.01.02. 10:00"}),
+        3: IndexedDoc("meh", {"source": "letterboxd", "rating": "1.5", "date": "2019-08-14"}),
+        4: IndexedDoc("great", {"source": "rottentomatoes", "rating": "5.0", "date": "Jul 21, 2025"}),
+    })
+
+
+def test_source_filter(facets):
+    assert sorted(facets.select(ReviewFilter(sources=("letterboxd", "rottentomatoes")))) == [3, 4]
+
+
+def test_rating_uses_ten_point_scale(facets):
+    assert sorted(facets.select(ReviewFilter(max_rating=4))) == [2, 3]
+    assert sorted(facets.select(ReviewFilter(min_rating=10))) == [1, 4]
+
+
+def test_date_window(facets):
+    flt = ReviewFilter(date_from="2019-01-01", date_to="2019-12-31")
+
+    assert sorted(facets.select(flt)) == [1, 3]
+
+
+def test_combined_facets(facets):
+    flt = ReviewFilter(sources=("naver",), max_rating=5, date_from="2020-01-01")
+
+    assert list(facets.select(flt)) == [2]
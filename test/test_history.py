@@ -0,0 +1,73 @@
+from st_app.graph.history import HistoryManager
+from st_app.rag.prompt import build_chat_prompt
+
+
+def _turns(n, size=40):
+    history = []
+    for i in range(n):
+        history.append({"role": "user", "content": f"질문 {i} " + "가" * size})
+        history.append({"role": "assistant", "content": f"답변 {i} " + "나" * size})
+    return history
+
+
+class RecordingSummarizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, previous, messages, max_tokens):
+        self.calls.append((previous, [m["content"][:4] for m in messages]))
+        return f"{previous}+{len(messages)}"
+
+
+def test_short_history_is_kept_verbatim():
+    summarize = RecordingSummarizer()
+    manager = HistoryManager(budget=1000, summarize=summarize)
+
+    assert manager.window(_turns(2)) == ("", _turns(2))
+    assert summarize.calls == []
+
+
+def test_old_turns_are_folded_into_an_incremental_summary():
+    summarize = RecordingSummarizer()
+    manager = HistoryManager(budget=100, summary_tokens=50, batch=2, summarize=summarize)
+
+    summary, recent = manager.window(_turns(4))
+    assert summary == "+5"
+    assert sum(len(m["content"]) // 2 + 4 for m in recent) <= 100
+
+    # 다음 턴에는 새로 밀려난 메시지만 이전 요약에 이어 붙임
+    summary, recent = manager.window(_turns(5))
+    assert summary == "+5+2"
+    assert summarize.calls[-1] == ("+5", ["답변 2", "질문 3"])
+
+    # 같은 기록은 다시 요약하지 않음
+    manager.window(_turns(5))
+    assert len(summarize.calls) == 2
+
+
+def test_waits_for_a_full_batch_before_resummarizing():
+    summarize = RecordingSummarizer()
+    manager = HistoryManager(budget=100, batch=4, summarize=summarize)
+
+    manager.window(_turns(4))
+    _, recent = manager.window(_turns(5))
+
+    assert len(summarize.calls) == 1
+    assert recent[0]["content"].startswith("답변 2")
+
+
+def test_summary_failure_keeps_recent_window():
+    def broken(previous, messages, max_tokens):
+        raise RuntimeError("down")
+
+    summary, recent = HistoryManager(budget=100, batch=1, summarize=broken).window(_turns(4))
+
+    assert summary == ""
+    assert recent == _turns(4)[-len(recent):] and len(recent) < 8
+
+
+def test_chat_prompt_includes_summary():
+    prompt = build_chat_prompt("안녕", [{"role": "user", "content": "안녕"}], summary="기생충 얘기를 했음")
+
+    assert "[이전 대화 요약]\n기생충 얘기를 했음" in prompt
+    assert "사용자: 안녕" in prompt
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from st_app.rag.index_factory import IndexSpec, normalize_l2
+
+
+@pytest.mark.parametrize(
+    "kind, storage, expected",
+    [
+        ("flat", "float32", "Flat"),
+        ("flat", "float16", "SQfp16"),
+        ("flat", "sq8", "SQ8"),
+        ("hnsw", "sq8", "HNSW32_SQ8"),
+        ("ivf_flat", "float16", "IVF16,SQfp16"),
+    ],
+)
+def test_storage_factory_strings(kind, storage, expected):
+    spec = IndexSpec(kind=kind, storage=storage, pca_dim=0, nlist=16, hnsw_m=32)
+
+    assert spec.factory_string(dim=64, n_train=1000) == expected
+
+
+def test_pca_prefix_and_fallback():
+    spec = IndexSpec(kind="flat", storage="sq8", pca_dim=16)
+
+    assert spec.factory_string(dim=64, n_train=1000) == "PCA16,L2norm,SQ8"
+    assert spec.factory_string(dim=64, n_train=8) == "SQ8"
+
+
+def test_reduced_index_keeps_cosine_ranking():
+    rng = np.random.default_rng(0)
+    xb = normalize_l2(rng.standard_normal((500, 32)))
+    index = IndexSpec(kind="flat", storage="float16", pca_dim=16).build(32, n_train=500)
+    index.train(xb)
+    index.add(xb)
+
+    _, found = index.search(xb[:5], 1)
+
+    assert found[:, 0].tolist() == [0, 1, 2, 3, 4]
+
+
+def test_train_size_follows_effective_nlist():
+    spec = IndexSpec(kind="ivf_flat", nlist=1024, pca_dim=0)
+
+    # 5000개면 nlist는 5000 // 39 = 128로 줄고, 리스트당 256개 이상이 안 되므로 전부 학습
+    assert spec.effective_nlist(5000) == 128
+    assert spec.train_size(5000) == 5000
+    assert spec.train_size(1_000_000) == 256 * 1024
+    assert spec.factory_string(dim=32, n_train=spec.train_size(1_000_000)) == "IVF1024,Flat"
+    assert IndexSpec(kind="hnsw").train_size(5000) == 5000
+
+
+def test_ivf_pq_needs_enough_vectors_per_codebook_centroid():
+    spec = IndexSpec(kind="ivf_pq", nlist=1024, pq_m=8, storage="float32", pca_dim=0)
+
+    assert spec.factory_string(dim=32, n_train=5000) == "IVF128,Flat"
+    assert spec.factory_string(dim=32, n_train=20000) == "IVF512,PQ8x8"
@@ -0,0 +1,94 @@
+import zlib
+
+import numpy as np
+import pytest
+from st_app.rag.index_factory import IndexSpec
+from st_app.rag.index_store import IndexedDoc, ReviewIndex, doc_id
+
+
+def make_doc(text, source="naver"):
+    return IndexedDoc(text=text, metadata={"source": source, "date": "2019-05-30"})
+
+
+def fake_embed(texts):
+    rng = np.random.default_rng(abs(hash(tuple(texts))) % (2**32))
+    return rng.standard_normal((len(texts), 8)).astype("float32").tolist()
+
+
+@pytest.fixture
+def review_index():
+    index = ReviewIndex()
+    index.sync([make_doc("좋았다"), make_doc("별로"), make_doc("최고")], fake_embed)
+    return index
+
+
+def test_ids_are_stable():
+    assert doc_id(make_doc("좋았다")) == doc_id(make_doc("좋았다"))
+    assert doc_id(make_doc("좋았다")) != doc_id(make_doc("좋았다", source="letterboxd"))
+
+
+def test_sync_appends_and_deletes(review_index):
+    embedded = []
+
+    def embed(texts):
+        embedded.extend(texts)
+        return fake_embed(texts)
+
+    added, removed = review_index.sync([make_doc("좋았다"), make_doc("최고"), make_doc("새 리뷰")], embed)
+
+    assert (added, removed) == (1, 1)
+    assert embedded == ["새 리뷰"]
+    assert review_index.ntotal == 3
+    assert doc_id(make_doc("별로")) not in review_index.docs
+
+
+def test_search_returns_review_ids(review_index):
+    target = doc_id(make_doc("최고"))
+    vector = review_index.index.reconstruct(target)
+
+    hits = review_index.search(np.array([vector]), k=1)
+
+    assert hits[0][0][0] == target
+
+
+def test_save_and_load_roundtrip(review_index, tmp_path):
+    review_index.save(tmp_path / "index.faiss", tmp_path / "manifest.json")
+
+    loaded = ReviewIndex.load(tmp_path / "index.faiss", tmp_path / "manifest.json")
+
+    assert loaded.ntotal == review_index.ntotal
+    ids = review_index.docs.ids()
+    assert loaded.docs.get_many(ids) == review_index.docs.get_many(ids)
+
+
+def test_sync_streams_in_chunks():
+    index = ReviewIndex()
+    batches = []
+
+    def embed(texts):
+        batches.append(len(texts))
+        return fake_embed(texts)
+
+    docs = (make_doc(f"리뷰 {i}") for i in range(5))
+    added, removed = index.sync(docs, embed, chunk_size=2)
+
+    assert (added, removed) == (5, 0)
+    assert batches == [2, 2, 1]
+    assert index.ntotal == 5
+
+
+@pytest.mark.parametrize("kind", ["flat", "ivf_flat", "hnsw"])
+def test_remove_keeps_ids_aligned(kind):
+    def embed(texts):
+        return [np.random.default_rng(zlib.crc32(t.encode("utf-8"))).standard_normal(16).tolist() for t in texts]
+
+    docs = [make_doc(f"리뷰 {i}") for i in range(400)]
+    index = ReviewIndex(spec=IndexSpec(kind=kind, nlist=8, nprobe=8))
+    index.sync(docs, embed)
+    index.sync(docs[100:], embed)
+
+    kept = docs[100:]
+    hits = index.search(np.array(embed([d.text for d in kept]), dtype="float32"), k=1)
+
+    assert index.ntotal == 300
+    assert [row[0][0] for row in hits] == [doc_id(d) for d in kept]
@@ -0,0 +1,34 @@
+import pytest
+from st_app.rag import index_versions
+from st_app.rag.index_versions import current_version, link_tree, new_version, publish, version_dir, versions_dir
+
+
+@pytest.fixture(autouse=True)
+def index_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(index_versions, "INDEX_ROOT", str(tmp_path))
+    return tmp_path
+
+
+def test_publish_flips_current_and_prunes(index_root):
+    assert current_version() is None
+
+    names = [f"2026010{i}T000000-aaaaaa" for i in range(1, 5)]
+    for name in names:
+        (version_dir(name) / "naver").mkdir(parents=True)
+        publish(name, {"version": name})
+
+    assert current_version() == names[-1]
+    assert (index_root / "CURRENT").read_text() == names[-1]
+    assert sorted(p.name for p in versions_dir().iterdir()) == names[-3:]
+
+
+def test_link_tree_shares_unchanged_files(index_root):
+    src = version_dir(new_version()) / "naver"
+    src.mkdir(parents=True)
+    (src / "index.faiss").write_bytes(b"index")
+
+    dst = version_dir(new_version()) / "naver"
+    link_tree(src, dst)
+
+    assert (dst / "index.faiss").read_bytes() == b"index"
+    assert (dst / "index.faiss").stat().st_ino == (src / "index.faiss").stat().st_ino
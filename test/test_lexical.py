@@ -0,0 +1,62 @@
+from st_app.rag.lexical import (
+    BM25Index,
+    align_preprocessed,
+    lexical_tokens,
+    normalize_date,
+    passage_tokens,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+
+
+def test_tokenize_strips_korean_particles():
+    assert tokenize("배우들의 연기가 좋았다") == ["배우", "연기", "좋았다"]
+    assert tokenize("Great ACTING!") == ["great", "acting"]
+
+
+def test_normalize_date_formats():
+    assert normalize_date("2019.05.30. 15:11") == "2019-05-30"
+    assert normalize_date("Jul 21, 2025") == "2025-07-21"
+    assert normalize_date("2019-08-17T11:15:50.633Z") == "2019-08-17"
+
+
+def test_align_preprocessed_skips_filtered_rows():
+    raw = [
+        {"date": "2019.05.30. 15:11", "review": "냄새에 얼굴 찌푸리진 않았었나"},
+        {"date": "2019.05.30. 16:00", "review": "ㅋ"},
+        {"date": "2019.05.30. 21:57", "review": "시나리오, 연출, 배우 모두 좋았다"},
+    ]
+    pre = [
+        {"date": "2019-05-30", "review": "냄새 얼굴 찌푸리다", "keywords": "냄새"},
+        {"date": "2019-05-30", "review": "시나리오 연출 배우 좋다", "keywords": "연출"},
+    ]
+
+    aligned = align_preprocessed(raw, pre)
+
+    assert aligned["시나리오, 연출, 배우 모두 좋았다"] == ["시나리오", "연출", "배우", "좋다", "연출"]
+    assert "ㅋ" not in aligned
+
+
+def test_bm25_ranks_matching_documents_first():
+    index = BM25Index()
+    index.add(1, ["연기", "최고"])
+    index.add(2, ["스토리", "지루하다"])
+    index.add(3, ["연기", "연출", "좋다"])
+
+    results = index.search(tokenize("연기가 최고"), k=2)
+
+    assert [doc_id for doc_id, _ in results] == [1, 3]
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([[1, 2, 3], [3, 1, 4]], limit=2)
+
+    assert [doc_id for doc_id, _ in fused] == [1, 3]
+
+
+def test_passage_tokens_match_stems_by_prefix():
+    tokens = ["배우", "연기", "좋다", "스토리", "지루하다"]
+
+    assert passage_tokens(tokens, "배우 연기가 좋았다") == ["배우", "연기", "좋다"]
+    assert lexical_tokens("스토리 별로", ["스토리"]) == ["스토리", "스토리", "별로"]
+    assert lexical_tokens("great acting") == ["great", "acting"]
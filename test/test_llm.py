@@ -0,0 +1,17 @@
+import pytest
+
+pytest.importorskip("langchain_upstage")
+from st_app.rag import llm  # noqa: E402
+
+
+def test_get_llm_reuses_client_and_connection_pool(monkeypatch):
+    monkeypatch.setenv("UPSTAGE_API_KEY", "test-key")
+    monkeypatch.setattr(llm, "_LLM_CACHE", {})
+
+    router = llm.get_llm(temperature=0.0)
+    answer = llm.get_llm()
+
+    assert llm.get_llm(temperature=0) is router
+    assert llm.get_llm() is answer
+    assert router is not answer
+    assert router.http_client is answer.http_client is llm.get_http_client()
@@ -0,0 +1,108 @@
+import sqlite3
+import zlib
+
+import numpy as np
+import pytest
+from app.review.review_schema import SiteName
+from st_app.rag.chunker import chunk_docs
+from st_app.rag.index_store import IndexedDoc, ReviewIndex
+from st_app.rag.retriever import Retriever
+from st_app.utils.cache import LRUCache
+
+
+def fake_embed(texts):
+    return np.stack([
+        np.random.default_rng(zlib.crc32(t.encode("utf-8"))).standard_normal(8).astype("float32") for t in texts
+    ])
+
+
+def make_shards():
+    shards = {}
+    for site, texts in {
+        SiteName.NAVER: ["배우 연기 최고", "스토리 별로", "음악이 좋았다"],
+        SiteName.LETTERBOXD: ["great acting", "boring plot"],
+    }.items():
+        shard = ReviewIndex()
+        shard.sync([IndexedDoc(t, {"source": site.value, "rating": "5", "date": "2020-01-01"}) for t in texts], fake_embed)
+        shards[site] = shard
+    return shards
+
+
+@pytest.fixture
+def retriever():
+    return Retriever(make_shards(), encoder=fake_embed, mode="hybrid")
+
+
+@pytest.mark.parametrize("mode", ["dense", "lexical", "hybrid"])
+def test_search_many_matches_loop(retriever, mode):
+    queries = ["배우 연기", "great plot", "음악", "배우 연기"]
+
+    batched = retriever.search_many(queries, k=2, mode=mode)
+
+    assert batched == [retriever.search(q, k=2, mode=mode) for q in queries]
+
+
+def test_search_many_embeds_once(retriever):
+    calls = []
+
+    def encoder(texts):
+        calls.append(list(texts))
+        return fake_embed(texts)
+
+    retriever._encoder = encoder
+    retriever.search_many(["배우 연기", "great plot"], k=2, mode="dense")
+
+    assert calls == [["배우 연기", "great plot"]]
+
+
+def test_result_cache_hits_and_invalidates_on_version():
+    calls = []
+
+    def encoder(texts):
+        calls.append(list(texts))
+        return fake_embed(texts)
+
+    cache = LRUCache(maxsize=8)
+    shards = make_shards()
+    first = Retriever(shards, encoder=encoder, mode="dense", cache=cache)
+
+    assert first.search("배우 연기", k=2) == first.search("  배우   연기 ", k=2)
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+    shards[SiteName.NAVER].version = "rebuilt"
+    Retriever(shards, encoder=encoder, mode="dense", cache=cache).search("배우 연기", k=2)
+    assert len(calls) == 2
+
+
+def test_collapse_returns_parent_reviews():
+    long_review = " ".join(f"Sentence {i} praises the great acting." for i in range(40))
+    shard = ReviewIndex()
+    shard.sync(
+        chunk_docs([IndexedDoc(long_review, {"source": "letterboxd", "rating": "4", "date": "2020-01-01"})], 200, 40),
+        fake_embed,
+    )
+    retriever = Retriever({SiteName.LETTERBOXD: shard}, encoder=fake_embed, mode="lexical")
+
+    passages = retriever.search("great acting", k=3)
+    (review,) = retriever.search("great acting", k=3, collapse=True)
+
+    assert len(passages) == 3
+    assert review.text == long_review
+    assert review.doc_id == passages[0].metadata["parent_id"]
+    assert "start" not in review.metadata
+
+
+def test_close_waits_for_in_flight_searches(retriever):
+    retriever.acquire()  # 교체 직전에 시작된 검색
+    retriever.close()
+
+    # 진행 중인 검색은 문서 테이블을 계속 읽을 수 있고, 새 검색은 거부
+    assert retriever.shards[SiteName.NAVER].docs.ids()
+    with pytest.raises(RuntimeError):
+        retriever.search("배우 연기")
+
+    retriever.release()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        retriever.shards[SiteName.NAVER].docs.ids()
@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("langgraph.checkpoint.sqlite")
+from langgraph.checkpoint.sqlite import SqliteSaver  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+from st_app.utils.state import ConversationState  # noqa: E402
+
+
+def _echo(state):
+    return {"output": state["input"], "history": [{"role": "assistant", "content": f"echo {len(state['history'])}"}]}
+
+
+def _graph(conn):
+    graph = StateGraph(ConversationState)
+    graph.add_node("echo", _echo)
+    graph.set_entry_point("echo")
+    graph.add_edge("echo", END)
+    return graph.compile(checkpointer=SqliteSaver(conn))
+
+
+def test_history_accumulates_per_thread_and_survives_reopen(tmp_path):
+    import sqlite3
+
+    path = tmp_path / "checkpoints.sqlite"
+    config = {"configurable": {"thread_id": "t1"}}
+    graph = _graph(sqlite3.connect(path, check_same_thread=False))
+    for text in ["안녕", "기생충 리뷰"]:
+        graph.invoke({"input": text, "history": [{"role": "user", "content": text}]}, config)
+
+    reopened = _graph(sqlite3.connect(path, check_same_thread=False))
+    history = reopened.get_state(config).values["history"]
+
+    assert [m["content"] for m in history] == ["안녕", "echo 1", "기생충 리뷰", "echo 3"]
+    assert reopened.get_state({"configurable": {"thread_id": "t2"}}).values == {}
@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+from st_app.graph.streaming import HISTORY_SUMMARY_TAG, NOSTREAM_TAG, ROUTER_TAG, StreamStats, stream_answer
+
+
+class FakeGraph:
+    def __init__(self, events):
+        self.events = events
+
+    def stream(self, inputs, config=None, stream_mode=None):
+        assert stream_mode == ["messages", "values"]
+        yield from self.events
+
+
+def _token(text, tags=()):
+    return "messages", (SimpleNamespace(content=text), {"tags": list(tags), "langgraph_node": "chat"})
+
+
+def test_internal_tokens_are_hidden_and_ttft_is_measured():
+    graph = FakeGraph([
+        _token("rag_review", tags=[ROUTER_TAG, NOSTREAM_TAG]),
+        _token("이전 대화 요약", tags=[HISTORY_SUMMARY_TAG, NOSTREAM_TAG]),
+        ("values", {"input": "q", "next_node": "rag_review"}),
+        _token("좋은 "),
+        _token("리뷰"),
+        ("values", {"input": "q", "output": "좋은 리뷰"}),
+    ])
+    stats = StreamStats()
+
+    assert list(stream_answer(graph, {"input": "q"}, stats)) == ["좋은 ", "리뷰"]
+    assert stats.output == "좋은 리뷰"
+    assert stats.tokens == 2
+    assert 0 <= stats.ttft_ms <= stats.total_ms
+
+
+def test_falls_back_to_final_output_without_tokens():
+    graph = FakeGraph([("values", {"input": "q", "output": "캐시된 답변"})])
+    stats = StreamStats()
+
+    assert list(stream_answer(graph, {"input": "q"}, stats)) == ["캐시된 답변"]
+    assert stats.ttft_ms is not None